@@ -0,0 +1,266 @@
+import tkinter as tk
+from datetime import date, timedelta
+from tkinter import ttk, messagebox
+
+from estilos import BG_PRIMARY, FG_PRIMARY, COLOR_ACCENT, FONT_BASE, add_logo_header
+from tablas import FiltroFechas
+from ejecutor_db import obtener_ejecutor
+import repositorio
+
+# Los resúmenes viven en la misma DB que las compras (ver migraciones: resumen_compras_*)
+DB_NAME = repositorio.DB_ADIDAS
+
+# Etiqueta -> tabla de resumen que mantienen los triggers de compras
+PERIODOS = {
+    "Diario": "resumen_compras_diario",
+    "Mensual": "resumen_compras_mensual",
+}
+# Etiqueta -> valor de la columna `dimension` de los resúmenes
+DIMENSIONES = {
+    "Proveedor": "proveedor",
+    "Cliente": "cliente",
+}
+
+# Sin rango elegido se muestran los últimos días/meses con datos
+DIAS_POR_DEFECTO = 30
+MESES_POR_DEFECTO = 12
+# Cantidad de barras del ranking
+LIMITE_RANKING = 10
+# Tope para MAX(fecha): deja afuera fechas viejas que no se pudieron pasar a ISO
+FECHA_MAXIMA = "9999-12-31"
+
+_SERIE = """
+    SELECT fecha, SUM(cantidad) AS cantidad, SUM(total) AS total
+    FROM {tabla}
+    WHERE dimension = ? AND fecha >= ? AND fecha <= ?
+    GROUP BY fecha ORDER BY fecha
+"""
+_RANKING = """
+    SELECT clave, SUM(cantidad) AS cantidad, SUM(total) AS total
+    FROM {tabla}
+    WHERE dimension = ? AND fecha >= ? AND fecha <= ?
+    GROUP BY clave ORDER BY total DESC LIMIT ?
+"""
+_ULTIMA_FECHA = "SELECT MAX(fecha) FROM {tabla} WHERE dimension = ? AND fecha <= ?"
+
+SQL_SERIE_DIARIA = _SERIE.format(tabla=PERIODOS["Diario"])
+SQL_SERIE_MENSUAL = _SERIE.format(tabla=PERIODOS["Mensual"])
+SQL_RANKING_DIARIO = _RANKING.format(tabla=PERIODOS["Diario"])
+SQL_RANKING_MENSUAL = _RANKING.format(tabla=PERIODOS["Mensual"])
+SQL_ULTIMA_FECHA_DIARIA = _ULTIMA_FECHA.format(tabla=PERIODOS["Diario"])
+SQL_ULTIMA_FECHA_MENSUAL = _ULTIMA_FECHA.format(tabla=PERIODOS["Mensual"])
+
+# El ranking agrupa por clave y ordena por total: ordena en memoria, pero solo las filas
+# del resumen dentro del rango (una por clave y día/mes), nunca la tabla de compras
+ORDEN_EN_MEMORIA_ACEPTADO = {
+    "SQL_RANKING_DIARIO": "ranking sobre el resumen diario del rango",
+    "SQL_RANKING_MENSUAL": "ranking sobre el resumen mensual del rango",
+}
+
+_CONSULTAS = {
+    "Diario": (SQL_SERIE_DIARIA, SQL_RANKING_DIARIO, SQL_ULTIMA_FECHA_DIARIA),
+    "Mensual": (SQL_SERIE_MENSUAL, SQL_RANKING_MENSUAL, SQL_ULTIMA_FECHA_MENSUAL),
+}
+
+
+def _restar_meses(mes, cantidad):
+    """'2024-03' menos 2 meses -> '2024-01'."""
+    anio, numero = int(mes[:4]), int(mes[5:7])
+    total = anio * 12 + (numero - 1) - cantidad
+    return f"{total // 12:04d}-{total % 12 + 1:02d}"
+
+
+def cargar_tablero(conexion, periodo, dimension, desde=None, hasta=None, limite=LIMITE_RANKING):
+    """
+    Lee de los resúmenes la serie de gasto y el ranking de `dimension` en un rango.
+    Corre en el hilo de la DB (EjecutorDB.enviar).
+
+    Args:
+        conexion (sqlite3.Connection): Conexión del hilo de trabajo.
+        periodo (str): "Diario" o "Mensual".
+        dimension (str): "proveedor" o "cliente".
+        desde (str): Fecha ISO inicial, o None para los últimos días/meses con datos.
+        hasta (str): Fecha ISO final, o None para la última fecha con datos.
+        limite (int): Cantidad de claves del ranking.
+    Returns:
+        dict: 'desde' y 'hasta' efectivos, 'serie' [(fecha, total)] y 'ranking' [(clave, total, cantidad)].
+    """
+    sql_serie, sql_ranking, sql_ultima = _CONSULTAS[periodo]
+    mensual = periodo == "Mensual"
+
+    if mensual:
+        desde = desde[:7] if desde else None
+        hasta = hasta[:7] if hasta else None
+    if hasta is None:
+        tope = FECHA_MAXIMA[:7] if mensual else FECHA_MAXIMA
+        hasta = conexion.execute(sql_ultima, (dimension, tope)).fetchone()[0]
+        if hasta is None:
+            hasta = date.today().isoformat()[:7 if mensual else 10]
+    if desde is None:
+        if mensual:
+            desde = _restar_meses(hasta, MESES_POR_DEFECTO - 1)
+        else:
+            desde = (date.fromisoformat(hasta) - timedelta(days=DIAS_POR_DEFECTO - 1)).isoformat()
+
+    serie = conexion.execute(sql_serie, (dimension, desde, hasta)).fetchall()
+    ranking = conexion.execute(sql_ranking, (dimension, desde, hasta, limite)).fetchall()
+    return {
+        "desde": desde,
+        "hasta": hasta,
+        "serie": [(fila["fecha"], fila["total"]) for fila in serie],
+        "ranking": [(fila["clave"] or "(sin dato)", fila["total"], fila["cantidad"]) for fila in ranking],
+    }
+
+
+# === Gráficos sobre Canvas ===
+
+MARGEN = 40
+
+
+def _dinero(valor):
+    return f"${valor:,.0f}"
+
+
+def dibujar_barras_horizontales(canvas, datos, titulo):
+    """Dibuja un ranking [(etiqueta, valor, ...)] como barras horizontales, de mayor a menor."""
+    canvas.delete("all")
+    ancho, alto = canvas.winfo_width(), canvas.winfo_height()
+    canvas.create_text(ancho / 2, MARGEN / 2, text=titulo, font=("Segoe UI", 11, "bold"), fill=FG_PRIMARY)
+    if not datos:
+        canvas.create_text(ancho / 2, alto / 2, text="Sin datos en el rango", fill=FG_PRIMARY)
+        return
+
+    maximo = max(valor for _, valor, *_ in datos) or 1
+    ancho_etiqueta = min(160, ancho // 3)
+    ancho_barras = max(ancho - ancho_etiqueta - 2 * MARGEN - 70, 10)
+    alto_fila = (alto - 1.5 * MARGEN) / len(datos)
+    for i, (etiqueta, valor, *_) in enumerate(datos):
+        y = MARGEN + i * alto_fila
+        largo = ancho_barras * max(valor, 0) / maximo
+        x0 = MARGEN + ancho_etiqueta
+        canvas.create_text(x0 - 8, y + alto_fila / 2, text=str(etiqueta)[:22], anchor="e", fill=FG_PRIMARY)
+        canvas.create_rectangle(x0, y + alto_fila * 0.15, x0 + largo, y + alto_fila * 0.85,
+                                fill=COLOR_ACCENT, outline="")
+        canvas.create_text(x0 + largo + 6, y + alto_fila / 2, text=_dinero(valor), anchor="w", fill=FG_PRIMARY)
+
+
+def dibujar_columnas(canvas, datos, titulo):
+    """Dibuja una serie [(fecha, valor)] como columnas, rotulando solo algunas fechas si no entran."""
+    canvas.delete("all")
+    ancho, alto = canvas.winfo_width(), canvas.winfo_height()
+    canvas.create_text(ancho / 2, MARGEN / 2, text=titulo, font=("Segoe UI", 11, "bold"), fill=FG_PRIMARY)
+    if not datos:
+        canvas.create_text(ancho / 2, alto / 2, text="Sin datos en el rango", fill=FG_PRIMARY)
+        return
+
+    maximo = max(valor for _, valor in datos) or 1
+    izquierda, base = MARGEN + 50, alto - MARGEN
+    alto_util = max(base - MARGEN, 10)
+    ancho_columna = max(ancho - izquierda - MARGEN, 10) / len(datos)
+    # Como mucho ~8 rótulos en el eje, para que no se encimen
+    cada = max(1, len(datos) // 8)
+
+    canvas.create_line(izquierda, base, ancho - MARGEN, base, fill=FG_PRIMARY)
+    canvas.create_text(izquierda - 6, MARGEN, text=_dinero(maximo), anchor="e", fill=FG_PRIMARY)
+    for i, (fecha, valor) in enumerate(datos):
+        x = izquierda + i * ancho_columna
+        y = base - alto_util * max(valor, 0) / maximo
+        canvas.create_rectangle(x + ancho_columna * 0.1, y, x + ancho_columna * 0.9, base,
+                                fill=COLOR_ACCENT, outline="")
+        if i % cada == 0:
+            canvas.create_text(x + ancho_columna / 2, base + 12, text=fecha, fill=FG_PRIMARY, font=("Segoe UI", 8))
+
+
+class AnaliticaUI:
+    """
+    Tablero de gasto en compras por proveedor o por cliente, diario o mensual.
+
+    Lee solo las tablas de resumen (mantenidas por triggers en cada alta, baja o
+    modificación de compras), así que abrirlo no recorre la tabla de compras.
+    """
+    def __init__(self, root, volver_callback):
+        self.frame = ttk.Frame(root, style="Modulo.TFrame")
+        self.frame.pack(fill="both", expand=True)
+
+        self.volver_callback = volver_callback
+        self.ejecutor = obtener_ejecutor(root, DB_NAME)
+        # Descarta respuestas de pedidos viejos si el usuario cambió el filtro mientras tanto
+        self._generacion = 0
+        self.datos = None
+        self.crear_ui()
+        self.cargar_datos()
+
+    def crear_ui(self):
+        add_logo_header(self.frame, "Análisis de Compras")
+
+        controles = ttk.Frame(self.frame, style="Modulo.TFrame", padding="10")
+        controles.pack(fill="x", padx=20)
+
+        ttk.Label(controles, text="Ver por:", font=FONT_BASE, style="Modulo.TLabel").pack(side=tk.LEFT, padx=5)
+        self.dimension_combo = ttk.Combobox(controles, values=list(DIMENSIONES), state="readonly", width=12)
+        self.dimension_combo.set("Proveedor")
+        self.dimension_combo.pack(side=tk.LEFT, padx=5)
+        self.dimension_combo.bind("<<ComboboxSelected>>", lambda e: self.cargar_datos())
+
+        ttk.Label(controles, text="Período:", font=FONT_BASE, style="Modulo.TLabel").pack(side=tk.LEFT, padx=5)
+        self.periodo_combo = ttk.Combobox(controles, values=list(PERIODOS), state="readonly", width=10)
+        self.periodo_combo.set("Diario")
+        self.periodo_combo.pack(side=tk.LEFT, padx=5)
+        self.periodo_combo.bind("<<ComboboxSelected>>", lambda e: self.cargar_datos())
+
+        self.filtro_fechas = FiltroFechas(controles, self.cargar_datos)
+        self.filtro_fechas.frame.pack(side=tk.LEFT, padx=15)
+
+        self.rango_label = ttk.Label(self.frame, text="", style="Modulo.TLabel")
+        self.rango_label.pack(pady=5)
+
+        graficos = ttk.Frame(self.frame, style="Modulo.TFrame")
+        graficos.pack(fill="both", expand=True, padx=20, pady=10)
+        graficos.columnconfigure(0, weight=2)
+        graficos.columnconfigure(1, weight=3)
+        graficos.rowconfigure(0, weight=1)
+
+        self.canvas_ranking = tk.Canvas(graficos, bg=BG_PRIMARY, highlightthickness=0)
+        self.canvas_ranking.grid(row=0, column=0, sticky="nsew", padx=(0, 10))
+        self.canvas_serie = tk.Canvas(graficos, bg=BG_PRIMARY, highlightthickness=0)
+        self.canvas_serie.grid(row=0, column=1, sticky="nsew")
+        # Los gráficos se ajustan al tamaño: se redibujan (con los datos ya leídos) al redimensionar
+        self.canvas_ranking.bind("<Configure>", lambda e: self.dibujar())
+        self.canvas_serie.bind("<Configure>", lambda e: self.dibujar())
+
+        ttk.Button(self.frame, text="< Volver al Menú Principal", command=self.volver_callback, style="Modulo.TButton").pack(pady=20, ipadx=10)
+
+    def cargar_datos(self):
+        """Pide al hilo de la DB la serie y el ranking con los controles actuales."""
+        self._generacion += 1
+        generacion = self._generacion
+        self.rango_label.config(text="Cargando...")
+        self.ejecutor.enviar(
+            cargar_tablero, self.periodo_combo.get(), DIMENSIONES[self.dimension_combo.get()],
+            self.filtro_fechas.desde, self.filtro_fechas.hasta,
+            al_terminar=lambda datos: self._datos_cargados(datos, generacion),
+            al_fallar=self._error_de_carga,
+        )
+
+    def _datos_cargados(self, datos, generacion):
+        if generacion != self._generacion:
+            return
+        self.datos = datos
+        total = sum(valor for _, valor in datos["serie"])
+        self.rango_label.config(text=f"Del {datos['desde']} al {datos['hasta']}: total {_dinero(total)}")
+        self.dibujar()
+
+    def dibujar(self):
+        if self.datos is None:
+            return
+        por = self.dimension_combo.get().lower()
+        dibujar_barras_horizontales(self.canvas_ranking, self.datos["ranking"], f"Top {LIMITE_RANKING} por {por}")
+        dibujar_columnas(self.canvas_serie, self.datos["serie"], f"Gasto {self.periodo_combo.get().lower()}")
+
+    def refrescar(self):
+        """Relee los resúmenes al volver a la pantalla si las compras cambiaron."""
+        self.cargar_datos()
+
+    def _error_de_carga(self, e):
+        self.rango_label.config(text="")
+        messagebox.showerror("Error de DB", f"No se pudo cargar el análisis: {e}")
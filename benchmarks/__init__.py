@@ -0,0 +1,8 @@
+"""
+Scripts de medición de rendimiento de la aplicación.
+
+    python -m benchmarks                     # suite completa con datos sintéticos, resultados en JSON
+    python -m benchmarks.bench_mediciones    # ingesta masiva de mediciones por formato y orden
+
+Ver `benchmarks/__main__.py` (corrida y comparación), `datos.py` (generador) y `escenarios.py`.
+"""
@@ -0,0 +1,202 @@
+"""
+Benchmarks de la aplicación: genera datos sintéticos, mide los escenarios de
+`benchmarks/escenarios.py` y guarda los resultados en JSON para comparar versiones.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks                                   # escala "chica", todos los escenarios
+    python -m benchmarks --escala mediana --salida resultados.json
+    python -m benchmarks --compras 2000000 --escenarios carga busqueda
+    python -m benchmarks --salida nuevo.json --comparar resultados.json
+    xvfb-run python -m benchmarks                          # incluye los escenarios de pantalla
+
+Cada corrida genera bases nuevas en un directorio temporal: las de la aplicación no se tocan.
+Después de un escenario que escribe en ellas se vuelven a poner las recién generadas, así
+ningún escenario mide sobre lo que dejó otro.
+Con --comparar, el código de salida es 1 si algún escenario quedó más lento que el umbral.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks import datos
+from benchmarks.escenarios import ESCENARIOS, MODIFICAN_DATOS, Omitido
+
+REPETICIONES = 5
+# Cociente de medianas (actual / anterior) a partir del cual un escenario se marca como más lento
+UMBRAL_REGRESION = 1.25
+# Versión del formato del JSON de resultados
+FORMATO = 1
+
+
+def medir(operacion):
+    """Devuelve (milisegundos, filas) de una ejecución de `operacion`."""
+    inicio = time.perf_counter()
+    filas = operacion()
+    return (time.perf_counter() - inicio) * 1000, filas
+
+
+def correr_escenario(funcion, descripcion, repeticiones, azar):
+    """Mide `repeticiones` veces un escenario. Returns: dict con sus tiempos (o por qué no se midió)."""
+    tiempos = []
+    filas = 0
+    try:
+        for _ in range(repeticiones):
+            milisegundos, filas = medir(funcion(azar))
+            tiempos.append(milisegundos)
+    except Omitido as motivo:
+        return {"descripcion": descripcion, "omitido": str(motivo)}
+    except Exception as e:
+        return {"descripcion": descripcion, "error": f"{type(e).__name__}: {e}"}
+    return {
+        "descripcion": descripcion,
+        "repeticiones": repeticiones,
+        "filas": filas,
+        "mediana_ms": round(statistics.median(tiempos), 3),
+        "min_ms": round(min(tiempos), 3),
+        "max_ms": round(max(tiempos), 3),
+        "tiempos_ms": [round(t, 3) for t in tiempos],
+    }
+
+
+def seleccionar(prefijos):
+    """Escenarios cuyo nombre es uno de `prefijos` o empieza con "<prefijo>." (todos si no hay prefijos)."""
+    if not prefijos:
+        return list(ESCENARIOS)
+    return [nombre for nombre in ESCENARIOS
+            if any(nombre == prefijo or nombre.startswith(prefijo + ".") for prefijo in prefijos)]
+
+
+def entorno():
+    """Versiones y máquina donde se midió, para saber qué se está comparando."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "plataforma": platform.platform(),
+        "procesador": platform.processor() or platform.machine(),
+    }
+
+
+def comparar(anterior, actual):
+    """
+    Compara las medianas de dos resultados (los dicts del JSON).
+    Returns:
+        list: (escenario, mediana anterior, mediana actual, cociente) de los escenarios medidos en ambos.
+    """
+    filas = []
+    for nombre, medido in actual["escenarios"].items():
+        previo = anterior["escenarios"].get(nombre, {})
+        if "mediana_ms" in medido and "mediana_ms" in previo:
+            cociente = medido["mediana_ms"] / previo["mediana_ms"] if previo["mediana_ms"] else float("inf")
+            filas.append((nombre, previo["mediana_ms"], medido["mediana_ms"], cociente))
+    return filas
+
+
+def _imprimir_resultado(nombre, resultado):
+    if "mediana_ms" in resultado:
+        print(f"{nombre:<34} | {resultado['mediana_ms']:>12.2f} | {resultado['min_ms']:>10.2f} | {resultado['filas']:>8}")
+    else:
+        print(f"{nombre:<34} | {'-':>12} | {'-':>10} | {'-':>8}  "
+              f"({resultado.get('omitido') or resultado.get('error')})")
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Mide la aplicación con datos sintéticos y guarda los resultados en JSON.")
+    parser.add_argument("--escala", choices=sorted(datos.ESCALAS), default="chica",
+                        help="Tamaños base de las tablas (por defecto: chica).")
+    for tabla in datos.TABLAS:
+        parser.add_argument(f"--{tabla}", type=int, help=f"Filas de '{tabla}' (reemplaza la de la escala).")
+    parser.add_argument("--semilla", type=int, default=datos.SEMILLA, help="Semilla de los datos y los escenarios.")
+    parser.add_argument("--repeticiones", type=int, default=REPETICIONES, help="Veces que se mide cada escenario.")
+    parser.add_argument("--escenarios", nargs="*", default=[],
+                        help="Solo estos escenarios o grupos (p. ej. carga borrado.compra).")
+    parser.add_argument("--salida", help="Archivo JSON donde guardar los resultados.")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior contra el que comparar.")
+    parser.add_argument("--umbral", type=float, default=UMBRAL_REGRESION,
+                        help="Cociente de medianas a partir del cual se marca una regresión.")
+    parser.add_argument("--listar", action="store_true", help="Muestra los escenarios y sale.")
+    args = parser.parse_args(argumentos)
+
+    if args.listar:
+        for nombre, (_, descripcion) in ESCENARIOS.items():
+            print(f"{nombre:<34} {descripcion}")
+        return 0
+
+    nombres = seleccionar(args.escenarios)
+    if not nombres:
+        parser.error(f"Ningún escenario coincide con {args.escenarios} (ver --listar).")
+    tamanos = dict(datos.ESCALAS[args.escala])
+    for tabla in datos.TABLAS:
+        if getattr(args, tabla) is not None:
+            tamanos[tabla] = getattr(args, tabla)
+
+    resultados = {
+        "formato": FORMATO,
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "entorno": entorno(),
+        "parametros": {"escala": args.escala, "tamanos": tamanos, "semilla": args.semilla,
+                       "repeticiones": args.repeticiones},
+        "generacion": {},
+        "escenarios": {},
+    }
+
+    with tempfile.TemporaryDirectory(prefix="bench_adiapp_") as carpeta, datos.en_carpeta(carpeta):
+        print(f"Generando datos ({', '.join(f'{t}={n:,}' for t, n in tamanos.items())})...")
+        resultados["generacion"] = datos.generar(
+            tamanos, args.semilla,
+            progreso=lambda tabla, filas, segundos: print(f"   {tabla}: {filas:,} filas en {segundos:.1f} s"))
+        copia = os.path.join(carpeta, "generadas")
+        datos.guardar_copia(copia)
+
+        print(f"\n{'Escenario':<34} | {'Mediana (ms)':>12} | {'Mín. (ms)':>10} | {'Filas':>8}")
+        modificadas = False
+        for nombre in nombres:
+            if modificadas:
+                datos.restaurar_copia(copia)
+            modificadas = nombre in MODIFICAN_DATOS
+            funcion, descripcion = ESCENARIOS[nombre]
+            # Cada escenario con su propio generador: agregar uno no cambia lo que miden los demás
+            azar = random.Random(f"{args.semilla}-{nombre}")
+            resultado = correr_escenario(funcion, descripcion, args.repeticiones, azar)
+            resultados["escenarios"][nombre] = resultado
+            _imprimir_resultado(nombre, resultado)
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+        print(f"\nResultados guardados en {args.salida}.")
+
+    if not args.comparar:
+        return 0
+    with open(args.comparar, encoding="utf-8") as archivo:
+        anterior = json.load(archivo)
+    if anterior.get("parametros", {}).get("tamanos") != tamanos:
+        print("\nAdvertencia: la corrida anterior usó otros tamaños; la comparación no es directa.")
+    print(f"\n{'Escenario':<34} | {'Antes (ms)':>10} | {'Ahora (ms)':>10} | {'Cociente':>8}")
+    regresiones = 0
+    for nombre, antes, ahora, cociente in comparar(anterior, resultados):
+        marca = ""
+        if cociente >= args.umbral:
+            marca = "  ⚠️ más lento"
+            regresiones += 1
+        print(f"{nombre:<34} | {antes:>10.2f} | {ahora:>10.2f} | {cociente:>7.2f}x{marca}")
+    print(f"\n{regresiones} escenario(s) más lentos que {args.umbral:.2f}x la corrida anterior.")
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Mide cuánto tarda en abrir la pantalla de Compras con 10k, 100k y 1M filas.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_compras
+    python -m benchmarks.bench_compras 10000 50000
+
+La medición de la pantalla necesita un display (en servidores usar `xvfb-run`).
+Sin display solo se mide la capa de datos: la primera página paginada contra el
+antiguo SELECT * + fetchall().
+
+Cada tamaño usa una adidas.db nueva en un directorio temporal, abierta por `repositorio`
+(con el esquema y las migraciones de la aplicación); la del proyecto no se toca.
+"""
+import sys
+import tempfile
+import time
+import tkinter as tk
+
+import repositorio
+from benchmarks import datos
+from servicios import compras
+from tablas import TAMANO_PAGINA
+
+TAMANOS = [10_000, 100_000, 1_000_000]
+
+
+def generar_compras(conn, cantidad):
+    """Inserta `cantidad` compras sintéticas en la DB indicada."""
+    filas = (
+        (f"2024-{(i % 12) + 1:02d}-{(i % 28) + 1:02d}", f"Proveedor {i % 50}", float(i % 1000),
+         f"SKU-{i % 500:04d}", f"Cliente {i % 2000}")
+        for i in range(cantidad)
+    )
+    conn.executemany(compras.SQL_INSERTAR, filas)
+    conn.commit()
+
+
+def medir(funcion):
+    """Devuelve el tiempo en milisegundos que tarda en ejecutarse `funcion`."""
+    inicio = time.perf_counter()
+    funcion()
+    return (time.perf_counter() - inicio) * 1000
+
+
+def medir_pantalla():
+    """Construye ComprasUI sobre una ventana oculta y espera a que llegue la primera página."""
+    import compras as pantalla_compras
+    import imagenes
+    from estilos import configure_styles
+
+    root = tk.Tk()
+    root.withdraw()
+    configure_styles(root)
+
+    def abrir():
+        ui = pantalla_compras.ComprasUI(root, volver_callback=root.destroy)
+        while ui.paginador.cargando:
+            root.update()
+        root.update()
+
+    try:
+        tiempo = medir(abrir)
+    finally:
+        # El logo quedó en el registro: se suelta antes de que muera el intérprete de esta ventana
+        imagenes.registro.liberar()
+        root.destroy()
+    return tiempo
+
+
+def main(tamanos):
+    try:
+        tk.Tk().destroy()
+        hay_display = True
+    except tk.TclError:
+        hay_display = False
+        print("Advertencia: no hay display, solo se mide la capa de datos (usar xvfb-run para la pantalla).")
+
+    print(f"{'Filas':>10} | {'1ra página (ms)':>16} | {'fetchall (ms)':>14} | {'Pantalla (ms)':>14}")
+    for cantidad in tamanos:
+        with tempfile.TemporaryDirectory() as carpeta, datos.en_carpeta(carpeta):
+            conn = repositorio.obtener_conexion(compras.DB_NAME)
+            generar_compras(conn, cantidad)
+
+            pagina = medir(lambda: compras.obtener_pagina_compras(conn, None, TAMANO_PAGINA))
+            completo = medir(lambda: conn.execute("SELECT * FROM compras ORDER BY id DESC").fetchall())
+            pantalla = f"{medir_pantalla():14.1f}" if hay_display else f"{'-':>14}"
+
+            print(f"{cantidad:>10} | {pagina:16.2f} | {completo:14.1f} | {pantalla}")
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or TAMANOS)
@@ -0,0 +1,100 @@
+"""
+Mide la ingesta masiva de mediciones de calidad (data_manager.importar_mediciones)
+contra el camino de a una medición por commit de la pantalla de Producción.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_mediciones
+    python -m benchmarks.bench_mediciones 100000 500000
+
+Cada medición usa una DB nueva en un directorio temporal, con el esquema y las
+migraciones de produccion.db y los mismos PRAGMA que la aplicación.
+"""
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+import data_manager
+import migraciones
+import repositorio
+from servicios import produccion
+
+TAMANOS = [100_000, 1_000_000]
+LOTES = 2000
+MEDICIONES_POR_LOTE = 5000
+# El camino de a una medición por commit se mide con pocas filas (es el lento)
+MEDICIONES_DE_A_UNA = 2000
+
+
+def crear_db(ruta):
+    """Crea una produccion.db vacía con sus lotes, configurada como la de la aplicación."""
+    conn = sqlite3.connect(ruta)
+    conn.execute("PRAGMA journal_mode = WAL;")
+    conn.execute("PRAGMA synchronous = NORMAL;")
+    conn.execute("PRAGMA foreign_keys = ON;")
+    produccion.iniciar_db(conn)
+    migraciones.migrar(conn, repositorio.DB_PRODUCCION, progreso=lambda *args: None)
+    conn.execute("INSERT INTO Productos (nombre, sku) VALUES ('Producto', 'SKU-1');")
+    conn.executemany("INSERT INTO Lotes (producto_sku, cantidad, fecha_creacion) VALUES ('SKU-1', 100, '2024-01-01');",
+                     [()] * LOTES)
+    conn.commit()
+    return conn
+
+
+def generar_mediciones(cantidad, agrupadas=True, semilla=1):
+    """Mediciones sintéticas: agrupadas por lote (como salen de un banco) o con lotes al azar."""
+    azar = random.Random(semilla)
+    for i in range(cantidad):
+        lote = (i // MEDICIONES_POR_LOTE) % LOTES + 1 if agrupadas else azar.randint(1, LOTES)
+        yield (lote, ("peso", "largo", "ancho")[i % 3], round(azar.gauss(10, 1), 4),
+               1 if azar.random() < 0.97 else 0, f"2024-05-01 10:{i // 60 % 60:02d}:{i % 60:02d}")
+
+
+def escribir_archivo(ruta, filas):
+    with open(ruta, "w", encoding="utf-8", newline="") as archivo:
+        if ruta.endswith(".jsonl"):
+            for fila in filas:
+                archivo.write(json.dumps(dict(zip(data_manager.COLUMNAS_MEDICION, fila))) + "\n")
+        else:
+            archivo.write(",".join(data_manager.COLUMNAS_MEDICION) + "\n")
+            for fila in filas:
+                archivo.write(",".join(map(str, fila)) + "\n")
+
+
+def medir_de_a_una(carpeta):
+    """Filas/seg insertando y confirmando cada medición por separado (como el botón Registrar)."""
+    conn = crear_db(os.path.join(carpeta, "de_a_una.db"))
+    inicio = time.perf_counter()
+    for fila in generar_mediciones(MEDICIONES_DE_A_UNA):
+        conn.execute(produccion.SQL_EXISTE_LOTE, (fila[0],)).fetchone()
+        conn.execute(produccion.SQL_INSERTAR_CONTROL, fila)
+        conn.commit()
+    segundos = time.perf_counter() - inicio
+    conn.close()
+    return MEDICIONES_DE_A_UNA / segundos
+
+
+def main(tamanos):
+    print(f"De a una medición por commit: {MEDICIONES_DE_A_UNA} filas...")
+    with tempfile.TemporaryDirectory() as carpeta:
+        print(f"   {medir_de_a_una(carpeta):,.0f} filas/seg\n")
+
+    print(f"{'Mediciones':>10} | {'Formato':>7} | {'Orden':>9} | {'Filas/seg':>10} | {'Segundos':>8}")
+    for cantidad in tamanos:
+        for extension, agrupadas in ((".csv", True), (".jsonl", True), (".csv", False)):
+            with tempfile.TemporaryDirectory() as carpeta:
+                archivo = os.path.join(carpeta, "mediciones" + extension)
+                escribir_archivo(archivo, generar_mediciones(cantidad, agrupadas))
+                conn = crear_db(os.path.join(carpeta, "bench.db"))
+                resultado = data_manager.importar_mediciones(conn, archivo)
+                conn.close()
+            orden = "por lote" if agrupadas else "al azar"
+            print(f"{cantidad:>10} | {extension[1:]:>7} | {orden:>9} | "
+                  f"{resultado['filas_por_segundo']:>10,.0f} | {resultado['segundos']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or TAMANOS)
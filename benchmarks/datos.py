@@ -0,0 +1,201 @@
+"""
+Generador determinista de datos sintéticos para los benchmarks.
+
+Llena adidas.db y produccion.db con compras, empleados, productos, lotes y controles de
+calidad a través de `repositorio`, así las bases tienen el mismo esquema, migraciones,
+índices y triggers que las de la aplicación. Con la misma semilla y los mismos tamaños
+los datos son siempre los mismos: los resultados de dos versiones se pueden comparar.
+
+Las bases se crean en la carpeta de trabajo actual (los archivos de `repositorio` son
+rutas relativas): usar `en_carpeta` para generarlas en un directorio temporal.
+"""
+import os
+import random
+import shutil
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+import data_manager
+# repositorio importa migraciones recién al abrir la primera base: se importa antes de que
+# `en_carpeta` cambie la carpeta de trabajo (si no, no se encuentra al correr con `python -c`)
+import migraciones  # noqa: F401
+import papelera
+import repositorio
+from servicios import compras, empleados, produccion
+
+# Tamaños por escala: filas de cada tabla
+ESCALAS = {
+    "chica": {"compras": 10_000, "empleados": 1_000, "productos": 100, "lotes": 1_000, "controles": 50_000},
+    "mediana": {"compras": 100_000, "empleados": 10_000, "productos": 1_000, "lotes": 10_000, "controles": 500_000},
+    "grande": {"compras": 1_000_000, "empleados": 50_000, "productos": 5_000, "lotes": 50_000, "controles": 5_000_000},
+}
+TABLAS = ("compras", "empleados", "productos", "lotes", "controles")
+# Archivos de las bases (relativos a la carpeta de trabajo)
+BASES = (repositorio.DB_ADIDAS, repositorio.DB_PRODUCCION)
+SEMILLA = 1
+# Filas por executemany (y por commit) al generar
+TAMANO_BLOQUE = 50_000
+
+# Las fechas caen en estos cinco años
+FECHA_INICIAL = date(2020, 1, 1)
+DIAS = 5 * 365
+
+NOMBRES = ("Juan", "María", "Carlos", "Lucía", "Pedro", "Sofía", "Diego", "Valentina", "Martín", "Camila",
+           "Jorge", "Florencia", "Pablo", "Julieta", "Andrés", "Agustina", "Tomás", "Paula", "Nicolás", "Elena")
+APELLIDOS = ("Gómez", "Fernández", "Rodríguez", "López", "Martínez", "García", "Pérez", "Sánchez", "Romero",
+             "Díaz", "Torres", "Álvarez", "Ruiz", "Suárez", "Castro", "Vega", "Ríos", "Molina", "Ortiz", "Silva")
+PUESTOS = ("Vendedor", "Cajero", "Repositor", "Encargado", "Gerente", "Administrativo", "Logística")
+SUCURSALES = ("Centro", "Norte", "Sur", "Oeste", "Shopping", "Outlet", "Online")
+PARAMETROS = ("peso", "largo", "ancho", "costura")
+# Proporción de controles rechazados y de empleados dados de baja
+TASA_RECHAZO = 0.03
+TASA_BAJAS = 0.1
+
+
+def _azar(semilla, tabla):
+    """Un generador por tabla: los datos de una no cambian si cambia el tamaño de otra."""
+    return random.Random(f"{semilla}-{tabla}")
+
+
+def fecha_al_azar(azar):
+    """Una fecha ISO al azar entre FECHA_INICIAL y FECHA_INICIAL + DIAS."""
+    return (FECHA_INICIAL + timedelta(days=azar.randrange(DIAS))).isoformat()
+
+
+def _persona(azar):
+    return f"{azar.choice(NOMBRES)} {azar.choice(APELLIDOS)}"
+
+
+def sku(numero):
+    """SKU del producto número `numero` (desde 1)."""
+    return f"SKU-{numero:05d}"
+
+
+def filas_compras(cantidad, productos, semilla=SEMILLA):
+    azar = _azar(semilla, "compras")
+    for _ in range(cantidad):
+        yield (fecha_al_azar(azar), f"Proveedor {azar.randrange(200)}", round(azar.uniform(10, 5000), 2),
+               sku(azar.randint(1, max(productos, 1))), _persona(azar))
+
+
+def filas_empleados(cantidad, semilla=SEMILLA):
+    azar = _azar(semilla, "empleados")
+    for i in range(cantidad):
+        nombre = _persona(azar)
+        yield (nombre, azar.choice(PUESTOS), fecha_al_azar(azar), round(azar.uniform(300_000, 2_000_000), 2),
+               azar.choice(SUCURSALES), f"empleado{i}@adidas.com", f"11{azar.randrange(10**8):08d}",
+               fecha_al_azar(azar) if azar.random() < TASA_BAJAS else None)
+
+
+def filas_productos(cantidad):
+    for numero in range(1, cantidad + 1):
+        yield (f"Producto {numero}", sku(numero))
+
+
+def filas_lotes(cantidad, productos, semilla=SEMILLA):
+    azar = _azar(semilla, "lotes")
+    for _ in range(cantidad):
+        yield (sku(azar.randint(1, max(productos, 1))), azar.randint(50, 5000), fecha_al_azar(azar))
+
+
+def filas_controles(cantidad, lotes, semilla=SEMILLA):
+    """Controles agrupados por lote (como salen de un banco de medición), con hora creciente."""
+    azar = _azar(semilla, "controles")
+    inicio = datetime(2024, 1, 1)
+    por_lote = max(cantidad // max(lotes, 1), 1)
+    for i in range(cantidad):
+        lote_id = (i // por_lote) % max(lotes, 1) + 1
+        parametro = PARAMETROS[i % len(PARAMETROS)]
+        yield (lote_id, parametro, round(azar.gauss(10, 1), 4), 0 if azar.random() < TASA_RECHAZO else 1,
+               (inicio + timedelta(seconds=i)).strftime('%Y-%m-%d %H:%M:%S'))
+
+
+def _insertar(db_path, sql, filas):
+    """Inserta `filas` por bloques, un executemany y un commit por bloque. Devuelve (filas, segundos)."""
+    conexion = repositorio.obtener_conexion(db_path)
+    insertadas = 0
+    inicio = time.perf_counter()
+    bloque = []
+    for fila in filas:
+        bloque.append(fila)
+        if len(bloque) == TAMANO_BLOQUE:
+            with conexion:
+                conexion.executemany(sql, bloque)
+            insertadas += len(bloque)
+            bloque = []
+    if bloque:
+        with conexion:
+            conexion.executemany(sql, bloque)
+        insertadas += len(bloque)
+    return insertadas, time.perf_counter() - inicio
+
+
+def generar(tamanos, semilla=SEMILLA, progreso=None):
+    """
+    Crea y llena las bases de la aplicación en la carpeta de trabajo actual.
+    Args:
+        tamanos (dict): Filas por tabla (claves de TABLAS; las que falten quedan vacías).
+        semilla (int): Semilla de los datos.
+        progreso (callable): Se llama con (tabla, filas, segundos) al terminar cada tabla.
+    Returns:
+        dict: {tabla: {"filas": n, "segundos": s}}
+    """
+    tamanos = {tabla: tamanos.get(tabla, 0) for tabla in TABLAS}
+    pasos = (
+        ("compras", repositorio.DB_ADIDAS, compras.SQL_INSERTAR,
+         filas_compras(tamanos["compras"], tamanos["productos"], semilla)),
+        ("empleados", repositorio.DB_ADIDAS, empleados.SQL_INSERTAR, filas_empleados(tamanos["empleados"], semilla)),
+        ("productos", repositorio.DB_PRODUCCION, produccion.SQL_INSERTAR_PRODUCTO, filas_productos(tamanos["productos"])),
+        ("lotes", repositorio.DB_PRODUCCION, produccion.SQL_INSERTAR_LOTE,
+         filas_lotes(tamanos["lotes"], tamanos["productos"], semilla)),
+        ("controles", repositorio.DB_PRODUCCION, data_manager.SQL_INSERTAR_MEDICION,
+         filas_controles(tamanos["controles"], tamanos["lotes"], semilla)),
+    )
+    resultado = {}
+    for tabla, db_path, sql, filas in pasos:
+        insertadas, segundos = _insertar(db_path, sql, filas)
+        resultado[tabla] = {"filas": insertadas, "segundos": round(segundos, 3)}
+        if progreso:
+            progreso(tabla, insertadas, segundos)
+    return resultado
+
+
+@contextmanager
+def en_carpeta(carpeta):
+    """Trabaja con las bases de `carpeta` (se crean ahí) y cierra sus conexiones al salir."""
+    anterior = os.getcwd()
+    repositorio.cerrar_todas()
+    os.chdir(carpeta)
+    try:
+        yield carpeta
+    finally:
+        repositorio.cerrar_todas()
+        os.chdir(anterior)
+
+
+def guardar_copia(destino):
+    """
+    Copia las bases de la carpeta actual a `destino`, para volver a ellas con `restaurar_copia`.
+    Las conexiones se cierran antes: al cerrar la última, SQLite vuelca el WAL en el archivo.
+    """
+    repositorio.cerrar_todas()
+    os.makedirs(destino, exist_ok=True)
+    for base in BASES:
+        for archivo in (base, base + "-wal"):
+            if os.path.exists(archivo):
+                shutil.copy2(archivo, os.path.join(destino, archivo))
+
+
+def restaurar_copia(origen):
+    """Reemplaza las bases de la carpeta actual por las guardadas en `origen` (y vacía la pila de deshacer)."""
+    repositorio.cerrar_todas()
+    for base in BASES:
+        for archivo in (base, base + "-wal", base + "-shm"):
+            if os.path.exists(archivo):
+                os.remove(archivo)
+            guardado = os.path.join(origen, archivo)
+            if os.path.exists(guardado):
+                shutil.copy2(guardado, archivo)
+    # Los borrados apilados son de las bases que se acaban de reemplazar
+    papelera.pila = papelera.PilaDeshacer()
@@ -0,0 +1,251 @@
+"""
+Escenarios medidos por `python -m benchmarks`: carga de tablas, altas, borrados,
+búsquedas, detalle de lotes, reportes y archivos.
+
+Cada escenario se registra con `@escenario` y es una función `(azar) -> operacion`:
+lo que hace antes de devolver la operación (elegir ids, escribir un archivo...) no se
+mide; la operación se mide y devuelve cuántas filas procesó. Usan las mismas funciones
+y consultas que las pantallas (las de `servicios`, que no necesitan display), sobre las
+conexiones de `repositorio`. Los de la pantalla (`pantalla.*`) se omiten si no hay display.
+
+Los que escriben en las bases se registran con `modifica=True`: `python -m benchmarks`
+vuelve a poner las bases recién generadas antes del escenario siguiente, así cada
+escenario mide sobre los mismos datos, se corra solo o con todos.
+"""
+import os
+import tkinter as tk
+from datetime import date, timedelta
+
+import data_manager
+import reportes
+import repositorio
+from escritor_db import _escribir_lote
+from servicios import compras, empleados, produccion
+from tablas import TAMANO_PAGINA
+
+from benchmarks import datos
+
+# Nombre -> (función, descripción), en el orden en que se ejecutan
+ESCENARIOS = {}
+# Nombres de los escenarios que modifican las bases
+MODIFICAN_DATOS = set()
+
+# Filas de cada alta agrupada (las que junta el escritor en un intervalo típico de carga)
+FILAS_ALTA_AGRUPADA = 200
+# Las altas de a una commit por fila son el camino lento: se miden con menos filas
+FILAS_ALTA_DE_A_UNA = 50
+FILAS_BORRADO_EN_BLOQUE = 500
+PAGINAS_SCROLL = 10
+FILAS_IMPORTACION = 10_000
+
+
+class Omitido(Exception):
+    """El escenario no se puede medir en este entorno (p. ej. sin display)."""
+
+
+def escenario(nombre, descripcion, modifica=False):
+    """Registra un escenario de benchmark (`modifica`: escribe en las bases)."""
+    def registrar(funcion):
+        ESCENARIOS[nombre] = (funcion, descripcion)
+        if modifica:
+            MODIFICAN_DATOS.add(nombre)
+        return funcion
+    return registrar
+
+
+def _adidas():
+    return repositorio.obtener_conexion(repositorio.DB_ADIDAS)
+
+
+def _produccion():
+    return repositorio.obtener_conexion(repositorio.DB_PRODUCCION)
+
+
+def _max_id(tabla):
+    return _produccion().execute(f"SELECT IFNULL(MAX(id), 0) FROM {tabla};").fetchone()[0]
+
+
+def _ids_vivos(conexion, tabla, azar, cantidad):
+    """`cantidad` ids al azar de filas de `tabla` que no están en la papelera."""
+    ids = [fila[0] for fila in conexion.execute(f"SELECT id FROM {tabla} WHERE deleted_at IS NULL;")]
+    return azar.sample(ids, min(cantidad, len(ids)))
+
+
+def _recorrer(obtener_pagina, conexion, paginas):
+    """Pide `paginas` páginas seguidas, como al bajar con la scrollbar. Devuelve las filas leídas."""
+    ultima, leidas = None, 0
+    for _ in range(paginas):
+        filas = obtener_pagina(conexion, ultima, TAMANO_PAGINA)
+        if not filas:
+            break
+        ultima, leidas = filas[-1], leidas + len(filas)
+    return leidas
+
+
+# --- Carga de tablas (primera página y scroll) ---
+
+@escenario("carga.compras_primera_pagina", "Primera página de compras (más nuevas primero)")
+def _carga_compras(azar):
+    return lambda: len(compras.obtener_pagina_compras(_adidas(), None, TAMANO_PAGINA))
+
+
+@escenario("carga.compras_scroll_por_fecha", f"{PAGINAS_SCROLL} páginas de compras ordenadas por fecha")
+def _scroll_compras(azar):
+    pagina = lambda conn, ultima, limite: compras.obtener_pagina_compras(conn, ultima, limite, "fecha", False)
+    return lambda: _recorrer(pagina, _adidas(), PAGINAS_SCROLL)
+
+
+@escenario("carga.empleados_primera_pagina", "Primera página de empleados ordenados por nombre")
+def _carga_empleados(azar):
+    return lambda: len(empleados.obtener_pagina_empleados(_adidas(), None, TAMANO_PAGINA, "nombre"))
+
+
+@escenario("carga.productos_primera_pagina", "Primera página de productos ordenados por nombre")
+def _carga_productos(azar):
+    return lambda: len(produccion.obtener_pagina_productos(_produccion(), None, TAMANO_PAGINA))
+
+
+@escenario("carga.lotes_scroll", f"{PAGINAS_SCROLL} páginas de lotes con producto y estado de calidad")
+def _scroll_lotes(azar):
+    return lambda: _recorrer(produccion.obtener_pagina_lotes, _produccion(), PAGINAS_SCROLL)
+
+
+# --- Altas ---
+
+@escenario("alta.compras_agrupadas", f"{FILAS_ALTA_AGRUPADA} compras en una transacción (escritor agrupado)", modifica=True)
+def _alta_compras_agrupadas(azar):
+    filas = list(datos.filas_compras(FILAS_ALTA_AGRUPADA, 1, semilla=azar.random()))
+    escrituras = [(compras.SQL_INSERTAR, fila) for fila in filas]
+    return lambda: len(_escribir_lote(_adidas(), escrituras, "NORMAL"))
+
+
+@escenario("alta.compras_de_a_una", f"{FILAS_ALTA_DE_A_UNA} compras con un commit por fila", modifica=True)
+def _alta_compras_de_a_una(azar):
+    filas = list(datos.filas_compras(FILAS_ALTA_DE_A_UNA, 1, semilla=azar.random()))
+
+    def operacion():
+        for fila in filas:
+            repositorio.ejecutar(repositorio.DB_ADIDAS, compras.SQL_INSERTAR, fila)
+        return len(filas)
+    return operacion
+
+
+@escenario("alta.mediciones_agrupadas", f"{FILAS_ALTA_AGRUPADA} mediciones de un lote en una transacción", modifica=True)
+def _alta_mediciones(azar):
+    lote = _max_id("Lotes")
+    if not lote:
+        raise Omitido("no hay lotes")
+    escrituras = [(produccion.SQL_INSERTAR_CONTROL, (lote,) + fila[1:])
+                  for fila in datos.filas_controles(FILAS_ALTA_AGRUPADA, 1, semilla=azar.random())]
+    return lambda: len(_escribir_lote(_produccion(), escrituras, "NORMAL"))
+
+
+# --- Borrados (a la papelera) y deshacer ---
+
+@escenario("borrado.compra", "Borrar una compra", modifica=True)
+def _borrar_compra(azar):
+    ids = _ids_vivos(_adidas(), "compras", azar, 1)
+    return lambda: compras.borrar_compras(ids)
+
+
+@escenario("borrado.compras_en_bloque", f"Borrar {FILAS_BORRADO_EN_BLOQUE} compras seleccionadas", modifica=True)
+def _borrar_compras(azar):
+    ids = _ids_vivos(_adidas(), "compras", azar, FILAS_BORRADO_EN_BLOQUE)
+    return lambda: compras.borrar_compras(ids)
+
+
+@escenario("borrado.deshacer", f"Deshacer el borrado de {FILAS_BORRADO_EN_BLOQUE} compras", modifica=True)
+def _deshacer(azar):
+    # El borrado a deshacer es parte de la preparación (no se mide)
+    compras.borrar_compras(_ids_vivos(_adidas(), "compras", azar, FILAS_BORRADO_EN_BLOQUE))
+    return lambda: len(compras.deshacer_borrado())
+
+
+# --- Búsquedas ---
+
+@escenario("busqueda.compras_texto", "Búsqueda por cliente/proveedor (FTS) y su primera página")
+def _buscar_compras(azar):
+    texto = f"{azar.choice(datos.APELLIDOS)} {azar.choice(datos.NOMBRES)[:3]}"
+    expresion = compras.expresion_busqueda(texto)
+    return lambda: len(compras.obtener_pagina_compras(_adidas(), None, TAMANO_PAGINA, busqueda=expresion))
+
+
+@escenario("busqueda.compras_rango_fechas", "Cantidad y total de un mes de compras, y su primera página")
+def _rango_compras(azar):
+    desde = datos.fecha_al_azar(azar)
+    hasta = (date.fromisoformat(desde) + timedelta(days=30)).isoformat()
+
+    def operacion():
+        compras.resumen_rango(_adidas(), desde, hasta)
+        return len(compras.obtener_pagina_compras(_adidas(), None, TAMANO_PAGINA, desde=desde, hasta=hasta))
+    return operacion
+
+
+# --- Detalle de lotes ---
+
+@escenario("detalle_lote.estado", "Estado de calidad de un lote (ResumenLotes)")
+def _estado_lote(azar):
+    lote = azar.randint(1, max(_max_id("Lotes"), 1))
+    return lambda: int(produccion.estado_de_lote(_produccion(), lote) is not None)
+
+
+@escenario("detalle_lote.controles", "Primera página de los controles de calidad de un lote")
+def _controles_lote(azar):
+    lote = azar.randint(1, max(_max_id("Lotes"), 1))
+    return lambda: len(produccion.obtener_pagina_controles(_produccion(), None, TAMANO_PAGINA, lote))
+
+
+# --- Reportes y archivos ---
+
+@escenario("reporte.calidad_por_producto", "Reporte de compras cruzadas con la calidad de producción")
+def _reporte(azar):
+    conexion = repositorio.obtener_conexion(repositorio.DB_UNIFICADA)
+    return lambda: len(reportes.generar_reporte(conexion, "productos")[1])
+
+
+@escenario("archivo.exportar_compras", "Exportar todas las compras a CSV")
+def _exportar(azar):
+    archivo = os.path.abspath("bench_exportacion.csv")
+    return lambda: data_manager.exportar_csv(_adidas(), "compras", archivo)["filas"]
+
+
+@escenario("archivo.importar_mediciones", f"Importar {FILAS_IMPORTACION:,} mediciones desde CSV", modifica=True)
+def _importar(azar):
+    lotes = _max_id("Lotes")
+    if not lotes:
+        raise Omitido("no hay lotes")
+    archivo = os.path.abspath("bench_mediciones.csv")
+    with open(archivo, "w", encoding="utf-8", newline="") as csvfile:
+        csvfile.write(",".join(data_manager.COLUMNAS_MEDICION) + "\n")
+        for fila in datos.filas_controles(FILAS_IMPORTACION, lotes, semilla=azar.random()):
+            csvfile.write(",".join(map(str, fila)) + "\n")
+    # desde_cero: cada repetición vuelve a importar el archivo entero (no lo reanuda)
+    return lambda: data_manager.importar_mediciones(_produccion(), archivo, desde_cero=True)["filas"]
+
+
+# --- Pantalla (necesita display: en servidores, xvfb-run) ---
+
+@escenario("pantalla.abrir_compras", "Abrir la pantalla de Compras hasta ver la primera página")
+def _pantalla_compras(azar):
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        raise Omitido("no hay display (usar xvfb-run)")
+    root.withdraw()
+    import compras as pantalla_compras
+    import imagenes
+    from estilos import configure_styles
+    configure_styles(root)
+
+    def operacion():
+        try:
+            ui = pantalla_compras.ComprasUI(root, volver_callback=root.destroy)
+            while ui.paginador.cargando:
+                root.update()
+            root.update()
+            return len(ui.tabla.get_children())
+        finally:
+            # El logo quedó en el registro: se suelta antes de que muera el intérprete de esta ventana
+            imagenes.registro.liberar()
+            root.destroy()
+    return operacion
@@ -1,49 +1,24 @@
 import tkinter as tk
 import sqlite3
-from tkinter import ttk, messagebox
+from functools import partial
+from tkinter import ttk, messagebox, filedialog
 # from data_manager import save_data, load_data # Ya no se usan
 # Importamos BG_MODULO para el fondo negro
 from estilos import BG_MODULO, FG_PRIMARY, COLOR_ACCENT, FONT_BASE, FONT_BUTTON, add_logo_header
+from tablas import TablaPaginada, OrdenTabla, FiltroFechas
+from ejecutor_db import obtener_ejecutor
+from escritor_db import obtener_escritor
+import data_manager
+# Esquema, consultas y validación viven en la capa de datos (sin Tkinter): esta pantalla
+# solo lee los campos, llama al servicio y muestra el resultado
+from servicios import Compra, DatosInvalidos
+from servicios import compras as servicio
 
 # DATA_FILE = "compras.csv" # Ya no se usa
-# Campo modificado: "sucursal" -> "proveedor"
-FIELDNAMES = ["id", "fecha", "proveedor", "monto", "identificador_producto", "cliente"]
-
-# === Manejo Global de la Conexión y Base de Datos ===
-
-# Objeto de conexión global 
-conexion = None 
-
-try:
-    # Intenta establecer la conexión con la DB
-    conexion = sqlite3.connect('adidas.db')
-    print(f"Conexión a SQLite ({'adidas.db'}) establecida con éxito.")
-except sqlite3.Error as e:
-    print(f"Error al conectar a SQLite: {e}")
-    messagebox.showerror("Error de Conexión", f"No se pudo conectar a la base de datos: {e}")
-
-
-def iniciar_db(conn):
-    """Asegura que la tabla 'compras' exista en la base de datos, usando 'proveedor'."""
-    cursor = conn.cursor()
-    # Campo modificado en la creación de la tabla
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS compras (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        fecha TEXT NOT NULL,
-        proveedor TEXT,
-        monto REAL NOT NULL,
-        identificador_producto TEXT,
-        cliente TEXT
-    );
-    """)
-    conn.commit()
-    cursor.close()
-    print("Tabla 'compras' verificada/creada.")
-
-# Aseguramos la inicialización de la tabla al iniciar la conexión
-if conexion:
-    iniciar_db(conexion)
+
+# Espera (ms) desde la última tecla antes de buscar
+RETARDO_BUSQUEDA_MS = 250
+
 
 # ======================================================
 
@@ -55,8 +30,15 @@ class ComprasUI:
         self.frame.pack(fill="both", expand=True) 
 
         self.volver_callback = volver_callback
+        # Expresión FTS de la búsqueda activa (None = listado completo)
+        self.busqueda = None
+        self._busqueda_pendiente = None
+        # Las lecturas corren en un hilo aparte: la pantalla se dibuja sin esperar a la DB
+        self.ejecutor = obtener_ejecutor(root, servicio.DB_NAME)
+        # Las altas se confirman agrupadas en ese mismo hilo (group commit)
+        self.escritor = obtener_escritor(root, servicio.DB_NAME)
         self.crear_ui()
-        # Ahora carga los datos directamente desde SQLite
+        # Pide la primera página; la tabla se rellena cuando llegan los datos
         self.cargar_datos_en_tabla()
 
     def crear_ui(self, *args, **kwargs):
@@ -112,8 +94,25 @@ class ComprasUI:
 
         # Botones usan estilo Modulo.TButton (Blanco con texto negro)
         ttk.Button(button_container, text="Agregar Compra (Pedido)", command=self.agregar_compra, style="Modulo.TButton").pack(side=tk.LEFT, padx=10, ipadx=10)
-        ttk.Button(button_container, text="Borrar Seleccionado", command=self.borrar_compra, style="Modulo.TButton").pack(side=tk.LEFT, padx=10, ipadx=10)
-
+        ttk.Button(button_container, text="Borrar Seleccionados", command=self.borrar_compra, style="Modulo.TButton").pack(side=tk.LEFT, padx=10, ipadx=10)
+        ttk.Button(button_container, text="Deshacer Borrado", command=self.deshacer_borrado, style="Modulo.TButton").pack(side=tk.LEFT, padx=10, ipadx=10)
+        ttk.Button(button_container, text="Importar CSV", command=self.importar_csv, style="Modulo.TButton").pack(side=tk.LEFT, padx=10, ipadx=10)
+        ttk.Button(button_container, text="Exportar CSV", command=self.exportar_csv, style="Modulo.TButton").pack(side=tk.LEFT, padx=10, ipadx=10)
+        ttk.Button(button_container, text="Exportar Seleccionados", command=self.exportar_seleccion, style="Modulo.TButton").pack(side=tk.LEFT, padx=10, ipadx=10)
+
+        # Barra de búsqueda: filtra mientras se escribe
+        search_frame = ttk.Frame(self.frame, style="Modulo.TFrame")
+        search_frame.pack(pady=(5, 0))
+        ttk.Label(search_frame, text="Buscar (cliente, proveedor o producto):", font=FONT_BASE, style="Modulo.TLabel").pack(side=tk.LEFT, padx=10)
+        self.busqueda_var = tk.StringVar()
+        self.busqueda_var.trace_add("write", self._busqueda_modificada)
+        ttk.Entry(search_frame, textvariable=self.busqueda_var, width=40, style="TEntry").pack(side=tk.LEFT, padx=10)
+
+        # Filtro por rango de fechas, con la cantidad y el total del rango
+        self.filtro_fechas = FiltroFechas(self.frame, self._filtro_cambiado)
+        self.filtro_fechas.frame.pack(pady=(5, 0))
+        self.resumen_label = ttk.Label(self.frame, text="", style="Modulo.TLabel")
+        self.resumen_label.pack()
 
         # Tabla (Treeview) para mostrar las compras
         # CAMBIO: "Sucursal" a "Proveedor"
@@ -122,11 +121,12 @@ class ComprasUI:
         table_frame = ttk.Frame(self.frame, style="Modulo.TFrame")
         table_frame.pack(pady=10, fill="both", expand=True, padx=20)
         
-        self.tabla = ttk.Treeview(table_frame, columns=columns, show="headings", style="BlackText.Treeview")
+        # Selección de varias filas (Ctrl/Shift + clic) para borrar o exportar en bloque
+        self.tabla = ttk.Treeview(table_frame, columns=columns, show="headings", style="BlackText.Treeview",
+                                  selectmode="extended")
         
         vsb = ttk.Scrollbar(table_frame, orient="vertical", command=self.tabla.yview)
         vsb.pack(side='right', fill='y')
-        self.tabla.configure(yscrollcommand=vsb.set)
 
         for col in columns:
             self.tabla.heading(col, text=col)
@@ -134,6 +134,13 @@ class ComprasUI:
             
         self.tabla.pack(side='left', fill="both", expand=True)
 
+        # Los encabezados ordenan en SQL; el orden elegido se conserva mientras viva la pantalla
+        self.orden = OrdenTabla(self.tabla, servicio.COLUMNAS_ORDEN, self._consulta_cambiada, "ID", descendente=True)
+
+        # La tabla se rellena por páginas a medida que se usa la scrollbar
+        self.paginador = TablaPaginada(self.tabla, vsb, self._obtener_pagina(), self.ejecutor,
+                                       al_fallar=self._error_de_carga)
+
         # Botón para volver (Blanco con texto negro)
         ttk.Button(self.frame, text="< Volver al Menú Principal", command=self.volver_callback, style="Modulo.TButton").pack(pady=20, ipadx=10)
     
@@ -144,99 +151,181 @@ class ComprasUI:
 
     def agregar_compra(self):
         """Recoge los datos, valida y agrega una nueva compra a la DB."""
-        fecha = self.fecha_entry.get()
-        # CAMBIO: Usar self.proveedor_entry
-        proveedor = self.proveedor_entry.get() 
-        monto_str = self.monto_entry.get()
-        identificador_producto = self.identificador_producto_entry.get()
-        cliente = self.cliente_entry.get()
-
-        # CAMBIO: Usar proveedor en la validación
-        if not all([fecha, proveedor, monto_str, identificador_producto, cliente]):
-            messagebox.showerror("Error", "Por favor, completa todos los campos obligatorios.")
+        try:
+            compra = Compra.desde_formulario(self.fecha_entry.get(), self.proveedor_entry.get(), self.monto_entry.get(),
+                                             self.identificador_producto_entry.get(), self.cliente_entry.get())
+        except DatosInvalidos as e:
+            messagebox.showerror("Error", str(e))
             return
+        datos = compra.parametros()
+
+        # La fila se ve enseguida (en gris) y el escritor la confirma junto con las demás
+        # altas; con una búsqueda o un filtro activos la tabla muestra solo resultados, así
+        # que no se agrega
+        provisoria = None
+        if self.busqueda is None and not self.filtro_fechas.activo:
+            provisoria = self.paginador.insertar_pendiente(("…",) + datos, self.orden.encabezado,
+                                                           self.orden.descendente)
+        self.escritor.escribir(
+            servicio.SQL_INSERTAR, datos,
+            al_confirmar=lambda nuevo_id: self.paginador.confirmar_pendiente(provisoria, nuevo_id, (nuevo_id,) + datos),
+            al_fallar=lambda e: self._alta_rechazada(provisoria, e),
+        )
+        self.limpiar_campos()
+
+    def _alta_rechazada(self, provisoria, e):
+        self.paginador.quitar_pendiente(provisoria)
+        messagebox.showerror("Error de DB", f"Ocurrió un error al insertar: {e}")
+
+
+    def _seleccion_confirmada(self, accion):
+        """Los iids seleccionados ya guardados, o None (con aviso) si no hay ninguno."""
+        seleccionadas, pendientes = self.paginador.seleccion()
+        if not seleccionadas:
+            if pendientes:
+                messagebox.showwarning("Advertencia", "Las compras seleccionadas todavía se están guardando; intenta de nuevo en un momento.")
+            else:
+                messagebox.showwarning("Advertencia", f"Selecciona una o más compras para {accion}.")
+            return None
+        return seleccionadas
 
-        try:
-            monto = float(monto_str)
-        except ValueError:
-            messagebox.showerror("Error", "El monto debe ser un número válido.")
+    def borrar_compra(self):
+        """Manda las compras seleccionadas a la papelera, todas juntas (se puede deshacer)."""
+        seleccionadas = self._seleccion_confirmada("borrar")
+        if not seleccionadas:
             return
 
-        cursor = conexion.cursor()
-        
-        # CAMBIO: Usar columna 'proveedor' y variable 'proveedor'
-        sql_insert = """
-        INSERT INTO compras (fecha, proveedor, monto, identificador_producto, cliente)
-        VALUES (?, ?, ?, ?, ?);
-        """
-        datos = (fecha, proveedor, monto, identificador_producto, cliente)
+        # Una sola confirmación para toda la selección
+        if len(seleccionadas) == 1:
+            pregunta = f"¿Estás seguro de que deseas borrar la compra ID {seleccionadas[0]}?"
+        else:
+            pregunta = f"¿Estás seguro de que deseas borrar {len(seleccionadas)} compras?"
+        if messagebox.askyesno("Confirmar Borrado", pregunta):
+            try:
+                # Borrado lógico en una transacción (un executemany), y se quitan solo esas filas
+                borradas = servicio.borrar_compras(seleccionadas)
+                self.paginador.quitar(seleccionadas)
+                messagebox.showinfo("Éxito", f"{borradas} compra(s) borrada(s). Puedes recuperarlas con 'Deshacer Borrado'.")
 
-        try:
-            cursor.execute(sql_insert, datos)
-            conexion.commit() # Guardar los cambios en la DB
-            
-            self.cargar_datos_en_tabla()
-            self.limpiar_campos()
-            messagebox.showinfo("Éxito", "Compra agregada correctamente.")
+            except sqlite3.Error as e:
+                 messagebox.showerror("Error de DB", f"Ocurrió un error al borrar: {e}")
 
+    def deshacer_borrado(self):
+        """Restaura el último borrado de compras y vuelve a mostrar sus filas."""
+        try:
+            restauradas = servicio.deshacer_borrado()
+            if not restauradas:
+                messagebox.showinfo("Deshacer", "No hay borrados recientes de compras para deshacer.")
+                return
+            # Con una búsqueda o un filtro activos no se sabe si las filas entran: se recarga la vista
+            if self.busqueda is not None or self.filtro_fechas.activo:
+                self.cargar_datos_en_tabla()
+                return
+            self.paginador.insertar_varios([(compra.id, (compra.id,) + compra.parametros()) for compra in restauradas],
+                                           self.orden.encabezado, self.orden.descendente)
         except sqlite3.Error as e:
-             messagebox.showerror("Error de DB", f"Ocurrió un error al insertar: {e}")
-        finally:
-            cursor.close()
+            messagebox.showerror("Error de DB", f"Ocurrió un error al deshacer el borrado: {e}")
 
 
-    def borrar_compra(self):
-        """Elimina la compra seleccionada de la DB."""
-        selected_item = self.tabla.selection()
-        if not selected_item:
-            messagebox.showwarning("Advertencia", "Selecciona una compra para borrar.")
+    def cargar_datos_en_tabla(self):
+        """Limpia la tabla y pide la primera página de compras al hilo de la DB."""
+        self.paginador.recargar()
+
+    def _busqueda_modificada(self, *args):
+        """Debounce: la búsqueda corre recién cuando se deja de escribir."""
+        if self._busqueda_pendiente is not None:
+            self.frame.after_cancel(self._busqueda_pendiente)
+        self._busqueda_pendiente = self.frame.after(RETARDO_BUSQUEDA_MS, self._aplicar_busqueda)
+
+    def _aplicar_busqueda(self):
+        """Cambia la consulta de la tabla según el texto de búsqueda (los resultados llegan por páginas)."""
+        self._busqueda_pendiente = None
+        expresion = servicio.expresion_busqueda(self.busqueda_var.get())
+        if expresion == self.busqueda:
             return
+        self.busqueda = expresion
+        self._consulta_cambiada()
+
+    def _obtener_pagina(self):
+        """Función de página para el orden y la búsqueda actuales."""
+        return partial(servicio.obtener_pagina_compras, columna=self.orden.columna,
+                       descendente=self.orden.descendente, busqueda=self.busqueda,
+                       desde=self.filtro_fechas.desde, hasta=self.filtro_fechas.hasta)
+
+    def _consulta_cambiada(self):
+        """Vuelve a cargar la tabla desde la primera página con el orden y la búsqueda actuales."""
+        limite_total = servicio.LIMITE_BUSQUEDA if self.busqueda else None
+        self.paginador.cambiar_consulta(self._obtener_pagina(), limite_total=limite_total)
+
+    def _filtro_cambiado(self):
+        """Recarga la tabla con el nuevo rango y pide la cantidad y el total del rango."""
+        self._consulta_cambiada()
+        if not self.filtro_fechas.activo:
+            self.resumen_label.config(text="")
+            return
+        self.resumen_label.config(text="Calculando...")
+        self.ejecutor.enviar(servicio.resumen_rango, self.filtro_fechas.desde, self.filtro_fechas.hasta,
+                             al_terminar=self._mostrar_resumen, al_fallar=self._error_de_carga)
+
+    def _mostrar_resumen(self, resumen):
+        cantidad, total = resumen
+        self.resumen_label.config(text=f"{cantidad} compras en el rango, total ${total:,.2f}")
 
-        item_data = self.tabla.item(selected_item, 'values')
-        compra_id = item_data[0] # El ID es el primer valor
+    def refrescar(self):
+        """Recarga los datos (y el resumen del rango) al volver a la pantalla si la tabla cambió."""
+        self._filtro_cambiado()
 
-        if messagebox.askyesno("Confirmar Borrado", f"¿Estás seguro de que deseas borrar la compra ID {compra_id}?"):
-            cursor = conexion.cursor()
+    def _error_de_carga(self, e):
+        messagebox.showerror("Error de DB", f"No se pudo cargar la tabla: {e}")
             
-            try:
-                # Consulta DELETE (no necesita cambios)
-                sql_delete = "DELETE FROM compras WHERE id = ?;"
-                cursor.execute(sql_delete, (compra_id,))
-                conexion.commit() # Guardar los cambios
-                
-                # Recargar la tabla
-                self.cargar_datos_en_tabla()
-                messagebox.showinfo("Éxito", f"Compra ID {compra_id} borrada correctamente.")
+    def importar_csv(self):
+        """Importa un CSV de compras en el hilo de la DB (por bloques) y recarga la tabla al terminar."""
+        archivo = filedialog.askopenfilename(title="Importar compras desde CSV", filetypes=[("CSV", "*.csv")])
+        if not archivo:
+            return
+        self.paginador.indicador.mostrar()
+        self.ejecutor.enviar(data_manager.importar_csv, "compras", archivo,
+                             al_terminar=self._importacion_terminada, al_fallar=self._error_de_archivo)
 
-            except sqlite3.Error as e:
-                 messagebox.showerror("Error de DB", f"Ocurrió un error al borrar: {e}")
-            finally:
-                cursor.close()
+    def _importacion_terminada(self, resultado):
+        self.cargar_datos_en_tabla()
+        messagebox.showinfo("Éxito", f"Se importaron {resultado['filas']} filas "
+                                     f"({resultado['filas_por_segundo']:,.0f} filas/seg).")
+
+    def exportar_csv(self):
+        """Exporta la tabla de compras a un CSV en el hilo de la DB, sin cargarla en memoria."""
+        archivo = filedialog.asksaveasfilename(title="Exportar compras a CSV", defaultextension=".csv",
+                                               filetypes=[("CSV", "*.csv")])
+        if not archivo:
+            return
+        self.paginador.indicador.mostrar()
+        # Las altas pendientes se confirman antes, así el archivo las incluye
+        self.escritor.vaciar()
+        self.ejecutor.enviar(data_manager.exportar_csv, "compras", archivo,
+                             al_terminar=self._exportacion_terminada, al_fallar=self._error_de_archivo)
+
+    def exportar_seleccion(self):
+        """Exporta a un CSV solo las compras seleccionadas, en el hilo de la DB."""
+        seleccionadas = self._seleccion_confirmada("exportar")
+        if not seleccionadas:
+            return
+        archivo = filedialog.asksaveasfilename(title="Exportar compras seleccionadas a CSV", defaultextension=".csv",
+                                               filetypes=[("CSV", "*.csv")])
+        if not archivo:
+            return
+        self.paginador.indicador.mostrar()
+        self.ejecutor.enviar(partial(data_manager.exportar_csv, ids=seleccionadas), "compras", archivo,
+                             al_terminar=self._exportacion_terminada, al_fallar=self._error_de_archivo)
 
+    def _exportacion_terminada(self, resultado):
+        self.paginador.indicador.ocultar()
+        messagebox.showinfo("Éxito", f"Se exportaron {resultado['filas']} filas "
+                                     f"({resultado['filas_por_segundo']:,.0f} filas/seg).")
 
-    def cargar_datos_en_tabla(self):
-        """Limpia la tabla y la rellena con los datos actuales de la DB."""
-        # Limpiar la tabla
-        for item in self.tabla.get_children():
-            self.tabla.delete(item)
-            
-        cursor = conexion.cursor()
-        
-        try:
-            # Consulta SELECT (no necesita cambios)
-            cursor.execute("SELECT * FROM compras ORDER BY id DESC")
-            compras = cursor.fetchall()
-            
-            # Insertar nuevos datos
-            for compra in compras:
-                # La tupla compra ya trae los datos en el orden correcto (..., proveedor, monto, ...)
-                self.tabla.insert('', 'end', values=compra)
+    def _error_de_archivo(self, e):
+        self.paginador.indicador.ocultar()
+        messagebox.showerror("Error", f"No se pudo procesar el archivo: {e}")
 
-        except sqlite3.Error as e:
-             messagebox.showerror("Error de DB", f"No se pudo cargar la tabla: {e}")
-        finally:
-            cursor.close()
-            
     # -------------------------------------------------------------
     # ⬆️ FIN DE FUNCIONES ADAPTADAS ⬆️
     # -------------------------------------------------------------
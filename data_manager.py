@@ -1,5 +1,14 @@
+import argparse
 import csv
+import itertools
+import json
 import os
+import time
+from datetime import datetime
+
+import fechas
+import papelera
+import repositorio
 
 def save_data(filename, data, fieldnames):
     """
@@ -38,3 +47,500 @@ def load_data(filename):
         print(f"Error al leer del archivo {filename}: {e}")
     return data
 
+
+
+# =====================================================================
+# Importación / exportación por streaming entre CSV y SQLite
+# =====================================================================
+
+# Filas por bloque: cada bloque es una transacción con un único executemany
+TAMANO_BLOQUE = 5000
+
+# En qué base de datos vive cada tabla importable/exportable
+DB_DE_TABLA = {
+    "compras": repositorio.DB_ADIDAS,
+    "empleados": repositorio.DB_ADIDAS,
+    "Productos": repositorio.DB_PRODUCCION,
+    "Lotes": repositorio.DB_PRODUCCION,
+    "ControlesCalidad": repositorio.DB_PRODUCCION,
+}
+
+# Columnas de fecha que se guardan en ISO-8601 (ver fechas.py)
+COLUMNAS_FECHA = {
+    "compras": {"fecha"},
+    "empleados": {"fecha_ingreso", "fecha_de_baja"},
+}
+
+# Encabezados viejos de los CSV que hoy tienen otro nombre en la tabla
+ALIAS_COLUMNAS = {
+    "compras": {"sucursal": "proveedor"},
+    "empleados": {"contacto_email": "contacto_mail"},
+}
+
+# Las sentencias SQL_* se declaran aquí para que `diagnostico.py` revise su plan: las de texto
+# en produccion.db (la de la ingesta de mediciones; `importaciones` es igual en las dos bases),
+# las que son un dict {tabla: sql} en la base de cada tabla
+DB_NAME = repositorio.DB_PRODUCCION
+ORDEN_EN_MEMORIA_ACEPTADO = {
+    "SQL_RESUMIR_MEDICIONES": "agrupa por lote solo las mediciones del bloque recién insertado",
+}
+
+# Punto de control de una importación (filas del archivo ya importadas), por su clave primaria
+SQL_PUNTO_DE_CONTROL = "SELECT filas FROM importaciones WHERE archivo = ? AND tabla = ?;"
+SQL_GUARDAR_PUNTO_DE_CONTROL = "INSERT OR REPLACE INTO importaciones (archivo, tabla, filas) VALUES (?, ?, ?);"
+SQL_BORRAR_PUNTO_DE_CONTROL = "DELETE FROM importaciones WHERE archivo = ? AND tabla = ?;"
+
+# Los ids a exportar van a una tabla TEMP con un executemany: sin límite de parámetros y con
+# una sola consulta (y un solo cursor) para todo el archivo
+SQL_CREAR_SELECCION = "CREATE TEMP TABLE IF NOT EXISTS seleccion_exportar (id INTEGER PRIMARY KEY);"
+SQL_VACIAR_SELECCION = "DELETE FROM temp.seleccion_exportar;"
+SQL_AGREGAR_A_SELECCION = "INSERT OR IGNORE INTO temp.seleccion_exportar (id) VALUES (?);"
+# {columnas} son las de la tabla sin deleted_at: las filas en la papelera no se exportan, ni esa columna
+SQL_EXPORTAR_SELECCION = {
+    tabla: f"SELECT {{columnas}} FROM {tabla} WHERE "
+           f"{'deleted_at IS NULL AND ' if tabla in papelera.DB_DE_TABLA else ''}"
+           "id IN (SELECT id FROM temp.seleccion_exportar) ORDER BY id;"
+    for tabla in DB_DE_TABLA
+}
+
+
+def leer_csv_por_bloques(filename, tamano_bloque=TAMANO_BLOQUE, saltar=0):
+    """
+    Lee un CSV de a bloques sin cargarlo entero en memoria.
+    Args:
+        filename (str): El nombre del archivo CSV.
+        tamano_bloque (int): Cantidad de filas por bloque.
+        saltar (int): Filas de datos a omitir al comienzo (para reanudar).
+    Yields:
+        tuple: (encabezados, lista de filas) por cada bloque.
+    """
+    with open(filename, 'r', newline='', encoding='utf-8') as csvfile:
+        reader = csv.reader(csvfile)
+        encabezados = next(reader, None)
+        if encabezados is None:
+            return
+        for _ in itertools.islice(reader, saltar):
+            pass
+        while True:
+            bloque = list(itertools.islice(reader, tamano_bloque))
+            if not bloque:
+                return
+            yield encabezados, bloque
+
+
+def importar_csv(conexion, tabla, filename, tamano_bloque=TAMANO_BLOQUE, progreso=None, desde_cero=False):
+    """
+    Importa un CSV a `tabla` por bloques, con un executemany y un commit por bloque.
+
+    Después de cada bloque se guarda, en la misma transacción, cuántas filas del archivo
+    ya se importaron (tabla `importaciones`); si la importación se corta, la siguiente
+    llamada con el mismo archivo continúa desde ahí sin duplicar filas.
+    La columna `id` del CSV se ignora: los ids los asigna la DB. Las fechas en DD/MM/YYYY
+    se convierten a ISO-8601 (ver COLUMNAS_FECHA).
+
+    Args:
+        conexion (sqlite3.Connection): Conexión a la DB de la tabla.
+        tabla (str): Tabla destino (una de DB_DE_TABLA).
+        filename (str): El CSV a importar.
+        progreso (callable): Recibe (filas_importadas, filas_por_segundo) después de cada bloque.
+        desde_cero (bool): Ignora el punto de control y vuelve a importar todo el archivo.
+    Returns:
+        dict: filas importadas, filas omitidas por el punto de control, segundos y filas/seg.
+    """
+    if tabla not in DB_DE_TABLA:
+        raise ValueError(f"La tabla '{tabla}' no se puede importar.")
+
+    archivo = os.path.abspath(filename)
+    columnas_tabla = [fila[1] for fila in conexion.execute(f"PRAGMA table_info({tabla});")]
+    alias = ALIAS_COLUMNAS.get(tabla, {})
+
+    if desde_cero:
+        conexion.execute(SQL_BORRAR_PUNTO_DE_CONTROL, (archivo, tabla))
+        conexion.commit()
+    punto = conexion.execute(SQL_PUNTO_DE_CONTROL, (archivo, tabla)).fetchone()
+    ya_importadas = punto[0] if punto else 0
+
+    importadas = 0
+    inicio = time.perf_counter()
+    sql_insert = None
+    for encabezados, bloque in leer_csv_por_bloques(filename, tamano_bloque, saltar=ya_importadas):
+        if sql_insert is None:
+            # Posición en el CSV de cada columna de la tabla presente en el archivo (sin el id)
+            nombres = [alias.get(nombre, nombre) for nombre in encabezados]
+            indices = [(i, nombre) for i, nombre in enumerate(nombres) if nombre in columnas_tabla and nombre != "id"]
+            if not indices:
+                raise ValueError(f"El archivo no tiene ninguna columna de la tabla '{tabla}'.")
+            lista_columnas = ", ".join(nombre for _, nombre in indices)
+            marcadores = ", ".join("?" for _ in indices)
+            sql_insert = f"INSERT INTO {tabla} ({lista_columnas}) VALUES ({marcadores});"
+            posiciones = [i for i, _ in indices]
+            # Índices (dentro de la fila a insertar) de las columnas de fecha
+            de_fecha = [j for j, (_, nombre) in enumerate(indices) if nombre in COLUMNAS_FECHA.get(tabla, ())]
+
+        filas = [[fila[i] if i < len(fila) else None for i in posiciones] for fila in bloque]
+        for valores in filas:
+            for j in de_fecha:
+                valores[j] = fechas.normalizar(valores[j]) or None
+        with conexion:
+            conexion.executemany(sql_insert, filas)
+            importadas += len(bloque)
+            conexion.execute(SQL_GUARDAR_PUNTO_DE_CONTROL, (archivo, tabla, ya_importadas + importadas))
+
+        if progreso:
+            progreso(ya_importadas + importadas, importadas / max(time.perf_counter() - inicio, 1e-9))
+
+    segundos = time.perf_counter() - inicio
+    return {
+        "filas": importadas,
+        "omitidas": ya_importadas,
+        "segundos": segundos,
+        "filas_por_segundo": importadas / segundos if segundos else 0,
+    }
+
+
+def exportar_csv(conexion, tabla, filename, tamano_bloque=TAMANO_BLOQUE, progreso=None, ids=None):
+    """
+    Exporta `tabla` a un CSV recorriendo el cursor de a bloques (fetchmany): las filas
+    pasan de SQLite al disco sin juntarse nunca en una lista completa.
+
+    Se escribe primero a un archivo temporal y se renombra al final, así un corte a
+    mitad de camino no deja un CSV incompleto con el nombre final.
+    Args:
+        ids (iterable | None): Exportar solo esas filas (p. ej. las seleccionadas en la tabla).
+    Returns:
+        dict: filas exportadas, segundos y filas/seg.
+    """
+    if tabla not in DB_DE_TABLA:
+        raise ValueError(f"La tabla '{tabla}' no se puede exportar.")
+
+    temporal = filename + ".parcial"
+    exportadas = 0
+    inicio = time.perf_counter()
+    # Las filas en la papelera (deleted_at, ver papelera.py) no se exportan, ni esa columna
+    columnas = [fila[1] for fila in conexion.execute(f"PRAGMA table_info({tabla});")]
+    lista_columnas = ", ".join(columna for columna in columnas if columna != "deleted_at")
+    if ids is not None:
+        conexion.execute(SQL_CREAR_SELECCION)
+        with conexion:
+            conexion.execute(SQL_VACIAR_SELECCION)
+            conexion.executemany(SQL_AGREGAR_A_SELECCION, ((int(i),) for i in ids))
+        sql = SQL_EXPORTAR_SELECCION[tabla].format(columnas=lista_columnas)
+    else:
+        donde = " WHERE deleted_at IS NULL" if "deleted_at" in columnas else ""
+        sql = f"SELECT {lista_columnas} FROM {tabla}{donde} ORDER BY id;"
+    cursor = conexion.execute(sql)
+    try:
+        with open(temporal, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow([columna[0] for columna in cursor.description])
+            while True:
+                bloque = cursor.fetchmany(tamano_bloque)
+                if not bloque:
+                    break
+                writer.writerows(bloque)
+                exportadas += len(bloque)
+                if progreso:
+                    progreso(exportadas, exportadas / max(time.perf_counter() - inicio, 1e-9))
+    finally:
+        cursor.close()
+        if ids is not None:
+            with conexion:
+                conexion.execute(SQL_VACIAR_SELECCION)
+    os.replace(temporal, filename)
+
+    segundos = time.perf_counter() - inicio
+    return {
+        "filas": exportadas,
+        "segundos": segundos,
+        "filas_por_segundo": exportadas / segundos if segundos else 0,
+    }
+
+
+# =====================================================================
+# Ingesta masiva de mediciones de calidad (archivos de los bancos de prueba)
+# =====================================================================
+
+# Las mediciones llegan de a miles por lote: bloques más grandes, menos commits
+TAMANO_BLOQUE_MEDICIONES = 50_000
+COLUMNAS_MEDICION = ("lote_id", "parametro", "valor", "aprobado", "timestamp")
+SQL_INSERTAR_MEDICION = ("INSERT INTO ControlesCalidad (lote_id, parametro, valor, aprobado, timestamp) "
+                         "VALUES (?, ?, ?, ?, ?);")
+# Durante un bloque el trigger de inserción no resume medición por medición (migración 5 de
+# produccion.db): el bloque recién insertado (ids mayores al último de antes) se suma a
+# ResumenLotes con un UPSERT por lote. NOT INDEXED: el bloque se lee por rango de rowid y se
+# agrupa en memoria; con el índice (lote_id, ...) el planificador recorría la tabla entera
+SQL_INICIAR_INGESTA = "INSERT INTO IngestaMasiva (inicio) VALUES (datetime('now'));"
+SQL_TERMINAR_INGESTA = "DELETE FROM IngestaMasiva;"
+SQL_ULTIMA_MEDICION = "SELECT COALESCE(MAX(id), 0) FROM ControlesCalidad;"
+SQL_RESUMIR_MEDICIONES = """
+INSERT INTO ResumenLotes (lote_id, mediciones, rechazadas, ultimo_control)
+SELECT lote_id, COUNT(*), SUM(aprobado = 0), MAX(timestamp)
+FROM ControlesCalidad NOT INDEXED
+WHERE id > ?
+GROUP BY lote_id
+ON CONFLICT (lote_id) DO UPDATE SET
+    mediciones = mediciones + excluded.mediciones,
+    rechazadas = rechazadas + excluded.rechazadas,
+    ultimo_control = MAX(COALESCE(ultimo_control, ''), excluded.ultimo_control);
+"""
+# Textos aceptados en la columna `aprobado`
+VALORES_APROBADO = {
+    "1": 1, "0": 0, "true": 1, "false": 0, "si": 1, "sí": 1, "no": 0,
+    "aprobado": 1, "rechazado": 0, "ok": 1, "nok": 0,
+}
+# Ejemplos de rechazos que se guardan para el informe (el total se cuenta siempre)
+MAX_EJEMPLOS_RECHAZO = 20
+
+
+def leer_mediciones_por_bloques(filename, tamano_bloque=TAMANO_BLOQUE_MEDICIONES, saltar=0):
+    """
+    Lee un archivo de mediciones CSV (con encabezados) o JSONL (un objeto por línea) de a bloques.
+
+    Las filas se entregan tal como salen del archivo, sin copiarlas: junto con cada bloque
+    va la posición de cada columna de COLUMNAS_MEDICION dentro de la fila (None si falta).
+    Yields:
+        tuple: (posiciones, lista de filas) por cada bloque.
+    """
+    es_jsonl = os.path.splitext(filename)[1].lower() in (".jsonl", ".ndjson", ".json")
+    with open(filename, 'r', newline='', encoding='utf-8') as archivo:
+        if es_jsonl:
+            # Las líneas a omitir (reanudación) se saltan sin decodificarlas
+            lineas = (linea for linea in archivo if linea.strip())
+            for _ in itertools.islice(lineas, saltar):
+                pass
+            posiciones = tuple(range(len(COLUMNAS_MEDICION)))
+            while True:
+                bloque = list(itertools.islice(lineas, tamano_bloque))
+                if not bloque:
+                    return
+                yield posiciones, _mediciones_de_json(bloque)
+        else:
+            reader = csv.reader(archivo)
+            encabezados = [nombre.strip().lower() for nombre in next(reader, [])]
+            faltan = {"lote_id", "parametro", "valor", "aprobado"} - set(encabezados)
+            if faltan:
+                raise ValueError(f"Al archivo le faltan las columnas: {', '.join(sorted(faltan))}.")
+            posiciones = tuple(encabezados.index(c) if c in encabezados else None for c in COLUMNAS_MEDICION)
+            filas = reader
+            for _ in itertools.islice(filas, saltar):
+                pass
+
+        while True:
+            bloque = list(itertools.islice(filas, tamano_bloque))
+            if not bloque:
+                return
+            yield posiciones, bloque
+
+
+def _mediciones_de_json(lineas):
+    """Decodifica un bloque de líneas JSONL con un solo json.loads (como un arreglo); si alguna
+    línea está mal formada, se decodifican de a una y esa queda vacía (la validación la rechaza)."""
+    try:
+        objetos = json.loads("[" + ",".join(lineas) + "]")
+    except ValueError:
+        objetos = None
+    # Una línea como '{...}, {...}' da dos elementos: se vuelve a decodificar de a una
+    if objetos is None or len(objetos) != len(lineas):
+        return [_medicion_de_json(linea) for linea in lineas]
+    return [_medicion_de_objeto(objeto) for objeto in objetos]
+
+
+def _medicion_de_json(linea):
+    try:
+        objeto = json.loads(linea)
+    except ValueError:
+        return ()
+    return _medicion_de_objeto(objeto)
+
+
+def _medicion_de_objeto(objeto):
+    if not isinstance(objeto, dict):
+        return ()
+    return tuple(objeto.get(columna) for columna in COLUMNAS_MEDICION)
+
+
+def validar_mediciones(posiciones, bloque, lotes_validos, timestamp_por_defecto, rechazos, primera_fila):
+    """
+    Convierte y valida un bloque de mediciones crudas.
+    Args:
+        posiciones (tuple): Índice de cada columna de COLUMNAS_MEDICION en las filas (None si falta).
+        bloque (list): Filas crudas de `leer_mediciones_por_bloques`.
+        lotes_validos (set): Ids de Lotes existentes (precargados una sola vez).
+        timestamp_por_defecto (str): Se usa en las filas sin timestamp.
+        rechazos (dict): Acumula {'cantidad', 'por_motivo', 'ejemplos'}; se modifica.
+        primera_fila (int): Número (1 = primera medición del archivo) de la primera fila del bloque.
+    Returns:
+        list of tuple: Filas listas para SQL_INSERTAR_MEDICION, ordenadas por lote.
+    """
+    i_lote, i_parametro, i_valor, i_aprobado, i_timestamp = posiciones
+    validas = []
+    for numero, fila in enumerate(bloque, primera_fila):
+        try:
+            lote = int(fila[i_lote])
+            valor = float(fila[i_valor])
+            parametro = fila[i_parametro]
+            aprobado = fila[i_aprobado]
+        except (TypeError, ValueError, IndexError):
+            _rechazar(rechazos, numero, "fila incompleta o lote_id/valor no numérico")
+            continue
+        if lote not in lotes_validos:
+            _rechazar(rechazos, numero, "lote inexistente", f"el lote {lote} no existe")
+            continue
+        if not parametro:
+            _rechazar(rechazos, numero, "parámetro vacío")
+            continue
+        # Caso común primero: "1"/"0" (CSV) o true/false (JSON) van directo al dict
+        aprobado = VALORES_APROBADO.get(aprobado) if isinstance(aprobado, str) else aprobado
+        if aprobado is None and isinstance(fila[i_aprobado], str):
+            aprobado = VALORES_APROBADO.get(fila[i_aprobado].strip().lower())
+        if aprobado is None or not isinstance(aprobado, (bool, int)):
+            _rechazar(rechazos, numero, "'aprobado' no reconocido")
+            continue
+        timestamp = fila[i_timestamp] if i_timestamp is not None and i_timestamp < len(fila) else None
+        validas.append((lote, parametro, valor, 1 if aprobado else 0, timestamp or timestamp_por_defecto))
+    # Insertar agrupado por lote concentra las escrituras del índice (lote_id, timestamp, ...)
+    # en pocas páginas; el orden de llegada dentro de cada lote se conserva
+    validas.sort(key=_lote_de_fila)
+    return validas
+
+
+def _lote_de_fila(fila):
+    return fila[0]
+
+
+def _rechazar(rechazos, numero, motivo, detalle=None):
+    rechazos["cantidad"] += 1
+    rechazos["por_motivo"][motivo] = rechazos["por_motivo"].get(motivo, 0) + 1
+    if len(rechazos["ejemplos"]) < MAX_EJEMPLOS_RECHAZO:
+        rechazos["ejemplos"].append((numero, detalle or motivo))
+
+
+def importar_mediciones(conexion, filename, tamano_bloque=TAMANO_BLOQUE_MEDICIONES, progreso=None, desde_cero=False):
+    """
+    Importa un archivo de mediciones (CSV o JSONL) a ControlesCalidad.
+
+    Los ids de Lotes se cargan una sola vez en un set: validar cada medición es una
+    búsqueda en memoria, no un SELECT. Cada bloque válido se inserta con un executemany
+    en una sola transacción, junto con su resumen por lote (un UPSERT en ResumenLotes por
+    lote, no por medición) y el punto de control (tabla `importaciones`), así
+    que una ingesta cortada se reanuda donde quedó. Las filas inválidas no se insertan:
+    se cuentan por motivo y se guardan algunos ejemplos con su número de medición.
+
+    Args:
+        conexion (sqlite3.Connection): Conexión a produccion.db.
+        filename (str): Archivo .csv (encabezados lote_id, parametro, valor, aprobado[, timestamp])
+            o .jsonl (un objeto con esas claves por línea).
+        progreso (callable): Recibe (mediciones_leidas, mediciones_por_segundo) después de cada bloque.
+        desde_cero (bool): Ignora el punto de control y vuelve a leer todo el archivo.
+    Returns:
+        dict: filas insertadas, leídas, omitidas por el punto de control, rechazos, segundos y filas/seg.
+    """
+    archivo = os.path.abspath(filename)
+    tabla = "ControlesCalidad"
+    if desde_cero:
+        conexion.execute(SQL_BORRAR_PUNTO_DE_CONTROL, (archivo, tabla))
+        conexion.commit()
+    punto = conexion.execute(SQL_PUNTO_DE_CONTROL, (archivo, tabla)).fetchone()
+    ya_leidas = punto[0] if punto else 0
+
+    lotes_validos = {fila[0] for fila in conexion.execute("SELECT id FROM Lotes;")}
+    timestamp_por_defecto = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    rechazos = {"cantidad": 0, "por_motivo": {}, "ejemplos": []}
+
+    leidas = 0
+    insertadas = 0
+    inicio = time.perf_counter()
+    for posiciones, bloque in leer_mediciones_por_bloques(filename, tamano_bloque, saltar=ya_leidas):
+        validas = validar_mediciones(posiciones, bloque, lotes_validos, timestamp_por_defecto, rechazos,
+                                     ya_leidas + leidas + 1)
+        leidas += len(bloque)
+        with conexion:
+            # La transacción ya es de escritura: nadie más inserta mediciones hasta el commit
+            conexion.execute(SQL_INICIAR_INGESTA)
+            ultima = conexion.execute(SQL_ULTIMA_MEDICION).fetchone()[0]
+            conexion.executemany(SQL_INSERTAR_MEDICION, validas)
+            conexion.execute(SQL_RESUMIR_MEDICIONES, (ultima,))
+            conexion.execute(SQL_TERMINAR_INGESTA)
+            conexion.execute(SQL_GUARDAR_PUNTO_DE_CONTROL, (archivo, tabla, ya_leidas + leidas))
+        insertadas += len(validas)
+        if progreso:
+            progreso(ya_leidas + leidas, leidas / max(time.perf_counter() - inicio, 1e-9))
+
+    segundos = time.perf_counter() - inicio
+    return {
+        "filas": insertadas,
+        "leidas": leidas,
+        "omitidas": ya_leidas,
+        "rechazos": rechazos,
+        "segundos": segundos,
+        "filas_por_segundo": leidas / segundos if segundos else 0,
+    }
+
+
+def describir_rechazos(rechazos):
+    """Texto con los rechazos por motivo y los primeros ejemplos (para la consola o un messagebox)."""
+    if not rechazos["cantidad"]:
+        return "Sin rechazos."
+    lineas = [f"{rechazos['cantidad']} mediciones rechazadas:"]
+    lineas += [f"   - {motivo}: {cantidad}" for motivo, cantidad in rechazos["por_motivo"].items()]
+    lineas.append("Primeros rechazos (nº de medición en el archivo):")
+    lineas += [f"   #{numero}: {detalle}" for numero, detalle in rechazos["ejemplos"]]
+    return "\n".join(lineas)
+
+
+def _imprimir_progreso(filas, filas_por_segundo):
+    print(f"   {filas} filas ({filas_por_segundo:,.0f} filas/seg)")
+
+
+def main(argumentos=None):
+    """
+    Punto de entrada de línea de comandos.
+
+    Uso:
+        python data_manager.py importar compras compras.csv [--desde-cero]
+        python data_manager.py exportar empleados empleados_export.csv
+        python data_manager.py mediciones banco_3.jsonl [--desde-cero]
+    """
+    parser = argparse.ArgumentParser(description="Importa/exporta tablas de la aplicación desde/hacia CSV.")
+    acciones = parser.add_subparsers(dest="accion", required=True)
+    for accion in ("importar", "exportar"):
+        sub = acciones.add_parser(accion)
+        sub.add_argument("tabla", choices=sorted(DB_DE_TABLA))
+        sub.add_argument("archivo")
+        sub.add_argument("--bloque", type=int, default=TAMANO_BLOQUE, help="Filas por transacción.")
+        sub.add_argument("--desde-cero", action="store_true", help="Ignora el punto de control de una importación previa.")
+    sub = acciones.add_parser("mediciones", help="Ingesta masiva de mediciones de calidad (CSV o JSONL).")
+    sub.add_argument("archivo")
+    sub.add_argument("--bloque", type=int, default=TAMANO_BLOQUE_MEDICIONES, help="Mediciones por transacción.")
+    sub.add_argument("--desde-cero", action="store_true", help="Ignora el punto de control de una ingesta previa.")
+    args = parser.parse_args(argumentos)
+
+    # Los módulos registran su esquema base al importarse
+    import servicios.compras, servicios.empleados, servicios.produccion  # noqa: F401
+
+    if args.accion == "mediciones":
+        conexion = repositorio.obtener_conexion(repositorio.DB_PRODUCCION)
+        resultado = importar_mediciones(conexion, args.archivo, args.bloque, _imprimir_progreso, args.desde_cero)
+        if resultado["omitidas"]:
+            print(f"Reanudado: se omitieron {resultado['omitidas']} mediciones ya leídas.")
+        print(f"Mediciones: {resultado['filas']} insertadas de {resultado['leidas']} leídas en "
+              f"{resultado['segundos']:.1f} s ({resultado['filas_por_segundo']:,.0f} mediciones/seg).")
+        print(describir_rechazos(resultado["rechazos"]))
+        repositorio.cerrar_todas()
+        return
+
+    conexion = repositorio.obtener_conexion(DB_DE_TABLA[args.tabla])
+    if args.accion == "importar":
+        resultado = importar_csv(conexion, args.tabla, args.archivo, args.bloque, _imprimir_progreso, args.desde_cero)
+        if resultado["omitidas"]:
+            print(f"Reanudado: se omitieron {resultado['omitidas']} filas ya importadas.")
+    else:
+        resultado = exportar_csv(conexion, args.tabla, args.archivo, args.bloque, _imprimir_progreso)
+
+    print(f"{args.accion.capitalize()}: {resultado['filas']} filas en {resultado['segundos']:.1f} s "
+          f"({resultado['filas_por_segundo']:,.0f} filas/seg).")
+    repositorio.cerrar_todas()
+
+
+if __name__ == "__main__":
+    main()
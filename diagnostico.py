@@ -0,0 +1,170 @@
+"""
+Diagnóstico de los planes de ejecución de las consultas de la aplicación.
+
+Imprime EXPLAIN QUERY PLAN de cada consulta `SQL_*` declarada en los módulos (y de cada
+orden posible de sus `repositorio.ConsultaOrdenada`, sin filtro y con cada uno de sus
+filtros) y marca con ⚠️ las que recorren una tabla completa o la ordenan en memoria, para
+que una regresión (un índice que falta o que el planificador deja de usar) se vea enseguida.
+
+Un `SQL_*` de texto se revisa en la base `DB_NAME` del módulo; uno que es un dict
+{tabla: sql} (la misma sentencia armada para varias tablas), en la base `DB_DE_TABLA[tabla]`.
+`{columnas}` (la lista que se completa al ejecutar) se revisa como `*`. Las tablas TEMP
+(`CREATE TEMP TABLE`) se crean en las conexiones del diagnóstico antes de revisar nada.
+
+Cuenta como recorrido todo SCAN de una tabla base (aunque sea sobre un índice), todo
+índice AUTOMATIC y toda vista o subconsulta MATERIALIZE. La única excepción es el SCAN
+del bucle externo de un ORDER BY resuelto por índice con un LIMIT al final de la
+sentencia (una página de una `ConsultaOrdenada`): lee solo las filas de la página.
+
+Un módulo puede declarar en `ORDEN_EN_MEMORIA_ACEPTADO` ({nombre: motivo}) las consultas
+que ordenan en memoria a propósito (p. ej. sobre una tabla de resumen chica, o
+"CONSULTA [filtro]" para las páginas de una ConsultaOrdenada con ese filtro); se marcan
+con ℹ️ y no cuentan como sospechosas. Eso no cubre los recorridos: se marcan igual.
+
+Uso (desde la raíz del proyecto):
+    python diagnostico.py
+
+Sale con código 1 si alguna consulta quedó marcada.
+"""
+import importlib
+import re
+import sys
+
+import repositorio
+
+# Módulos cuyas consultas SQL_* se revisan (cada uno declara su DB_NAME, o DB_DE_TABLA si
+# tiene sentencias por tabla)
+MODULOS = ["servicios.compras", "servicios.empleados", "servicios.produccion", "data_manager", "analitica", "spc",
+           "reportes", "papelera"]
+
+_CREAR_TEMPORAL = re.compile(r"\s*CREATE\s+TEMP(ORARY)?\s+TABLE\b", re.IGNORECASE)
+
+
+def recolectar_consultas():
+    """
+    Devuelve (módulo, nombre, db, sql, motivo) para cada constante SQL_* y ConsultaOrdenada
+    de los módulos; `motivo` no es None si el módulo acepta que esa consulta ordene en memoria.
+    """
+    consultas = []
+    for nombre_modulo in MODULOS:
+        modulo = importlib.import_module(nombre_modulo)
+        aceptadas = getattr(modulo, "ORDEN_EN_MEMORIA_ACEPTADO", {})
+        for nombre, valor in vars(modulo).items():
+            if nombre.startswith("SQL_") and isinstance(valor, str):
+                consultas.append((nombre_modulo, nombre, modulo.DB_NAME, valor, aceptadas.get(nombre)))
+            elif nombre.startswith("SQL_") and isinstance(valor, dict):
+                for tabla, sql in valor.items():
+                    consultas.append((nombre_modulo, f"{nombre}[{tabla}]", modulo.DB_DE_TABLA[tabla],
+                                      sql.replace("{columnas}", "*"), aceptadas.get(nombre)))
+            elif isinstance(valor, repositorio.ConsultaOrdenada):
+                for descripcion, filtro, sql in valor.sentencias():
+                    motivo = aceptadas.get(f"{nombre} [{filtro}]") if filtro else None
+                    consultas.append((nombre_modulo, f"{nombre} [{descripcion}]", modulo.DB_NAME, sql, motivo))
+    return consultas
+
+
+def crear_temporales(consultas):
+    """
+    Ejecuta cada CREATE TEMP TABLE de `consultas` en todas las bases revisadas: una tabla TEMP
+    existe solo en la conexión que la crea (y no toca el archivo), y sin ella no se pueden
+    explicar las consultas que la usan.
+    """
+    bases = {db_path for _, _, db_path, _, _ in consultas}
+    for _, _, _, sql, _ in consultas:
+        if _CREAR_TEMPORAL.match(sql):
+            for db_path in bases:
+                repositorio.consultar(db_path, sql)
+
+
+def plan_de_ejecucion(db_path, sql):
+    """
+    Ejecuta EXPLAIN QUERY PLAN sobre `sql` (con NULL en cada parámetro).
+    Returns:
+        list of tuple: (profundidad, detalle) por cada paso del plan.
+    """
+    params = (None,) * sql.count("?")
+    filas = repositorio.consultar(db_path, "EXPLAIN QUERY PLAN " + sql, params)
+
+    profundidades = {0: -1}
+    plan = []
+    for fila in filas:
+        profundidad = profundidades.get(fila["parent"], -1) + 1
+        profundidades[fila["id"]] = profundidad
+        plan.append((profundidad, fila["detail"]))
+    return plan
+
+
+# ORDER BY ... LIMIT al final de la sentencia (no dentro de una subconsulta)
+_ORDEN_CON_LIMITE = re.compile(r"\bORDER\s+BY\b[^()]*\bLIMIT\s+(\?|\d+)\s*;?\s*$", re.IGNORECASE)
+
+
+def _fuentes_intermedias(plan):
+    """Nombres de subconsultas/vistas que el plan arma aparte (CO-ROUTINE o MATERIALIZE):
+    un SCAN de ellas no es un recorrido de una tabla base."""
+    nombres = set()
+    for _, detalle in plan:
+        for prefijo in ("CO-ROUTINE ", "MATERIALIZE "):
+            if detalle.startswith(prefijo):
+                nombres.add(detalle[len(prefijo):].split()[0])
+    return nombres
+
+
+def problemas(sql, plan):
+    """
+    Pasos sospechosos de un plan.
+    Returns:
+        list of tuple: (tipo, detalle), con tipo "orden" (ordena en memoria con un B-tree
+        temporal) o "recorrido" (SCAN de una tabla base, índice AUTOMATIC o MATERIALIZE).
+
+    El único SCAN que no se marca es el del bucle externo de un ORDER BY resuelto por índice
+    con un LIMIT real al final de la sentencia: lee solo las filas de la página.
+    """
+    intermedias = _fuentes_intermedias(plan)
+    ordena_en_memoria = any("USE TEMP B-TREE FOR" in detalle and "ORDER BY" in detalle for _, detalle in plan)
+    paginada = bool(_ORDEN_CON_LIMITE.search(sql.strip())) and not ordena_en_memoria
+    encontrados = []
+    for posicion, (profundidad, detalle) in enumerate(plan):
+        if "USE TEMP B-TREE" in detalle:
+            encontrados.append(("orden", detalle))
+        elif "AUTOMATIC" in detalle or detalle.startswith("MATERIALIZE"):
+            encontrados.append(("recorrido", detalle))
+        elif detalle.startswith("SCAN "):
+            objetivo = detalle.split()[1]
+            if objetivo == "CONSTANT" or objetivo in intermedias or "VIRTUAL TABLE" in detalle:
+                continue
+            if paginada and posicion == 0 and profundidad == 0:
+                continue
+            encontrados.append(("recorrido", detalle))
+    return encontrados
+
+
+def main():
+    sospechosas = 0
+    consultas = recolectar_consultas()
+    crear_temporales(consultas)
+    for nombre_modulo, nombre, db_path, sql, motivo in consultas:
+        plan = plan_de_ejecucion(db_path, sql)
+        tipos = {tipo for tipo, _ in problemas(sql, plan)}
+        marca = "✅"
+        # ORDEN_EN_MEMORIA_ACEPTADO solo cubre el ordenamiento: un recorrido completo siempre se marca
+        if "recorrido" in tipos or ("orden" in tipos and not motivo):
+            marca = "⚠️ "
+        elif tipos:
+            marca = "ℹ️ "
+        sospechosas += marca == "⚠️ "
+
+        aceptada = marca == "ℹ️ "
+        print(f"{marca} {nombre_modulo}.{nombre} ({db_path})" + (f" — aceptada: {motivo}" if aceptada else ""))
+        print("    " + " ".join(sql.split()))
+        if not plan:
+            print("      (sin plan: escritura directa)")
+        for profundidad, detalle in plan:
+            print("      " + "  " * profundidad + detalle)
+        print()
+
+    print(f"{sospechosas} consulta(s) con recorrido completo u ordenamiento en memoria.")
+    return 1 if sospechosas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
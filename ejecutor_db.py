@@ -0,0 +1,116 @@
+import queue
+import threading
+import tkinter as tk
+import traceback
+
+import repositorio
+
+# Cada cuánto (ms) el hilo de Tk revisa si llegaron resultados del hilo de la DB
+INTERVALO_SONDEO_MS = 20
+
+# Un ejecutor por archivo de base de datos, compartido por todas las pantallas
+_ejecutores = {}
+
+
+class EjecutorDB:
+    """
+    Ejecuta consultas en un hilo de trabajo con su propia conexión SQLite y entrega
+    los resultados al hilo de Tk mediante `root.after`, para no congelar la ventana.
+
+    Tkinter no es seguro entre hilos: el hilo de trabajo nunca toca widgets,
+    solo deja los resultados en una cola que el hilo de Tk vacía.
+    """
+    def __init__(self, root, db_path):
+        self.root = root
+        self.db_path = db_path
+
+        self._pedidos = queue.Queue()
+        self._resultados = queue.Queue()
+        self._pendientes = 0
+        self._sondeando = False
+
+        self._hilo = threading.Thread(target=self._trabajar, name=f"ejecutor-{db_path}", daemon=True)
+        self._hilo.start()
+
+    def enviar(self, funcion, *args, al_terminar=None, al_fallar=None):
+        """
+        Encola `funcion(conexion, *args)` para ejecutarse en el hilo de la DB.
+        Args:
+            funcion (callable): Recibe la conexión del hilo de trabajo como primer argumento.
+            al_terminar (callable): Se llama en el hilo de Tk con el valor devuelto.
+            al_fallar (callable): Se llama en el hilo de Tk con la excepción (sqlite3.Error, OSError...).
+        """
+        self._pendientes += 1
+        self._pedidos.put((funcion, args, al_terminar, al_fallar))
+        self._programar_sondeo()
+
+    def consultar(self, sql, params=(), al_terminar=None, al_fallar=None):
+        """Atajo para ejecutar un SELECT y recibir todas sus filas en `al_terminar`."""
+        self.enviar(_ejecutar_select, sql, params, al_terminar=al_terminar, al_fallar=al_fallar)
+
+    # --- Hilo de trabajo ---
+
+    def _trabajar(self):
+        """Bucle del hilo de la DB: toma su propia conexión del pool y atiende los pedidos en orden."""
+        conexion = repositorio.obtener_conexion(self.db_path)
+
+        while True:
+            funcion, args, al_terminar, al_fallar = self._pedidos.get()
+            try:
+                resultado = funcion(conexion, *args)
+                self._resultados.put((al_terminar, resultado))
+            except Exception as e:
+                # El hilo nunca debe morir: cualquier error se entrega a quien hizo el pedido
+                self._resultados.put((al_fallar, e))
+
+    # --- Hilo de Tk ---
+
+    def _programar_sondeo(self):
+        if not self._sondeando:
+            self._sondeando = True
+            self.root.after(INTERVALO_SONDEO_MS, self._sondear)
+
+    def _sondear(self):
+        """Entrega en el hilo de Tk los resultados que ya estén listos."""
+        try:
+            while True:
+                try:
+                    callback, valor = self._resultados.get_nowait()
+                except queue.Empty:
+                    break
+                self._pendientes -= 1
+                if callback:
+                    try:
+                        callback(valor)
+                    except tk.TclError:
+                        # La pantalla que pidió los datos ya fue destruida (el usuario navegó a otra)
+                        pass
+                    except Exception:
+                        # Un error en un callback no puede cortar la entrega de los demás resultados
+                        print("Error en un callback del ejecutor de la DB:")
+                        traceback.print_exc()
+        finally:
+            # Solo seguimos sondeando mientras queden pedidos en curso (pase lo que pase arriba:
+            # si no, _sondeando quedaría en True y nunca más se entregaría un resultado)
+            if self._pendientes > 0:
+                self.root.after(INTERVALO_SONDEO_MS, self._sondear)
+            else:
+                self._sondeando = False
+
+
+def _ejecutar_select(conexion, sql, params):
+    cursor = conexion.cursor()
+    try:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def obtener_ejecutor(root, db_path):
+    """Devuelve el ejecutor compartido para `db_path`, creándolo la primera vez."""
+    ejecutor = _ejecutores.get(db_path)
+    if ejecutor is None or ejecutor.root is not root:
+        ejecutor = EjecutorDB(root, db_path)
+        _ejecutores[db_path] = ejecutor
+    return ejecutor
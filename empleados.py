@@ -1,50 +1,20 @@
 import tkinter as tk
 import sqlite3
-from tkinter import ttk, messagebox
+from functools import partial
+from tkinter import ttk, messagebox, filedialog
 # from data_manager import save_data, load_data # Ya no se usan
 # Esta línea debe tener TODOS los elementos que usas en el archivo:
 from estilos import BG_MODULO, FG_PRIMARY, COLOR_ACCENT, FONT_BASE, FONT_BUTTON, add_logo_header
+from tablas import TablaPaginada, OrdenTabla, FiltroFechas
+from ejecutor_db import obtener_ejecutor
+from escritor_db import obtener_escritor
+import data_manager
+# Esquema, consultas y validación viven en la capa de datos (sin Tkinter): esta pantalla
+# solo lee los campos, llama al servicio y muestra el resultado
+from servicios import Empleado, DatosInvalidos
+from servicios import empleados as servicio
 
 # DATA_FILE = "empleados.csv" # Ya no se usa
-FIELDNAMES = ["id", "nombre", "puesto", "fecha_ingreso", "sueldo", "sucursal", "contacto_mail", "celular", "fecha_de_baja"]
-
-# === Manejo Global de la Conexión y Base de Datos ===
-
-# Objeto de conexión global (se reasignará en el bloque principal)
-conexion = None 
-
-try:
-    # Intenta establecer la conexión con la DB
-    conexion = sqlite3.connect('adidas.db')
-    print("Conexión a SQLite establecida con éxito.")
-except sqlite3.Error as e:
-    print(f"Error al conectar a SQLite: {e}")
-    # Si la conexión falla, la aplicación no debería continuar
-    
-
-def iniciar_db(conn):
-    """Asegura que la tabla 'empleados' exista en la base de datos."""
-    cursor = conn.cursor()
-    # Usamos REAL para el sueldo y TEXT para todo lo demás, ID es Primary Key autoincremental
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS empleados (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        nombre TEXT NOT NULL,
-        puesto TEXT,
-        fecha_ingreso TEXT,
-        sueldo REAL,
-        sucursal TEXT,
-        contacto_email TEXT,
-        celular INTEGER,
-        fecha_de_baja TEXT
-    );
-    """)
-    conn.commit()
-    print("Tabla 'empleados' verificada/creada.")
-
-# Aseguramos la inicialización de la tabla al iniciar la conexión
-if conexion:
-    iniciar_db(conexion)
 
 # ======================================================
 
@@ -56,6 +26,10 @@ class EmpleadosUI:
         self.frame.pack(fill="both", expand=True) 
 
         self.volver_callback = volver_callback
+        # Las lecturas corren en un hilo aparte: la pantalla se dibuja sin esperar a la DB
+        self.ejecutor = obtener_ejecutor(root, servicio.DB_NAME)
+        # Las altas se confirman agrupadas en ese mismo hilo (group commit)
+        self.escritor = obtener_escritor(root, servicio.DB_NAME)
         # self.empleados_data = load_data(DATA_FILE) # Ya no se carga de CSV
         # self.next_id = self._get_next_id() # Ya no es necesario
 
@@ -119,7 +93,16 @@ class EmpleadosUI:
 
         # Botones usan estilo Modulo.TButton (Blanco con texto negro)
         ttk.Button(button_container, text="Agregar Empleado", command=self.agregar_empleado, style="Modulo.TButton").pack(side=tk.LEFT, padx=10, ipadx=10)
-        ttk.Button(button_container, text="Borrar Seleccionado", command=self.borrar_empleado, style="Modulo.TButton").pack(side=tk.LEFT, padx=10, ipadx=10)
+        ttk.Button(button_container, text="Borrar Seleccionados", command=self.borrar_empleado, style="Modulo.TButton").pack(side=tk.LEFT, padx=10, ipadx=10)
+        ttk.Button(button_container, text="Dar de Baja Seleccionados", command=self.dar_de_baja_seleccion, style="Modulo.TButton").pack(side=tk.LEFT, padx=10, ipadx=10)
+        ttk.Button(button_container, text="Deshacer Borrado", command=self.deshacer_borrado, style="Modulo.TButton").pack(side=tk.LEFT, padx=10, ipadx=10)
+        ttk.Button(button_container, text="Importar CSV", command=self.importar_csv, style="Modulo.TButton").pack(side=tk.LEFT, padx=10, ipadx=10)
+        ttk.Button(button_container, text="Exportar CSV", command=self.exportar_csv, style="Modulo.TButton").pack(side=tk.LEFT, padx=10, ipadx=10)
+        ttk.Button(button_container, text="Exportar Seleccionados", command=self.exportar_seleccion, style="Modulo.TButton").pack(side=tk.LEFT, padx=10, ipadx=10)
+
+        # Filtro por rango de fecha de ingreso
+        self.filtro_fechas = FiltroFechas(self.frame, self.cargar_datos_en_tabla, etiqueta="Ingreso")
+        self.filtro_fechas.frame.pack(pady=(5, 0))
         
         # Tabla (Treeview)
         columns = ("ID", "Nombre", "Puesto", "Fecha Ingreso", "Sueldo", "Sucursal", "Email", "Celular", "Fecha de Baja")
@@ -127,11 +110,11 @@ class EmpleadosUI:
         table_frame = ttk.Frame(self.frame, style="Modulo.TFrame") 
         table_frame.pack(pady=10, fill="both", expand=True, padx=20)
         
-        self.tabla = ttk.Treeview(table_frame, columns=columns, show="headings")
+        # Selección de varias filas (Ctrl/Shift + clic) para borrar, dar de baja o exportar en bloque
+        self.tabla = ttk.Treeview(table_frame, columns=columns, show="headings", selectmode="extended")
         
         vsb = ttk.Scrollbar(table_frame, orient="vertical", command=self.tabla.yview)
         vsb.pack(side='right', fill='y')
-        self.tabla.configure(yscrollcommand=vsb.set)
         
         for col in columns:
             self.tabla.heading(col, text=col)
@@ -139,6 +122,13 @@ class EmpleadosUI:
             
         self.tabla.pack(side='left', fill="both", expand=True)
 
+        # Los encabezados ordenan en SQL; el orden elegido se conserva mientras viva la pantalla
+        self.orden = OrdenTabla(self.tabla, servicio.COLUMNAS_ORDEN, self.cargar_datos_en_tabla, "ID")
+
+        # La tabla se rellena por páginas a medida que se usa la scrollbar
+        self.paginador = TablaPaginada(self.tabla, vsb, self._obtener_pagina(), self.ejecutor,
+                                       al_fallar=self._error_de_carga)
+
         # Botón para volver (IMPORTANTE: Usa self.volver_callback para volver al menú principal)
         ttk.Button(self.frame, text="< Volver al Menú Principal", command=self.volver_callback, style="Modulo.TButton").pack(pady=20, ipadx=10)
     
@@ -149,98 +139,170 @@ class EmpleadosUI:
     
     def agregar_empleado(self):
         """Recoge los datos, valida y agrega un nuevo empleado a la DB."""
-        nombre = self.nombre_entry.get()
-        puesto = self.puesto_entry.get()
-        fecha_ingreso = self.fecha_ingreso_entry.get()
-        sueldo_str = self.sueldo_entry.get()
-        sucursal = self.sucursal_entry.get()
-        contacto_mail = self.contacto_mail_entry.get()
-        celular = self.celular_entry.get()
-        fecha_de_baja = self.fecha_de_baja_entry.get() or "" 
-
-        if not all([nombre, puesto, fecha_ingreso, sueldo_str, sucursal, contacto_mail, celular]):
-            messagebox.showerror("Error", "Por favor, completa todos los campos obligatorios.")
-            return
-
+        # Las fechas se guardan en ISO (YYYY-MM-DD); sin fecha de baja se guarda NULL
         try:
-            sueldo = float(sueldo_str)
-        except ValueError:
-            messagebox.showerror("Error", "El sueldo debe ser un número válido.")
+            empleado = Empleado.desde_formulario(
+                self.nombre_entry.get(), self.puesto_entry.get(), self.fecha_ingreso_entry.get(),
+                self.sueldo_entry.get(), self.sucursal_entry.get(), self.contacto_mail_entry.get(),
+                self.celular_entry.get(), self.fecha_de_baja_entry.get())
+        except DatosInvalidos as e:
+            messagebox.showerror("Error", str(e))
             return
-            
-        cursor = conexion.cursor()
-        
-        # Consulta de inserción con marcadores de posición (?)
-        sql_insert = """
-        INSERT INTO empleados (nombre, puesto, fecha_ingreso, sueldo, sucursal, contacto_mail, celular, fecha_de_baja)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?);
-        """
-        datos = (nombre, puesto, fecha_ingreso, sueldo, sucursal, contacto_mail, celular, fecha_de_baja)
-
-        try:
-            cursor.execute(sql_insert, datos)
-            conexion.commit() # Guardar los cambios en la DB
-            
-            self.cargar_datos_en_tabla()
-            self.limpiar_campos()
-            messagebox.showinfo("Éxito", f"Empleado {nombre} agregado correctamente.")
-
-        except sqlite3.Error as e:
-             messagebox.showerror("Error de DB", f"Ocurrió un error al insertar: {e}")
-        finally:
-            cursor.close()
+        datos = empleado.parametros()
+
+        # La fila se ve enseguida (en gris) y el escritor la confirma junto con las demás altas
+        # (con un filtro de fechas activo no se agrega: la tabla muestra solo el rango)
+        valores = datos[:-1] + (empleado.fecha_de_baja or "",)
+        provisoria = None
+        if not self.filtro_fechas.activo:
+            provisoria = self.paginador.insertar_pendiente(("…",) + valores, self.orden.encabezado,
+                                                           self.orden.descendente)
+        self.escritor.escribir(
+            servicio.SQL_INSERTAR, datos,
+            al_confirmar=lambda nuevo_id: self.paginador.confirmar_pendiente(provisoria, nuevo_id, (nuevo_id,) + valores),
+            al_fallar=lambda e: self._alta_rechazada(provisoria, e),
+        )
+        self.limpiar_campos()
+
+    def _alta_rechazada(self, provisoria, e):
+        self.paginador.quitar_pendiente(provisoria)
+        messagebox.showerror("Error de DB", f"Ocurrió un error al insertar: {e}")
+
+    def _seleccion_confirmada(self, accion):
+        """Los iids seleccionados ya guardados, o None (con aviso) si no hay ninguno."""
+        seleccionadas, pendientes = self.paginador.seleccion()
+        if not seleccionadas:
+            if pendientes:
+                messagebox.showwarning("Advertencia", "Los empleados seleccionados todavía se están guardando; intenta de nuevo en un momento.")
+            else:
+                messagebox.showwarning("Advertencia", f"Selecciona uno o más empleados para {accion}.")
+            return None
+        return seleccionadas
 
     def borrar_empleado(self):
-        """Elimina el empleado seleccionado de la DB."""
-        selected_item = self.tabla.selection()
-        if not selected_item:
-            messagebox.showwarning("Advertencia", "Selecciona un empleado para borrar.")
+        """Manda los empleados seleccionados a la papelera, todos juntos (se puede deshacer)."""
+        seleccionadas = self._seleccion_confirmada("borrar")
+        if not seleccionadas:
             return
 
-        item_data = self.tabla.item(selected_item, 'values')
-        empleado_id = item_data[0] # El ID es el primer valor
-
-        if messagebox.askyesno("Confirmar Borrado", f"¿Estás seguro de que deseas borrar el empleado ID {empleado_id}?"):
-            cursor = conexion.cursor()
-            
+        # Una sola confirmación para toda la selección
+        if len(seleccionadas) == 1:
+            pregunta = f"¿Estás seguro de que deseas borrar el empleado ID {seleccionadas[0]}?"
+        else:
+            pregunta = f"¿Estás seguro de que deseas borrar {len(seleccionadas)} empleados?"
+        if messagebox.askyesno("Confirmar Borrado", pregunta):
             try:
-                # Consulta DELETE
-                sql_delete = "DELETE FROM empleados WHERE id = ?;"
-                cursor.execute(sql_delete, (empleado_id,))
-                conexion.commit() # Guardar los cambios
-                
-                # Recargar la tabla
-                self.cargar_datos_en_tabla()
-                messagebox.showinfo("Éxito", f"Empleado ID {empleado_id} borrado correctamente.")
+                # Borrado lógico en una transacción (un executemany), y se quitan solo esas filas
+                borrados = servicio.borrar_empleados(seleccionadas)
+                self.paginador.quitar(seleccionadas)
+                messagebox.showinfo("Éxito", f"{borrados} empleado(s) borrado(s). Puedes recuperarlos con 'Deshacer Borrado'.")
 
             except sqlite3.Error as e:
                  messagebox.showerror("Error de DB", f"Ocurrió un error al borrar: {e}")
-            finally:
-                cursor.close()
 
-    def cargar_datos_en_tabla(self):
-        """Limpia la tabla y la rellena con los datos actuales de la DB."""
-        # Limpiar la tabla
-        for item in self.tabla.get_children():
-            self.tabla.delete(item)
-            
-        cursor = conexion.cursor()
-        
+    def dar_de_baja_seleccion(self):
+        """Pone la fecha de baja a todos los empleados seleccionados (la del campo, o la de hoy)."""
+        seleccionadas = self._seleccion_confirmada("dar de baja")
+        if not seleccionadas:
+            return
+
         try:
-            # Consulta SELECT
-            cursor.execute("SELECT * FROM empleados ORDER BY id ASC")
-            empleados = cursor.fetchall()
-            
-            # Insertar nuevos datos
-            for empleado in empleados:
-                # Los valores en 'empleado' son tuplas (id, nombre, puesto, ...)
-                self.tabla.insert('', 'end', values=empleado)
+            fecha_de_baja = servicio.fecha_de_baja_o_hoy(self.fecha_de_baja_entry.get())
+        except DatosInvalidos as e:
+            messagebox.showerror("Error", str(e))
+            return
 
+        if messagebox.askyesno("Confirmar Baja", f"¿Dar de baja a {len(seleccionadas)} empleado(s) con fecha {fecha_de_baja}?"):
+            try:
+                modificados = servicio.dar_de_baja(seleccionadas, fecha_de_baja)
+                # La fecha de baja no es columna de orden: las filas se actualizan en su lugar
+                for iid in seleccionadas:
+                    self.tabla.set(iid, "Fecha de Baja", fecha_de_baja)
+                messagebox.showinfo("Éxito", f"{modificados} empleado(s) dado(s) de baja.")
+            except sqlite3.Error as e:
+                messagebox.showerror("Error de DB", f"Ocurrió un error al dar de baja: {e}")
+
+    def deshacer_borrado(self):
+        """Restaura el último borrado de empleados y vuelve a mostrar sus filas."""
+        try:
+            restaurados = servicio.deshacer_borrado()
+            if not restaurados:
+                messagebox.showinfo("Deshacer", "No hay borrados recientes de empleados para deshacer.")
+                return
+            # Con un filtro de fechas activo no se sabe si las filas entran: se recarga la vista
+            if self.filtro_fechas.activo:
+                self.cargar_datos_en_tabla()
+                return
+            filas = [(empleado.id, (empleado.id,) + empleado.parametros()[:-1] + (empleado.fecha_de_baja or "",))
+                     for empleado in restaurados]
+            self.paginador.insertar_varios(filas, self.orden.encabezado, self.orden.descendente)
         except sqlite3.Error as e:
-             messagebox.showerror("Error de DB", f"No se pudo cargar la tabla: {e}")
-        finally:
-            cursor.close()
+            messagebox.showerror("Error de DB", f"Ocurrió un error al deshacer el borrado: {e}")
+
+    def cargar_datos_en_tabla(self):
+        """Limpia la tabla y pide la primera página de empleados (en el orden actual) al hilo de la DB."""
+        self.paginador.cambiar_consulta(self._obtener_pagina())
+
+    def _obtener_pagina(self):
+        """Función de página para el orden actual."""
+        return partial(servicio.obtener_pagina_empleados, columna=self.orden.columna, descendente=self.orden.descendente,
+                       desde=self.filtro_fechas.desde, hasta=self.filtro_fechas.hasta)
+
+    def refrescar(self):
+        """Recarga los datos al volver a la pantalla (si la tabla cambió mientras estaba oculta)."""
+        self.cargar_datos_en_tabla()
+
+    def _error_de_carga(self, e):
+        messagebox.showerror("Error de DB", f"No se pudo cargar la tabla: {e}")
             
+    def importar_csv(self):
+        """Importa un CSV de empleados en el hilo de la DB (por bloques) y recarga la tabla al terminar."""
+        archivo = filedialog.askopenfilename(title="Importar empleados desde CSV", filetypes=[("CSV", "*.csv")])
+        if not archivo:
+            return
+        self.paginador.indicador.mostrar()
+        self.ejecutor.enviar(data_manager.importar_csv, "empleados", archivo,
+                             al_terminar=self._importacion_terminada, al_fallar=self._error_de_archivo)
+
+    def _importacion_terminada(self, resultado):
+        self.cargar_datos_en_tabla()
+        messagebox.showinfo("Éxito", f"Se importaron {resultado['filas']} filas "
+                                     f"({resultado['filas_por_segundo']:,.0f} filas/seg).")
+
+    def exportar_csv(self):
+        """Exporta la tabla de empleados a un CSV en el hilo de la DB, sin cargarla en memoria."""
+        archivo = filedialog.asksaveasfilename(title="Exportar empleados a CSV", defaultextension=".csv",
+                                               filetypes=[("CSV", "*.csv")])
+        if not archivo:
+            return
+        self.paginador.indicador.mostrar()
+        # Las altas pendientes se confirman antes, así el archivo las incluye
+        self.escritor.vaciar()
+        self.ejecutor.enviar(data_manager.exportar_csv, "empleados", archivo,
+                             al_terminar=self._exportacion_terminada, al_fallar=self._error_de_archivo)
+
+    def exportar_seleccion(self):
+        """Exporta a un CSV solo los empleados seleccionados, en el hilo de la DB."""
+        seleccionadas = self._seleccion_confirmada("exportar")
+        if not seleccionadas:
+            return
+        archivo = filedialog.asksaveasfilename(title="Exportar empleados seleccionados a CSV", defaultextension=".csv",
+                                               filetypes=[("CSV", "*.csv")])
+        if not archivo:
+            return
+        self.paginador.indicador.mostrar()
+        self.ejecutor.enviar(partial(data_manager.exportar_csv, ids=seleccionadas), "empleados", archivo,
+                             al_terminar=self._exportacion_terminada, al_fallar=self._error_de_archivo)
+
+    def _exportacion_terminada(self, resultado):
+        self.paginador.indicador.ocultar()
+        messagebox.showinfo("Éxito", f"Se exportaron {resultado['filas']} filas "
+                                     f"({resultado['filas_por_segundo']:,.0f} filas/seg).")
+
+    def _error_de_archivo(self, e):
+        self.paginador.indicador.ocultar()
+        messagebox.showerror("Error", f"No se pudo procesar el archivo: {e}")
+
     # -------------------------------------------------------------
     # ⬆️ FIN DE FUNCIONES ADAPTADAS ⬆️
     # -------------------------------------------------------------
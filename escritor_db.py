@@ -0,0 +1,186 @@
+"""
+Escritura agrupada (group commit) para las pantallas de carga de datos.
+
+Cada alta que se hacía con `repositorio.ejecutar` era una transacción propia en el hilo
+de Tk: un commit (y su escritura a disco) por cada compra, empleado o medición, con la
+ventana congelada mientras tanto. El escritor junta las altas y las confirma juntas en
+una sola transacción en el hilo de la DB (el del EjecutorDB de ese archivo), cada
+`INTERVALO_MS` o cuando se juntan `MAX_FILAS`, lo que ocurra primero.
+
+Modos de durabilidad (`MODO_DURABILIDAD`, o `--durabilidad=<modo>` al iniciar main.py):
+  - "inmediata": cada alta es su propia transacción, sin esperar a otras.
+  - "agrupada": altas agrupadas con synchronous = NORMAL. En WAL un corte de la
+    aplicación no pierde nada confirmado; un corte de luz puede perder las últimas
+    transacciones hasta el próximo checkpoint.
+  - "completa": altas agrupadas con synchronous = FULL: cada grupo llega al disco al confirmarse.
+
+Las altas críticas (`critica=True`) y `barrera()` confirman lo pendiente enseguida y
+con synchronous = FULL sea cual sea el modo: al terminar, todo lo escrito antes está en disco.
+"""
+import sqlite3
+
+from ejecutor_db import obtener_ejecutor
+
+MODOS_DURABILIDAD = ("inmediata", "agrupada", "completa")
+MODO_DURABILIDAD = "agrupada"
+
+# Cada cuánto (ms) se confirma lo pendiente y cuántas filas disparan una confirmación antes
+INTERVALO_MS = 250
+MAX_FILAS = 200
+
+# Un escritor por archivo de base de datos, como los ejecutores
+_escritores = {}
+
+
+def configurar(modo):
+    """Elige el modo de durabilidad de los escritores (uno de MODOS_DURABILIDAD)."""
+    global MODO_DURABILIDAD
+    if modo not in MODOS_DURABILIDAD:
+        raise ValueError(f"Modo de durabilidad desconocido: '{modo}' (válidos: {', '.join(MODOS_DURABILIDAD)}).")
+    MODO_DURABILIDAD = modo
+    for escritor in _escritores.values():
+        escritor.modo = modo
+
+
+class EscritorAgrupado:
+    """
+    Junta altas (INSERT/UPDATE de una fila) y las confirma en una sola transacción.
+
+    Se usa desde el hilo de Tk: `escribir` solo encola y vuelve enseguida; el resultado
+    de cada alta llega después a su `al_confirmar` (con el lastrowid) o a su `al_fallar`
+    (con la excepción). Cada alta va en su propio SAVEPOINT: una fila rechazada (p. ej.
+    un SKU repetido) no deshace las demás del grupo.
+    """
+    def __init__(self, ejecutor, modo=None, intervalo_ms=INTERVALO_MS, max_filas=MAX_FILAS):
+        self.ejecutor = ejecutor
+        self.modo = modo or MODO_DURABILIDAD
+        self.intervalo_ms = intervalo_ms
+        self.max_filas = max_filas
+        self._pendientes = []   # (sql, params, al_confirmar, al_fallar)
+        self._programado = None
+
+    @property
+    def pendientes(self):
+        """Altas encoladas que todavía no se mandaron a confirmar."""
+        return len(self._pendientes)
+
+    def escribir(self, sql, params, al_confirmar=None, al_fallar=None, critica=False):
+        """
+        Encola una alta.
+        Args:
+            sql (str): Sentencia de escritura de una fila.
+            params (tuple): Sus parámetros.
+            al_confirmar (callable): Se llama en el hilo de Tk con el lastrowid, ya confirmada.
+            al_fallar (callable): Se llama en el hilo de Tk con la excepción si la fila se rechazó.
+            critica (bool): Confirmar ya, con synchronous = FULL (ver `barrera`).
+        """
+        self._pendientes.append((sql, params, al_confirmar, al_fallar))
+        if critica:
+            self.barrera()
+        elif self.modo == "inmediata" or len(self._pendientes) >= self.max_filas:
+            self.vaciar()
+        elif self._programado is None:
+            self._programado = self.ejecutor.root.after(self.intervalo_ms, self.vaciar)
+
+    def vaciar(self, durable=False, al_terminar=None):
+        """
+        Manda a confirmar en una transacción todo lo pendiente.
+        Args:
+            durable (bool): Confirmar con synchronous = FULL.
+            al_terminar (callable): Se llama sin argumentos (en el hilo de Tk) cuando terminó.
+        """
+        if self._programado is not None:
+            self.ejecutor.root.after_cancel(self._programado)
+            self._programado = None
+        lote, self._pendientes = self._pendientes, []
+        if not lote and not durable:
+            if al_terminar:
+                al_terminar()
+            return
+
+        sincronizacion = "FULL" if durable or self.modo == "completa" else "NORMAL"
+        escrituras = [(sql, params) for sql, params, _, _ in lote]
+        self.ejecutor.enviar(_escribir_lote, escrituras, sincronizacion,
+                             al_terminar=lambda resultados: self._repartir(lote, resultados, al_terminar),
+                             al_fallar=lambda error: self._repartir(lote, [error] * len(lote), al_terminar))
+
+    def barrera(self, al_terminar=None):
+        """
+        Barrera de durabilidad: confirma lo pendiente con synchronous = FULL (o, si no hay
+        nada, hace un checkpoint del WAL). Cuando llega `al_terminar`, todo lo que se
+        escribió antes sobrevive a un corte de luz.
+        """
+        self.vaciar(durable=True, al_terminar=al_terminar)
+
+    @staticmethod
+    def _repartir(lote, resultados, al_terminar):
+        """Entrega a cada alta su resultado (en el hilo de Tk, en el orden en que se encolaron)."""
+        for (_, _, al_confirmar, al_fallar), resultado in zip(lote, resultados):
+            callback = al_fallar if isinstance(resultado, Exception) else al_confirmar
+            if callback:
+                callback(resultado)
+            elif isinstance(resultado, Exception):
+                print(f"Error al escribir en la DB: {resultado}")
+        if al_terminar:
+            al_terminar()
+
+
+def _escribir_lote(conexion, escrituras, sincronizacion):
+    """
+    Ejecuta las escrituras en una transacción (en el hilo de la DB).
+    Returns:
+        list: Por cada escritura, su lastrowid o la excepción que la rechazó.
+    """
+    resultados = []
+    # PRAGMA synchronous no se puede cambiar dentro de una transacción: va antes del BEGIN
+    conexion.execute(f"PRAGMA synchronous = {sincronizacion};")
+    cursor = conexion.cursor()
+    try:
+        if not escrituras:
+            # Nada nuevo: el checkpoint sincroniza el WAL con lo ya confirmado
+            cursor.execute("PRAGMA wal_checkpoint(PASSIVE);")
+            return resultados
+        cursor.execute("BEGIN")
+        for sql, params in escrituras:
+            cursor.execute("SAVEPOINT escritura")
+            try:
+                cursor.execute(sql, params)
+                resultados.append(cursor.lastrowid)
+            except sqlite3.Error as e:
+                cursor.execute("ROLLBACK TO escritura")
+                resultados.append(e)
+            cursor.execute("RELEASE escritura")
+        conexion.commit()
+        return resultados
+    except BaseException:
+        conexion.rollback()
+        raise
+    finally:
+        cursor.close()
+        conexion.execute("PRAGMA synchronous = NORMAL;")
+
+
+def obtener_escritor(root, db_path):
+    """Devuelve el escritor compartido para `db_path` (sobre su EjecutorDB), creándolo la primera vez."""
+    ejecutor = obtener_ejecutor(root, db_path)
+    escritor = _escritores.get(db_path)
+    if escritor is None or escritor.ejecutor is not ejecutor:
+        escritor = EscritorAgrupado(ejecutor)
+        _escritores[db_path] = escritor
+    return escritor
+
+
+def barrera_global(al_terminar):
+    """Pasa la barrera de durabilidad en todos los escritores y después llama a `al_terminar`."""
+    faltan = [len(_escritores)]
+    if not faltan[0]:
+        al_terminar()
+        return
+
+    def uno_menos():
+        faltan[0] -= 1
+        if faltan[0] == 0:
+            al_terminar()
+
+    for escritor in list(_escritores.values()):
+        escritor.barrera(al_terminar=uno_menos)
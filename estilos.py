@@ -1,6 +1,6 @@
 import tkinter as tk
 from tkinter import ttk
-from PIL import Image, ImageTk
+import imagenes
 
 # --- Definición de Colores y Fuentes ---
 COLOR_ACCENT = "#005aab"  # Azul oficial/de acento de Adidas
@@ -12,9 +12,6 @@ COLOR_ERROR = "#FF0000"    # Color para mensajes de error
 FONT_BASE = ("Segoe UI", 12)
 FONT_BUTTON = ("Segoe UI", 12, "bold")
 
-# Variable global para evitar que la imagen sea eliminada por el garbage collector
-_logo_header_ref = None
-
 # --- Función de Configuración de Estilos ---
 def configure_styles(root):
     """Configura los estilos Ttk basados en el esquema de color de Adidas."""
@@ -100,19 +97,16 @@ def add_logo_header(parent, title, back_command=None):
     Crea un encabezado de aplicación limpio con logo, título y botón de retroceso opcional.
     El fondo del encabezado ahora es BLANCO.
     """
-    global _logo_header_ref
-    
     # 🌟 MODIFICACIÓN CLAVE: Fondo del Header es BLANCO (BG_PRIMARY)
     header_frame = ttk.Frame(parent, style="TFrame", padding=(20, 10)) 
     header_frame.columnconfigure(1, weight=1) # Columna central expandible
     
     # 1. Logo (Columna 0)
     try:
-        img = Image.open("logo_three_stripes.png")
-        img = img.resize((60, 40), Image.Resampling.LANCZOS)
-        _logo_header_ref = ImageTk.PhotoImage(img) 
+        # El registro decodifica el logo una sola vez y mantiene viva la imagen
+        logo = imagenes.registro.obtener(imagenes.LOGO, imagenes.TAMANO_LOGO_HEADER)
         
-        lbl_logo = tk.Label(header_frame, image=_logo_header_ref, bg=BG_PRIMARY)
+        lbl_logo = tk.Label(header_frame, image=logo, bg=BG_PRIMARY)
         lbl_logo.grid(row=0, column=0, sticky='w')
     except Exception:
         # Si no se encuentra el logo, usa un texto simple
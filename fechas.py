@@ -0,0 +1,68 @@
+"""
+Fechas de la aplicación.
+
+En la DB las fechas se guardan como texto ISO-8601 (YYYY-MM-DD): ese formato ordena y
+compara igual que las fechas, así SQLite puede recorrer un rango con un índice. En
+pantalla se siguen ingresando como DD/MM/YYYY.
+"""
+import re
+from datetime import date, datetime
+
+# Formatos que se aceptan al ingresar o importar una fecha (además del ISO)
+FORMATOS_ENTRADA = ("%d/%m/%Y", "%d-%m-%Y", "%d/%m/%y")
+
+_DD_MM_YYYY = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})")
+_ISO = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def a_iso(texto):
+    """
+    Convierte una fecha ingresada por el usuario a ISO ('31/12/2024' -> '2024-12-31').
+    Lanza ValueError si el texto no es una fecha válida.
+    """
+    texto = texto.strip()
+    # Camino rápido para el formato de siempre (las migraciones lo llaman por cada fila)
+    coincidencia = _DD_MM_YYYY.fullmatch(texto)
+    try:
+        if coincidencia:
+            dia, mes, anio = (int(parte) for parte in coincidencia.groups())
+            return date(anio, mes, dia).isoformat()
+        if _ISO.fullmatch(texto):
+            return date.fromisoformat(texto).isoformat()
+    except ValueError:
+        raise ValueError(f"Fecha inválida: '{texto}'.") from None
+    for formato in FORMATOS_ENTRADA:
+        try:
+            return datetime.strptime(texto, formato).date().isoformat()
+        except ValueError:
+            continue
+    raise ValueError(f"Fecha inválida: '{texto}' (usar DD/MM/YYYY).")
+
+
+def normalizar(valor):
+    """
+    Versión tolerante de a_iso para migraciones e importaciones: devuelve la fecha en ISO
+    si se puede interpretar y, si no, el valor original sin cambios (no se pierden datos).
+    """
+    if not isinstance(valor, str) or not valor.strip():
+        return valor
+    try:
+        return a_iso(valor)
+    except ValueError:
+        return valor
+
+
+def condiciones_rango(columna, desde=None, hasta=None):
+    """
+    Condiciones SQL para filtrar `columna` entre dos fechas ISO (ambos extremos incluidos).
+    Returns:
+        tuple: (lista de condiciones, lista de parámetros); vacías si no hay extremos.
+    """
+    condiciones, params = [], []
+    if desde:
+        condiciones.append(f"{columna} >= ?")
+        params.append(desde)
+    if hasta:
+        condiciones.append(f"{columna} <= ?")
+        params.append(hasta)
+    return condiciones, params
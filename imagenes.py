@@ -0,0 +1,109 @@
+from collections import OrderedDict
+
+from PIL import Image, ImageTk
+
+# Espera (ms) desde el último <Configure> antes de re-escalar el fondo
+RETARDO_REDIMENSION_MS = 150
+
+# Cantidad de tamaños ya escalados que se conservan (pantalla completa, ventana, etc.)
+MAX_VARIANTES = 4
+
+
+class ServicioFondo:
+    """
+    Entrega la imagen de fondo escalada a un tamaño dado.
+
+    El archivo se decodifica una sola vez y se conserva en memoria; las versiones ya
+    escaladas se guardan en un LRU chico por (ancho, alto), así volver a un tamaño
+    conocido (p. ej. al entrar y salir de pantalla completa) no repite el LANCZOS.
+    """
+    def __init__(self, ruta, max_variantes=MAX_VARIANTES):
+        self.ruta = ruta
+        self.max_variantes = max_variantes
+        self._original = None
+        self._variantes = OrderedDict()
+
+    def _imagen_original(self):
+        """Decodifica el archivo la primera vez (lanza FileNotFoundError si no existe)."""
+        if self._original is None:
+            with Image.open(self.ruta) as imagen:
+                self._original = imagen.convert("RGB")
+        return self._original
+
+    def obtener(self, ancho, alto):
+        """Devuelve un PhotoImage del fondo a (ancho, alto), desde el LRU si ya existe."""
+        clave = (ancho, alto)
+        foto = self._variantes.get(clave)
+        if foto is not None:
+            self._variantes.move_to_end(clave)
+            return foto
+
+        escalada = self._imagen_original().resize(clave, Image.Resampling.LANCZOS)
+        foto = ImageTk.PhotoImage(escalada)
+        self._variantes[clave] = foto
+        # El label que muestra el fondo conserva su propia referencia: sacar una
+        # variante del LRU no borra la imagen que está en pantalla
+        while len(self._variantes) > self.max_variantes:
+            self._variantes.popitem(last=False)
+        return foto
+
+
+# --- Registro compartido de imágenes (logos, íconos) ---
+
+LOGO = "logo_three_stripes.png"
+TAMANO_LOGO_HEADER = (60, 40)
+TAMANO_LOGO_LOGIN = (80, 50)
+
+
+class RegistroImagenes:
+    """
+    Carga cada imagen una sola vez por (ruta, tamaño) y devuelve siempre el mismo
+    PhotoImage compartido.
+
+    El registro conserva la referencia de cada PhotoImage mientras la aplicación vive
+    (Tk borra la imagen si Python la libera), así las pantallas no necesitan guardar
+    variables globales para evitar el garbage collector.
+    """
+    def __init__(self):
+        self._fotos = {}
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, ruta, tamano=None):
+        """
+        Devuelve el PhotoImage de `ruta` escalado a `tamano` (ancho, alto), o a su tamaño original.
+        Lanza OSError si el archivo no existe o no se puede decodificar.
+        """
+        clave = (ruta, tamano)
+        foto = self._fotos.get(clave)
+        if foto is not None:
+            self.aciertos += 1
+            return foto
+
+        self.fallos += 1
+        with Image.open(ruta) as imagen:
+            if tamano:
+                imagen = imagen.resize(tamano, Image.Resampling.LANCZOS)
+            foto = ImageTk.PhotoImage(imagen)
+        self._fotos[clave] = foto
+        return foto
+
+    def precargar(self, recursos):
+        """Carga de antemano una lista de (ruta, tamaño), p. ej. al iniciar la aplicación."""
+        for ruta, tamano in recursos:
+            try:
+                self.obtener(ruta, tamano)
+            except OSError:
+                print(f"Advertencia: No se pudo precargar '{ruta}'.")
+
+    def liberar(self):
+        """Suelta todas las imágenes (antes de destruir la ventana raíz)."""
+        self._fotos.clear()
+
+    def estadisticas(self):
+        """Devuelve los contadores de aciertos/fallos del registro."""
+        return {"aciertos": self.aciertos, "fallos": self.fallos, "imagenes": len(self._fotos)}
+
+
+# Registro único de la aplicación
+registro = RegistroImagenes()
@@ -2,10 +2,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 # Importamos BG_MODULO y FG_PRIMARY, aunque ahora usamos estilos específicos para el look blanco
 from estilos import FONT_BASE, FONT_BUTTON, COLOR_ACCENT 
-from PIL import Image, ImageTk # Necesario para manejar imágenes
-
-# Variable global para evitar que la imagen sea eliminada por el garbage collector
-_logo_login_ref = None 
+import imagenes # Registro compartido de imágenes (logo)
 
 class LoginUI:
     """Interfaz de usuario para la pantalla de inicio de sesión, con estilo moderno."""
@@ -26,8 +23,6 @@ class LoginUI:
 
     def crear_ui(self):
         """Crea y organiza la interfaz de usuario de login, centrada en un contenedor blanco."""
-        global _logo_login_ref
-        
         # 🌟 MODIFICACIÓN CLAVE: Usamos Login.TFrame (Fondo Blanco) y borde redondeado
         # Usamos tk.Frame y un borde para simular un 'card' limpio.
         login_container = tk.Frame(self.frame, bg="white", padx=50, pady=40, 
@@ -36,12 +31,11 @@ class LoginUI:
         
         # --- NUEVO: Agregar Logo Arriba del Título ---
         try:
-            img = Image.open("logo_three_stripes.png")
-            img = img.resize((80, 50), Image.Resampling.LANCZOS) # Tamaño un poco más grande
-            _logo_login_ref = ImageTk.PhotoImage(img) 
+            # Tamaño un poco más grande que el del header; el registro lo decodifica una sola vez
+            logo = imagenes.registro.obtener(imagenes.LOGO, imagenes.TAMANO_LOGO_LOGIN)
             
             # Label para mostrar la imagen (fondo blanco de la tarjeta)
-            lbl_logo = tk.Label(login_container, image=_logo_login_ref, bg="white")
+            lbl_logo = tk.Label(login_container, image=logo, bg="white")
             lbl_logo.pack(pady=(0, 10))
         except Exception:
             # Si el logo no se encuentra, mostramos un mensaje alternativo o nada
@@ -1,13 +1,20 @@
+# El perfil se importa primero: su reloj marca el inicio del proceso
+from perfil import perfil, PRESUPUESTO_ARRANQUE_MS
+import importlib
+import sys
 import tkinter as tk
 from tkinter import ttk 
-from PIL import Image, ImageTk
-# Importamos el nuevo módulo de Producción
-from produccion import ProduccionUI 
-# 🌟 Importamos los módulos (asumidos existentes)
+# Al inicio solo se importa lo que necesita el login; los módulos de gestión
+# (compras, empleados, producción) se importan recién al entrar a cada uno
 from login import LoginUI 
-from compras import ComprasUI 
-from empleados import EmpleadosUI 
 from estilos import configure_styles, add_logo_header, COLOR_ACCENT, BG_PRIMARY
+import repositorio
+import imagenes
+from imagenes import ServicioFondo, RETARDO_REDIMENSION_MS
+from pantallas import GestorPantallas
+
+# La papelera se compacta una vez por sesión, un rato después de entrar al menú
+RETRASO_COMPACTACION_MS = 30_000
 
 class MainApp:
     """Clase principal de la aplicación, maneja la navegación entre módulos."""
@@ -25,6 +32,25 @@ class MainApp:
         self.background_label = None
         self.header_frame = None 
 
+        # El fondo se decodifica una vez y se cachea por tamaño
+        self.servicio_fondo = ServicioFondo("fondo_adidas.jpg")
+        self._tamano_fondo = None
+        self._redimension_pendiente = None
+        self._compactacion_programada = False
+
+        # Los logos del login y de los headers se decodifican una sola vez al inicio
+        imagenes.registro.precargar([
+            (imagenes.LOGO, imagenes.TAMANO_LOGO_LOGIN),
+            (imagenes.LOGO, imagenes.TAMANO_LOGO_HEADER),
+        ])
+
+        # Las pantallas de los módulos se construyen una vez y se reutilizan
+        self.pantallas = GestorPantallas(root)
+        self.pantallas.registrar("compras", self._fabrica("compras", "ComprasUI"), repositorio.DB_ADIDAS)
+        self.pantallas.registrar("empleados", self._fabrica("empleados", "EmpleadosUI"), repositorio.DB_ADIDAS)
+        self.pantallas.registrar("produccion", self._fabrica("produccion", "ProduccionUI"), repositorio.DB_PRODUCCION)
+        self.pantallas.registrar("analitica", self._fabrica("analitica", "AnaliticaUI"), repositorio.DB_ADIDAS)
+
         # Configuración inicial del fondo
         self._setup_background()
         
@@ -33,16 +59,78 @@ class MainApp:
         
         # Opcional: Para salir de pantalla completa con la tecla ESC
         self.root.bind('<Escape>', self.exit_fullscreen)
+        # Cerrar la ventana también espera a que se confirmen las altas pendientes
+        self.root.protocol("WM_DELETE_WINDOW", self.salir)
         
         # Al inicio, mostramos la pantalla de login.
         self.show_login() 
 
+    def _fabrica(self, nombre_modulo, nombre_clase):
+        """Devuelve una función que importa el módulo (la primera vez) y construye su pantalla."""
+        def crear():
+            with perfil.medir(nombre_modulo, "importación"):
+                modulo = importlib.import_module(nombre_modulo)
+            with perfil.medir(nombre_modulo, "construcción"):
+                return getattr(modulo, nombre_clase)(self.root, volver_callback=self.show_main_menu)
+        return crear
+
+    def perfilar_arranque(self):
+        """
+        Recorre cada módulo una vez midiendo su primer dibujo e imprime el informe.
+        Returns:
+            int: 0 si el login apareció dentro de PRESUPUESTO_ARRANQUE_MS, 1 si no.
+        """
+        # El login ya está construido: el primer dibujo termina con este update
+        self.root.update()
+        arranque_ms = perfil.desde_inicio() * 1000
+        perfil.registrar("login", "primer dibujo desde el inicio", arranque_ms / 1000)
+
+        self.show_main_menu()
+        self.root.update()
+        for nombre, mostrar in (("compras", self.show_compras),
+                                ("empleados", self.show_empleados),
+                                ("produccion", self.show_produccion),
+                                ("analitica", self.show_otro_modulo)):
+            with perfil.medir(nombre, "hasta el primer dibujo"):
+                mostrar()
+                self.root.update()
+            self.show_main_menu()
+            self.root.update()
+
+        print(perfil.informe(repositorio.tiempos_configuracion))
+        dentro = arranque_ms <= PRESUPUESTO_ARRANQUE_MS
+        print(f"{'✅' if dentro else '⚠️ '} Login visible en {arranque_ms:.0f} ms "
+              f"(presupuesto: {PRESUPUESTO_ARRANQUE_MS} ms)")
+        return 0 if dentro else 1
+
+    def salir(self):
+        """Confirma en disco las altas pendientes de los escritores y recién después cierra la ventana."""
+        # Importación diferida, como los módulos: sin escritores creados cierra enseguida
+        importlib.import_module("escritor_db").barrera_global(self.cerrar)
+
+    def cerrar(self):
+        """Suelta las imágenes del registro mientras su intérprete Tk sigue vivo y destruye la ventana."""
+        print(f"Registro de imágenes: {imagenes.registro.estadisticas()}")
+        imagenes.registro.liberar()
+        self.root.destroy()
+
     def exit_fullscreen(self, event):
         """Permite salir de pantalla completa al presionar ESC."""
         self.root.attributes('-fullscreen', False)
 
     def on_resize(self, event):
-        """Vuelve a cargar y redimensiona el fondo cuando la ventana cambia de tamaño."""
+        """Agenda el redimensionado del fondo cuando la ventana cambia de tamaño."""
+        # Los <Configure> de todos los widgets hijos también llegan aquí: solo importa la ventana
+        if event.widget is not self.root:
+            return
+        # Debounce: una ráfaga de eventos (arrastrar el borde, pantalla completa) se procesa una sola vez
+        if self._redimension_pendiente is not None:
+            self.root.after_cancel(self._redimension_pendiente)
+        self._redimension_pendiente = self.root.after(RETARDO_REDIMENSION_MS, self._aplicar_redimension)
+
+    def _aplicar_redimension(self):
+        """Redimensiona el fondo al tamaño actual de la ventana."""
+        self._redimension_pendiente = None
         current_width = self.root.winfo_width()
         current_height = self.root.winfo_height()
         
@@ -50,12 +138,11 @@ class MainApp:
             self._load_and_place_background(current_width, current_height)
 
     def _load_and_place_background(self, width, height):
-        """Carga, redimensiona y coloca la imagen de fondo."""
+        """Coloca la imagen de fondo escalada (sin trabajo si el tamaño no cambió)."""
+        if (width, height) == self._tamano_fondo:
+            return
         try:
-            image = Image.open("fondo_adidas.jpg")
-            image_resized = image.resize((width, height), Image.Resampling.LANCZOS)
-            
-            self.background_image = ImageTk.PhotoImage(image_resized)
+            self.background_image = self.servicio_fondo.obtener(width, height)
             
             if self.background_label:
                 self.background_label.config(image=self.background_image)
@@ -64,6 +151,7 @@ class MainApp:
                 self.background_label.place(x=0, y=0, relwidth=1, relheight=1)
 
             self.background_label.lower() 
+            self._tamano_fondo = (width, height)
             
         except FileNotFoundError:
             # Si no hay imagen, asegura un fondo negro
@@ -80,12 +168,16 @@ class MainApp:
         self._load_and_place_background(self.root.winfo_width(), self.root.winfo_height())
         
     def limpiar_frame(self):
-        """Limpia todos los widgets excepto la etiqueta de fondo y el frame del header."""
+        """Limpia todos los widgets excepto la etiqueta de fondo, el frame del header y las pantallas guardadas."""
+        # Las pantallas de módulos solo se ocultan: volver a ellas no las reconstruye
+        self.pantallas.ocultar_actual()
         for widget in self.root.winfo_children():
             # No destruir el fondo ni el frame del header si existe
             if widget is self.background_label or widget is self.header_frame: 
                 widget.lift() # Asegura que el header y el fondo se mantengan
                 continue
+            if self.pantallas.es_de_pantalla(widget):
+                continue
             widget.destroy()
 
     # --- FUNCIÓN PARA MOSTRAR LOGIN ---
@@ -121,14 +213,23 @@ class MainApp:
 
         self._setup_buttons()
 
+        if not self._compactacion_programada:
+            self._compactacion_programada = True
+            self.root.after(RETRASO_COMPACTACION_MS, self._compactar_papelera)
+
+    def _compactar_papelera(self):
+        """Elimina en segundo plano (por lotes, en el hilo de cada DB) lo que venció en la papelera."""
+        papelera = importlib.import_module("papelera")
+        papelera.programar_compactacion(
+            self.root, al_terminar=lambda eliminadas: print(f"Papelera compactada: {eliminadas}"))
+
     def show_compras(self):
         """Función que inicia la interfaz de ComprasUI."""
         self.limpiar_frame()
         if self.header_frame:
             self.header_frame.destroy()
             self.header_frame = None
-        # Asumo que ComprasUI existe
-        ComprasUI(self.root, volver_callback=self.show_main_menu) 
+        self.pantallas.mostrar("compras")
 
     def show_empleados(self): 
         """Función que inicia la interfaz de EmpleadosUI."""
@@ -136,8 +237,7 @@ class MainApp:
         if self.header_frame:
             self.header_frame.destroy()
             self.header_frame = None
-        # Asumo que EmpleadosUI existe
-        EmpleadosUI(self.root, volver_callback=self.show_main_menu) 
+        self.pantallas.mostrar("empleados")
 
     def show_produccion(self): 
         """🌟 NUEVA FUNCIÓN: Inicia la interfaz de ProduccionUI (Trazabilidad y Calidad)."""
@@ -146,26 +246,16 @@ class MainApp:
             self.header_frame.destroy()
             self.header_frame = None
         
-        # Llamar al nuevo módulo
-        ProduccionUI(self.root, volver_callback=self.show_main_menu)
+        self.pantallas.mostrar("produccion")
         
     def show_otro_modulo(self): 
-        """Función para un módulo de ejemplo."""
+        """Muestra el tablero de análisis de compras (gasto por proveedor y por cliente)."""
         self.limpiar_frame()
         if self.header_frame:
             self.header_frame.destroy()
             self.header_frame = None
 
-        # Contenedor con fondo blanco/claro (BG_PRIMARY)
-        temp_frame = ttk.Frame(self.root, style="TFrame")
-        temp_frame.place(relx=0.5, rely=0.5, anchor=tk.CENTER, width=500, height=200)
-
-        # Usamos TLabel para texto negro sobre fondo claro
-        label_temp = ttk.Label(temp_frame, text="MÓDULO FUTURO EN CONSTRUCCIÓN", font=('Segoe UI', 18, 'bold'), style="TLabel")
-        label_temp.pack(pady=30)
-        
-        # Botón de volver usando Accent.TButton (Negro/Blanco)
-        ttk.Button(temp_frame, text="< Volver al Menú", command=self.show_main_menu, style="Accent.TButton").pack(pady=10, ipadx=10)
+        self.pantallas.mostrar("analitica")
         
     # --- CONFIGURACIÓN DE BOTONES DEL MENÚ PRINCIPAL ---
 
@@ -215,10 +305,10 @@ class MainApp:
         )
         btn_produccion.pack(pady=10)
         
-        # Botón 3: Otro Módulo
+        # Botón 3: Análisis de compras
         btn_otro = ttk.Button(
             button_container, 
-            text="⚙️ Otro Módulo / Configuración", 
+            text="📊 Análisis de Compras", 
             command=self.show_otro_modulo, 
             style="Accent.TButton", 
             width=30
@@ -229,7 +319,7 @@ class MainApp:
         btn_exit = ttk.Button(
             button_container, 
             text="❌ Salir de la Aplicación", 
-            command=self.root.destroy, 
+            command=self.salir, 
             style="Accent.TButton", 
             width=30
         )
@@ -237,6 +327,26 @@ class MainApp:
 
 # --- Bucle Principal ---
 if __name__ == "__main__":
+    # Los imports de arriba ya corrieron: es todo lo que carga el login
+    perfil.registrar("login", "importación", perfil.desde_inicio())
+    # --durabilidad=inmediata|agrupada|completa elige cómo se confirman las altas (ver escritor_db)
+    for argumento in sys.argv[1:]:
+        if argumento.startswith("--durabilidad="):
+            import escritor_db
+            try:
+                escritor_db.configurar(argumento.split("=", 1)[1])
+            except ValueError as error:
+                # Como un error de argparse: el mensaje y código de salida 2, sin traceback
+                print(f"main.py: error: {error}", file=sys.stderr)
+                sys.exit(2)
     root = tk.Tk()
     app = MainApp(root)
-    root.mainloop()
\ No newline at end of file
+    if "--profile-startup" in sys.argv[1:]:
+        codigo = app.perfilar_arranque()
+        imagenes.registro.liberar()
+        root.destroy()
+        repositorio.cerrar_todas()
+        sys.exit(codigo)
+    root.mainloop()
+    # Cerrar las conexiones del pool (hace checkpoint del WAL al cerrar la última)
+    repositorio.cerrar_todas()
\ No newline at end of file
@@ -0,0 +1,689 @@
+"""
+Migraciones versionadas del esquema de las bases de datos.
+
+Las funciones `iniciar_db` de cada módulo crean el esquema base (versión 0). Todo
+cambio posterior se agrega aquí como una migración numerada; la versión aplicada
+se guarda en `PRAGMA user_version` de cada archivo, así cada migración corre una
+sola vez y en orden.
+
+Las migraciones que tocan tablas grandes trabajan por lotes acotados (con un
+commit por lote) para no tomar un único bloqueo de escritura gigante ni duplicar
+el tamaño del archivo de golpe. Si se interrumpen, al volver a correr continúan
+donde quedaron.
+
+Uso (desde la raíz del proyecto):
+    python migraciones.py           # aplica las migraciones pendientes
+    python migraciones.py --estado  # solo muestra la versión de cada DB
+"""
+import sqlite3
+import sys
+
+import fechas
+import repositorio
+
+# Filas que se procesan por transacción en las migraciones por lotes
+TAMANO_LOTE = 10_000
+
+# db -> lista de (versión, descripción, función(conexion, progreso))
+MIGRACIONES = {
+    repositorio.DB_ADIDAS: [],
+    repositorio.DB_PRODUCCION: [],
+}
+
+
+def migracion(db_path, version, descripcion):
+    """Decorador que registra una función como la migración `version` de `db_path`."""
+    def registrar(funcion):
+        lista = MIGRACIONES[db_path]
+        if any(v == version for v, _, _ in lista):
+            raise ValueError(f"La migración {version} de '{db_path}' ya está registrada.")
+        lista.append((version, descripcion, funcion))
+        lista.sort(key=lambda m: m[0])
+        return funcion
+    return registrar
+
+
+def version_actual(conexion):
+    return conexion.execute("PRAGMA user_version;").fetchone()[0]
+
+
+def migrar(conexion, db_path, progreso=None):
+    """
+    Aplica en orden las migraciones de `db_path` más nuevas que su `user_version`.
+    Args:
+        conexion (sqlite3.Connection): Conexión a la DB a migrar.
+        db_path (str): Clave de la DB en MIGRACIONES (DB_ADIDAS o DB_PRODUCCION).
+        progreso (callable): Recibe (mensaje, hechas, total) durante las migraciones por lotes.
+    """
+    progreso = progreso or _imprimir_progreso
+    actual = version_actual(conexion)
+
+    for version, descripcion, funcion in MIGRACIONES.get(db_path, []):
+        if version <= actual:
+            continue
+        print(f"Migrando '{db_path}' a la versión {version}: {descripcion}...")
+        funcion(conexion, progreso)
+        # PRAGMA no admite parámetros; version es siempre un int propio
+        conexion.execute(f"PRAGMA user_version = {int(version)};")
+        conexion.commit()
+
+
+def _imprimir_progreso(mensaje, hechas, total):
+    porcentaje = (hechas / total * 100) if total else 100
+    print(f"   {mensaje}: {hechas}/{total} filas ({porcentaje:.0f}%)")
+
+
+# --- Herramientas para migraciones por lotes ---
+
+def columnas_de(conexion, tabla):
+    """Devuelve {nombre_columna: tipo_declarado} de `tabla`."""
+    return {fila[1]: fila[2].upper() for fila in conexion.execute(f"PRAGMA table_info({tabla});")}
+
+
+def reescribir_tabla_por_lotes(conexion, tabla, ddl_nueva, columnas, progreso, tamano_lote=TAMANO_LOTE):
+    """
+    Reemplaza `tabla` por una versión con otra definición, moviendo las filas por lotes.
+
+    Cada lote se copia a la tabla nueva y se borra de la vieja en la misma transacción:
+    las páginas liberadas se reutilizan, así el archivo no llega a duplicar su tamaño.
+    Si el proceso se corta, las filas que faltan siguen en la tabla vieja y una nueva
+    ejecución continúa desde ahí.
+
+    Args:
+        tabla (str): Tabla a reescribir (debe tener `id` INTEGER PRIMARY KEY).
+        ddl_nueva (str): CREATE TABLE con `{tabla}` como marcador del nombre.
+        columnas (list of str): Columnas a copiar (mismo nombre en ambas tablas).
+    """
+    nueva = f"{tabla}__nueva"
+    lista_columnas = ", ".join(columnas)
+
+    # Las FK se desactivan durante el cambio de tabla (procedimiento recomendado por SQLite)
+    conexion.commit()
+    conexion.execute("PRAGMA foreign_keys = OFF;")
+    try:
+        conexion.execute(ddl_nueva.format(tabla=nueva))
+        ya_movidas = conexion.execute(f"SELECT COUNT(*) FROM {nueva};").fetchone()[0]
+        total = ya_movidas + conexion.execute(f"SELECT COUNT(*) FROM {tabla};").fetchone()[0]
+        secuencia = conexion.execute("SELECT seq FROM sqlite_sequence WHERE name = ?;", (tabla,)).fetchone()
+
+        movidas = ya_movidas
+        while True:
+            hasta = conexion.execute(
+                f"SELECT MAX(id) FROM (SELECT id FROM {tabla} ORDER BY id LIMIT ?);", (tamano_lote,)
+            ).fetchone()[0]
+            if hasta is None:
+                break
+            cursor = conexion.execute(
+                f"INSERT INTO {nueva} ({lista_columnas}) SELECT {lista_columnas} FROM {tabla} WHERE id <= ?;", (hasta,)
+            )
+            conexion.execute(f"DELETE FROM {tabla} WHERE id <= ?;", (hasta,))
+            conexion.commit()
+            movidas += cursor.rowcount
+            progreso(f"Reescribiendo '{tabla}'", movidas, total)
+
+        # El cambio de nombre va en una sola transacción: nunca queda la DB sin la tabla
+        conexion.execute("BEGIN;")
+        conexion.execute(f"DROP TABLE {tabla};")
+        conexion.execute(f"ALTER TABLE {nueva} RENAME TO {tabla};")
+        if secuencia is not None:
+            # Conservamos el AUTOINCREMENT: los ids borrados no se reutilizan
+            conexion.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?;", (secuencia[0], tabla))
+        conexion.commit()
+    finally:
+        conexion.execute("PRAGMA foreign_keys = ON;")
+
+
+def actualizar_por_lotes(conexion, tabla, asignacion, condicion, progreso, tamano_lote=TAMANO_LOTE):
+    """
+    Ejecuta `UPDATE tabla SET asignacion WHERE condicion` por rangos de id, con un commit
+    por lote, para rellenar columnas de tablas grandes sin bloquear la DB.
+    """
+    total = conexion.execute(f"SELECT COUNT(*) FROM {tabla} WHERE {condicion};").fetchone()[0]
+    hechas = 0
+    desde = 0
+    while True:
+        hasta = conexion.execute(
+            f"SELECT MAX(id) FROM (SELECT id FROM {tabla} WHERE id > ? ORDER BY id LIMIT ?);", (desde, tamano_lote)
+        ).fetchone()[0]
+        if hasta is None:
+            break
+        cursor = conexion.execute(
+            f"UPDATE {tabla} SET {asignacion} WHERE id > ? AND id <= ? AND ({condicion});", (desde, hasta)
+        )
+        conexion.commit()
+        hechas += cursor.rowcount
+        desde = hasta
+        progreso(f"Actualizando '{tabla}'", hechas, total)
+
+
+def agregar_papelera(conexion, tabla, indices):
+    """
+    Agrega a `tabla` la columna `deleted_at` del borrado lógico (ver papelera.py).
+
+    Los índices de `indices` ({nombre: columna}) se rehacen como parciales, solo con las
+    filas vivas (`WHERE deleted_at IS NULL`): las consultas de la UI filtran por esa misma
+    condición y las filas borradas no ocupan lugar en ellos. Un índice parcial aparte con
+    solo las borradas le permite a la compactación encontrarlas sin recorrer la tabla.
+    """
+    columnas = [fila[1] for fila in conexion.execute(f"PRAGMA table_info({tabla});")]
+    if "deleted_at" not in columnas:
+        conexion.execute(f"ALTER TABLE {tabla} ADD COLUMN deleted_at TEXT;")
+    for nombre, columna in indices.items():
+        conexion.execute(f"DROP INDEX IF EXISTS {nombre};")
+        conexion.execute(f"CREATE INDEX {nombre} ON {tabla} ({columna}) WHERE deleted_at IS NULL;")
+    conexion.execute(f"""
+    CREATE INDEX IF NOT EXISTS idx_{tabla.lower()}_borrados ON {tabla} (deleted_at) WHERE deleted_at IS NOT NULL;
+    """)
+
+
+# =====================================================================
+# Migraciones de adidas.db (compras y empleados)
+# =====================================================================
+
+@migracion(repositorio.DB_ADIDAS, 1, "renombrar columnas heredadas (sucursal, contacto_email)")
+def _renombrar_columnas_heredadas(conexion, progreso):
+    # compras.sucursal pasó a llamarse proveedor
+    if "sucursal" in columnas_de(conexion, "compras") and "proveedor" not in columnas_de(conexion, "compras"):
+        conexion.execute("ALTER TABLE compras RENAME COLUMN sucursal TO proveedor;")
+    # El DDL viejo de empleados decía contacto_email, pero el código siempre usó contacto_mail
+    if "contacto_email" in columnas_de(conexion, "empleados") and "contacto_mail" not in columnas_de(conexion, "empleados"):
+        conexion.execute("ALTER TABLE empleados RENAME COLUMN contacto_email TO contacto_mail;")
+
+
+@migracion(repositorio.DB_ADIDAS, 2, "compras.cliente como TEXT")
+def _compras_cliente_texto(conexion, progreso):
+    # Algunas DBs tienen cliente INTEGER: SQLite convierte a número los clientes que
+    # parecen números. Cambiar el tipo de una columna exige reescribir la tabla.
+    if columnas_de(conexion, "compras").get("cliente", "TEXT") == "TEXT":
+        return
+    reescribir_tabla_por_lotes(
+        conexion, "compras",
+        """
+        CREATE TABLE IF NOT EXISTS {tabla} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            fecha TEXT NOT NULL,
+            proveedor TEXT,
+            monto REAL NOT NULL,
+            identificador_producto TEXT,
+            cliente TEXT
+        );
+        """,
+        ["id", "fecha", "proveedor", "monto", "identificador_producto", "cliente"],
+        progreso,
+    )
+
+
+@migracion(repositorio.DB_ADIDAS, 3, "puntos de control de importación CSV")
+def _tabla_importaciones(conexion, progreso):
+    # data_manager guarda aquí cuántas filas de cada CSV ya importó, en la misma
+    # transacción que las filas: así una importación cortada se reanuda sin duplicar
+    conexion.execute("""
+    CREATE TABLE IF NOT EXISTS importaciones (
+        archivo TEXT NOT NULL,
+        tabla TEXT NOT NULL,
+        filas INTEGER NOT NULL,
+        PRIMARY KEY (archivo, tabla)
+    );
+    """)
+
+
+@migracion(repositorio.DB_ADIDAS, 4, "búsqueda de texto completo en compras (FTS5)")
+def _busqueda_compras(conexion, progreso):
+    # Tabla FTS5 de contenido externo: guarda solo el índice invertido, el texto se lee de compras.
+    # prefix='2 3' indexa los prefijos cortos para que la búsqueda mientras se escribe no
+    # tenga que recorrer todos los términos que empiezan igual.
+    conexion.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS compras_fts USING fts5(
+        cliente, proveedor, identificador_producto,
+        content='compras', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    );
+    """)
+    # Los triggers mantienen el índice al día con cada INSERT, UPDATE y DELETE de compras
+    conexion.executescript("""
+    CREATE TRIGGER IF NOT EXISTS compras_fts_insertar AFTER INSERT ON compras BEGIN
+        INSERT INTO compras_fts (rowid, cliente, proveedor, identificador_producto)
+        VALUES (new.id, new.cliente, new.proveedor, new.identificador_producto);
+    END;
+    CREATE TRIGGER IF NOT EXISTS compras_fts_borrar AFTER DELETE ON compras BEGIN
+        INSERT INTO compras_fts (compras_fts, rowid, cliente, proveedor, identificador_producto)
+        VALUES ('delete', old.id, old.cliente, old.proveedor, old.identificador_producto);
+    END;
+    CREATE TRIGGER IF NOT EXISTS compras_fts_actualizar AFTER UPDATE OF cliente, proveedor, identificador_producto ON compras BEGIN
+        INSERT INTO compras_fts (compras_fts, rowid, cliente, proveedor, identificador_producto)
+        VALUES ('delete', old.id, old.cliente, old.proveedor, old.identificador_producto);
+        INSERT INTO compras_fts (rowid, cliente, proveedor, identificador_producto)
+        VALUES (new.id, new.cliente, new.proveedor, new.identificador_producto);
+    END;
+    """)
+    # Indexar las compras existentes por lotes (la versión se anota recién al terminar todo,
+    # así que si se corta, la migración se repite desde cero sobre un índice vacío)
+    conexion.execute("INSERT INTO compras_fts (compras_fts) VALUES ('delete-all');")
+    total = conexion.execute("SELECT COUNT(*) FROM compras;").fetchone()[0]
+    hechas = 0
+    desde = 0
+    while True:
+        hasta = conexion.execute(
+            "SELECT MAX(id) FROM (SELECT id FROM compras WHERE id > ? ORDER BY id LIMIT ?);", (desde, TAMANO_LOTE)
+        ).fetchone()[0]
+        if hasta is None:
+            break
+        cursor = conexion.execute("""
+            INSERT INTO compras_fts (rowid, cliente, proveedor, identificador_producto)
+            SELECT id, cliente, proveedor, identificador_producto FROM compras WHERE id > ? AND id <= ?;
+        """, (desde, hasta))
+        conexion.commit()
+        hechas += cursor.rowcount
+        desde = hasta
+        progreso("Indexando 'compras'", hechas, total)
+    conexion.execute("INSERT INTO compras_fts (compras_fts) VALUES ('optimize');")
+
+
+@migracion(repositorio.DB_ADIDAS, 5, "índices para ordenar compras y empleados por columna")
+def _indices_de_orden_adidas(conexion, progreso):
+    # Un índice por cada columna que se puede ordenar desde los encabezados de la tabla.
+    # Como todo índice termina en el rowid, también resuelve el desempate por id.
+    for tabla, columna in (("compras", "fecha"), ("compras", "proveedor"), ("compras", "monto"),
+                           ("compras", "identificador_producto"), ("compras", "cliente"),
+                           ("empleados", "nombre"), ("empleados", "puesto"), ("empleados", "fecha_ingreso"),
+                           ("empleados", "sueldo"), ("empleados", "sucursal")):
+        conexion.execute(f"CREATE INDEX IF NOT EXISTS idx_{tabla}_{columna} ON {tabla} ({columna});")
+
+
+@migracion(repositorio.DB_ADIDAS, 6, "fechas de compras y empleados en formato ISO-8601")
+def _fechas_iso(conexion, progreso):
+    # Las fechas se cargaban como texto libre DD/MM/YYYY: no se podían comparar ni ordenar.
+    # La conversión usa el mismo intérprete que la UI; lo que no se entiende queda como estaba.
+    conexion.create_function("fecha_iso", 1, fechas.normalizar, deterministic=True)
+    for tabla, columna in (("compras", "fecha"), ("empleados", "fecha_ingreso"), ("empleados", "fecha_de_baja")):
+        actualizar_por_lotes(conexion, tabla, f"{columna} = fecha_iso({columna})",
+                             f"{columna} IS NOT fecha_iso({columna})", progreso)
+    # Un empleado sin baja se guardaba con fecha_de_baja = '': ahora es NULL
+    actualizar_por_lotes(conexion, "empleados", "fecha_de_baja = NULL", "fecha_de_baja = ''", progreso)
+    # compras.fecha y empleados.fecha_ingreso ya tienen índice (migración 5)
+    conexion.execute("CREATE INDEX IF NOT EXISTS idx_empleados_fecha_de_baja ON empleados (fecha_de_baja);")
+
+
+# Tablas de resumen de compras: (tabla, expresión del período a partir de la fecha ISO)
+RESUMENES_COMPRAS = (
+    ("resumen_compras_diario", "{fila}.fecha"),
+    ("resumen_compras_mensual", "substr({fila}.fecha, 1, 7)"),
+)
+DIMENSIONES_RESUMEN = ("proveedor", "cliente")
+
+
+def _sumar_en_resumenes(fila, signo):
+    """Sentencias de trigger que suman (signo=1) o restan (signo=-1) la compra `fila` (new/old)."""
+    sentencias = []
+    for tabla, periodo in RESUMENES_COMPRAS:
+        fecha = periodo.format(fila=fila)
+        for dimension in DIMENSIONES_RESUMEN:
+            clave = f"COALESCE({fila}.{dimension}, '')"
+            if signo > 0:
+                sentencias.append(f"""
+        INSERT INTO {tabla} (dimension, fecha, clave, cantidad, total)
+        VALUES ('{dimension}', {fecha}, {clave}, 1, {fila}.monto)
+        ON CONFLICT (dimension, fecha, clave) DO UPDATE
+            SET cantidad = cantidad + 1, total = total + excluded.total;""")
+            else:
+                donde = f"dimension = '{dimension}' AND fecha = {fecha} AND clave = {clave}"
+                sentencias.append(f"""
+        UPDATE {tabla} SET cantidad = cantidad - 1, total = total - {fila}.monto WHERE {donde};
+        DELETE FROM {tabla} WHERE {donde} AND cantidad <= 0;""")
+    return "".join(sentencias)
+
+
+@migracion(repositorio.DB_ADIDAS, 7, "resúmenes diarios y mensuales de compras por proveedor y cliente")
+def _resumenes_compras(conexion, progreso):
+    # El tablero de análisis lee estos resúmenes en lugar de hacer SUM(monto) GROUP BY
+    # sobre toda la tabla de compras. Los mantienen los triggers, compra por compra.
+    for tabla, _ in RESUMENES_COMPRAS:
+        conexion.execute(f"""
+        CREATE TABLE IF NOT EXISTS {tabla} (
+            dimension TEXT NOT NULL,   -- 'proveedor' o 'cliente'
+            fecha TEXT NOT NULL,       -- día (YYYY-MM-DD) o mes (YYYY-MM)
+            clave TEXT NOT NULL,       -- el proveedor o el cliente
+            cantidad INTEGER NOT NULL,
+            total REAL NOT NULL,
+            PRIMARY KEY (dimension, fecha, clave)
+        ) WITHOUT ROWID;
+        """)
+
+    # Los triggers suman cada compra nueva, borrada o modificada a partir de ahora
+    conexion.executescript(f"""
+    CREATE TRIGGER IF NOT EXISTS compras_resumen_insertar AFTER INSERT ON compras BEGIN{_sumar_en_resumenes('new', 1)}
+    END;
+    CREATE TRIGGER IF NOT EXISTS compras_resumen_borrar AFTER DELETE ON compras BEGIN{_sumar_en_resumenes('old', -1)}
+    END;
+    CREATE TRIGGER IF NOT EXISTS compras_resumen_actualizar AFTER UPDATE OF fecha, proveedor, cliente, monto ON compras BEGIN{_sumar_en_resumenes('old', -1)}{_sumar_en_resumenes('new', 1)}
+    END;
+    """)
+    # Las compras existentes se resumen por lotes hasta el último id de ahora; las
+    # posteriores ya las cuenta el trigger
+    for tabla, _ in RESUMENES_COMPRAS:
+        conexion.execute(f"DELETE FROM {tabla};")
+    tope = conexion.execute("SELECT COALESCE(MAX(id), 0) FROM compras;").fetchone()[0]
+    conexion.commit()
+
+    total = conexion.execute("SELECT COUNT(*) FROM compras WHERE id <= ?;", (tope,)).fetchone()[0]
+    hechas = 0
+    desde = 0
+    while desde < tope:
+        hasta = conexion.execute(
+            "SELECT MAX(id) FROM (SELECT id FROM compras WHERE id > ? AND id <= ? ORDER BY id LIMIT ?);",
+            (desde, tope, TAMANO_LOTE),
+        ).fetchone()[0]
+        if hasta is None:
+            break
+        for tabla, periodo in RESUMENES_COMPRAS:
+            fecha = periodo.format(fila="compras")
+            for dimension in DIMENSIONES_RESUMEN:
+                conexion.execute(f"""
+                INSERT INTO {tabla} (dimension, fecha, clave, cantidad, total)
+                SELECT '{dimension}', {fecha}, COALESCE({dimension}, ''), COUNT(*), TOTAL(monto)
+                FROM compras WHERE id > ? AND id <= ?
+                GROUP BY 2, 3
+                ON CONFLICT (dimension, fecha, clave) DO UPDATE
+                    SET cantidad = cantidad + excluded.cantidad, total = total + excluded.total;
+                """, (desde, hasta))
+        conexion.commit()
+        hechas += conexion.execute("SELECT COUNT(*) FROM compras WHERE id > ? AND id <= ?;", (desde, hasta)).fetchone()[0]
+        desde = hasta
+        progreso("Resumiendo 'compras'", hechas, total)
+
+
+@migracion(repositorio.DB_ADIDAS, 8, "borrado lógico de compras y empleados (deleted_at e índices parciales)")
+def _papelera_adidas(conexion, progreso):
+    agregar_papelera(conexion, "compras", {
+        f"idx_compras_{columna}": columna
+        for columna in ("fecha", "proveedor", "monto", "identificador_producto", "cliente")
+    })
+    agregar_papelera(conexion, "empleados", {
+        f"idx_empleados_{columna}": columna
+        for columna in ("nombre", "puesto", "fecha_ingreso", "sueldo", "sucursal", "fecha_de_baja")
+    })
+    # Una compra en la papelera no cuenta en los resúmenes: borrarla (UPDATE de deleted_at)
+    # la resta y restaurarla la vuelve a sumar. La compactación la borra de verdad después,
+    # y ese DELETE ya no tiene que restar nada.
+    conexion.executescript(f"""
+    DROP TRIGGER IF EXISTS compras_resumen_insertar;
+    DROP TRIGGER IF EXISTS compras_resumen_borrar;
+    DROP TRIGGER IF EXISTS compras_resumen_actualizar;
+    CREATE TRIGGER compras_resumen_insertar AFTER INSERT ON compras
+    WHEN new.deleted_at IS NULL BEGIN{_sumar_en_resumenes('new', 1)}
+    END;
+    CREATE TRIGGER compras_resumen_borrar AFTER DELETE ON compras
+    WHEN old.deleted_at IS NULL BEGIN{_sumar_en_resumenes('old', -1)}
+    END;
+    CREATE TRIGGER compras_resumen_actualizar_restar AFTER UPDATE OF fecha, proveedor, cliente, monto, deleted_at ON compras
+    WHEN old.deleted_at IS NULL BEGIN{_sumar_en_resumenes('old', -1)}
+    END;
+    CREATE TRIGGER compras_resumen_actualizar_sumar AFTER UPDATE OF fecha, proveedor, cliente, monto, deleted_at ON compras
+    WHEN new.deleted_at IS NULL BEGIN{_sumar_en_resumenes('new', 1)}
+    END;
+    """)
+
+
+# =====================================================================
+# Migraciones de produccion.db (Productos, Lotes y ControlesCalidad)
+# =====================================================================
+
+@migracion(repositorio.DB_PRODUCCION, 1, "índices de trazabilidad")
+def _indices_trazabilidad(conexion, progreso):
+    # Covering: el detalle de calidad de un lote se resuelve solo con el índice y ya ordenado
+    conexion.execute("""
+    CREATE INDEX IF NOT EXISTS idx_controles_lote_timestamp
+        ON ControlesCalidad (lote_id, timestamp DESC, parametro, valor, aprobado);
+    """)
+    # Lotes de un producto (y verificación de la FK al borrar un producto)
+    conexion.execute("CREATE INDEX IF NOT EXISTS idx_lotes_producto_sku ON Lotes (producto_sku);")
+    # Listado de lotes del más nuevo al más viejo sin ordenar en memoria
+    conexion.execute("CREATE INDEX IF NOT EXISTS idx_lotes_fecha_creacion ON Lotes (fecha_creacion DESC);")
+    # Catálogo ordenado por nombre
+    conexion.execute("CREATE INDEX IF NOT EXISTS idx_productos_nombre ON Productos (nombre);")
+
+
+migracion(repositorio.DB_PRODUCCION, 2, "puntos de control de importación CSV")(_tabla_importaciones)
+
+
+@migracion(repositorio.DB_PRODUCCION, 3, "índices para ordenar lotes por columna")
+def _indices_de_orden_produccion(conexion, progreso):
+    # El índice DESC de la v1 guarda el rowid ascendente dentro de cada fecha: ordenar por
+    # (fecha DESC, id DESC) terminaba con un ordenamiento parcial en memoria. Uno ascendente
+    # sirve para los dos sentidos.
+    conexion.execute("DROP INDEX IF EXISTS idx_lotes_fecha_creacion;")
+    conexion.execute("CREATE INDEX IF NOT EXISTS idx_lotes_fecha_creacion ON Lotes (fecha_creacion);")
+    conexion.execute("CREATE INDEX IF NOT EXISTS idx_lotes_cantidad ON Lotes (cantidad);")
+
+
+@migracion(repositorio.DB_PRODUCCION, 4, "límites de especificación por producto y parámetro")
+def _especificaciones_calidad(conexion, progreso):
+    # Límites de especificación (LIE/LSE) para calcular el Cpk en spc.py; cualquiera puede faltar
+    conexion.execute("""
+    CREATE TABLE IF NOT EXISTS EspecificacionesCalidad (
+        producto_sku TEXT NOT NULL,
+        parametro TEXT NOT NULL,
+        limite_inferior REAL,
+        limite_superior REAL,
+        PRIMARY KEY (producto_sku, parametro)
+    );
+    """)
+
+
+@migracion(repositorio.DB_PRODUCCION, 5, "resumen de controles de calidad por lote")
+def _resumen_lotes(conexion, progreso):
+    # Una fila por lote con controles: la lista de lotes la une por clave primaria en lugar
+    # de contar ControlesCalidad lote por lote. La mantienen los triggers de abajo.
+    conexion.execute("""
+    CREATE TABLE IF NOT EXISTS ResumenLotes (
+        lote_id INTEGER PRIMARY KEY,
+        mediciones INTEGER NOT NULL,
+        rechazadas INTEGER NOT NULL,
+        ultimo_control TEXT
+    );
+    """)
+    # Mientras IngestaMasiva tiene una fila, el trigger de inserción no toca ResumenLotes:
+    # data_manager.importar_mediciones suma cada bloque con un UPSERT por lote en lugar de
+    # uno por medición. La fila se agrega y se borra dentro de la transacción del bloque,
+    # así que ninguna otra conexión la ve (SQLite no deja que el trigger lea una tabla TEMP).
+    conexion.execute("CREATE TABLE IF NOT EXISTS IngestaMasiva (inicio TEXT NOT NULL);")
+    # Al borrar un control, el último se vuelve a buscar en el índice de controles por lote
+    conexion.executescript("""
+    CREATE TRIGGER IF NOT EXISTS controles_resumen_insertar AFTER INSERT ON ControlesCalidad
+    WHEN NOT EXISTS (SELECT 1 FROM IngestaMasiva) BEGIN
+        INSERT INTO ResumenLotes (lote_id, mediciones, rechazadas, ultimo_control)
+        VALUES (new.lote_id, 1, new.aprobado = 0, new.timestamp)
+        ON CONFLICT (lote_id) DO UPDATE SET
+            mediciones = mediciones + 1,
+            rechazadas = rechazadas + excluded.rechazadas,
+            ultimo_control = MAX(COALESCE(ultimo_control, ''), excluded.ultimo_control);
+    END;
+    CREATE TRIGGER IF NOT EXISTS controles_resumen_borrar AFTER DELETE ON ControlesCalidad BEGIN
+        UPDATE ResumenLotes SET
+            mediciones = mediciones - 1,
+            rechazadas = rechazadas - (old.aprobado = 0),
+            ultimo_control = (SELECT MAX(timestamp) FROM ControlesCalidad WHERE lote_id = old.lote_id)
+        WHERE lote_id = old.lote_id;
+        DELETE FROM ResumenLotes WHERE lote_id = old.lote_id AND mediciones <= 0;
+    END;
+    CREATE TRIGGER IF NOT EXISTS controles_resumen_actualizar AFTER UPDATE OF lote_id, aprobado, timestamp ON ControlesCalidad BEGIN
+        UPDATE ResumenLotes SET
+            mediciones = mediciones - 1,
+            rechazadas = rechazadas - (old.aprobado = 0),
+            ultimo_control = (SELECT MAX(timestamp) FROM ControlesCalidad WHERE lote_id = old.lote_id AND id <> old.id)
+        WHERE lote_id = old.lote_id;
+        DELETE FROM ResumenLotes WHERE lote_id = old.lote_id AND mediciones <= 0;
+        INSERT INTO ResumenLotes (lote_id, mediciones, rechazadas, ultimo_control)
+        VALUES (new.lote_id, 1, new.aprobado = 0, new.timestamp)
+        ON CONFLICT (lote_id) DO UPDATE SET
+            mediciones = mediciones + 1,
+            rechazadas = rechazadas + excluded.rechazadas,
+            ultimo_control = MAX(COALESCE(ultimo_control, ''), excluded.ultimo_control);
+    END;
+    CREATE TRIGGER IF NOT EXISTS lotes_resumen_borrar AFTER DELETE ON Lotes BEGIN
+        DELETE FROM ResumenLotes WHERE lote_id = old.id;
+    END;
+    """)
+
+    # Los controles existentes se resumen por rangos de lote, solo hasta el último id de
+    # ahora: los posteriores ya los sumó el trigger
+    conexion.execute("DELETE FROM ResumenLotes;")
+    tope = conexion.execute("SELECT COALESCE(MAX(id), 0) FROM ControlesCalidad;").fetchone()[0]
+    conexion.commit()
+
+    total = conexion.execute("SELECT COUNT(*) FROM Lotes;").fetchone()[0]
+    hechos = 0
+    desde = 0
+    while True:
+        hasta = conexion.execute(
+            "SELECT MAX(id) FROM (SELECT id FROM Lotes WHERE id > ? ORDER BY id LIMIT ?);", (desde, TAMANO_LOTE)
+        ).fetchone()[0]
+        if hasta is None:
+            break
+        conexion.execute("""
+            INSERT INTO ResumenLotes (lote_id, mediciones, rechazadas, ultimo_control)
+            SELECT lote_id, COUNT(*), SUM(aprobado = 0), MAX(timestamp)
+            FROM ControlesCalidad
+            WHERE lote_id > ? AND lote_id <= ? AND id <= ?
+            GROUP BY lote_id
+            ON CONFLICT (lote_id) DO UPDATE SET
+                mediciones = mediciones + excluded.mediciones,
+                rechazadas = rechazadas + excluded.rechazadas,
+                ultimo_control = MAX(COALESCE(ultimo_control, ''), excluded.ultimo_control);
+        """, (desde, hasta, tope))
+        conexion.commit()
+        hechos += conexion.execute("SELECT COUNT(*) FROM Lotes WHERE id > ? AND id <= ?;", (desde, hasta)).fetchone()[0]
+        desde = hasta
+        progreso("Resumiendo 'ControlesCalidad'", hechos, total)
+
+
+
+@migracion(repositorio.DB_PRODUCCION, 6, "índice de controles por (lote, timestamp, id) para paginar el detalle")
+def _indice_controles_por_lote(conexion, progreso):
+    # El detalle de calidad se pagina por (timestamp, id) dentro de un lote. En el índice de la
+    # v1 el rowid quedaba detrás de parámetro/valor/aprobado y no desempataba los timestamps
+    # repetidos; con id como columna explícita el mismo índice (sigue cubriendo SPC y el
+    # resumen por lote) sirve para las dos direcciones sin ordenar en memoria.
+    conexion.execute("DROP INDEX IF EXISTS idx_controles_lote_timestamp;")
+    conexion.execute("""
+    CREATE INDEX IF NOT EXISTS idx_controles_lote_timestamp_id
+        ON ControlesCalidad (lote_id, timestamp, id, parametro, valor, aprobado);
+    """)
+
+@migracion(repositorio.DB_PRODUCCION, 7, "resumen de calidad por producto")
+def _resumen_productos(conexion, progreso):
+    # Una fila por SKU con lotes: los reportes de reportes.py la buscan por clave primaria en
+    # lugar de agregar Lotes + ResumenLotes completos en cada consulta. Los lotes los suman y
+    # restan los triggers de Lotes; las mediciones, los de ResumenLotes (a través del lote).
+    conexion.execute("""
+    CREATE TABLE IF NOT EXISTS ResumenProductos (
+        sku TEXT PRIMARY KEY,
+        lotes INTEGER NOT NULL,
+        lotes_con_rechazos INTEGER NOT NULL,
+        mediciones INTEGER NOT NULL,
+        rechazadas INTEGER NOT NULL
+    ) WITHOUT ROWID;
+    """)
+    # Al borrar un lote, su trigger resta lo que aportaba su fila de ResumenLotes y recién
+    # después la borra; el trigger de borrado de ResumenLotes ya no encuentra el lote y no
+    # resta dos veces.
+    conexion.executescript("""
+    CREATE TRIGGER IF NOT EXISTS lotes_resumen_producto_insertar AFTER INSERT ON Lotes BEGIN
+        INSERT INTO ResumenProductos (sku, lotes, lotes_con_rechazos, mediciones, rechazadas)
+        VALUES (new.producto_sku, 1, 0, 0, 0)
+        ON CONFLICT (sku) DO UPDATE SET lotes = lotes + 1;
+    END;
+    DROP TRIGGER IF EXISTS lotes_resumen_borrar;
+    CREATE TRIGGER lotes_resumen_borrar AFTER DELETE ON Lotes BEGIN
+        UPDATE ResumenProductos SET
+            lotes = lotes - 1,
+            lotes_con_rechazos = lotes_con_rechazos - IFNULL((SELECT rechazadas > 0 FROM ResumenLotes WHERE lote_id = old.id), 0),
+            mediciones = mediciones - IFNULL((SELECT mediciones FROM ResumenLotes WHERE lote_id = old.id), 0),
+            rechazadas = rechazadas - IFNULL((SELECT rechazadas FROM ResumenLotes WHERE lote_id = old.id), 0)
+        WHERE sku = old.producto_sku;
+        DELETE FROM ResumenProductos WHERE sku = old.producto_sku AND lotes <= 0;
+        DELETE FROM ResumenLotes WHERE lote_id = old.id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS lotes_resumen_producto_mover AFTER UPDATE OF producto_sku ON Lotes BEGIN
+        UPDATE ResumenProductos SET
+            lotes = lotes - 1,
+            lotes_con_rechazos = lotes_con_rechazos - IFNULL((SELECT rechazadas > 0 FROM ResumenLotes WHERE lote_id = old.id), 0),
+            mediciones = mediciones - IFNULL((SELECT mediciones FROM ResumenLotes WHERE lote_id = old.id), 0),
+            rechazadas = rechazadas - IFNULL((SELECT rechazadas FROM ResumenLotes WHERE lote_id = old.id), 0)
+        WHERE sku = old.producto_sku;
+        DELETE FROM ResumenProductos WHERE sku = old.producto_sku AND lotes <= 0;
+        INSERT INTO ResumenProductos (sku, lotes, lotes_con_rechazos, mediciones, rechazadas)
+        VALUES (new.producto_sku, 1,
+                IFNULL((SELECT rechazadas > 0 FROM ResumenLotes WHERE lote_id = new.id), 0),
+                IFNULL((SELECT mediciones FROM ResumenLotes WHERE lote_id = new.id), 0),
+                IFNULL((SELECT rechazadas FROM ResumenLotes WHERE lote_id = new.id), 0))
+        ON CONFLICT (sku) DO UPDATE SET
+            lotes = lotes + 1,
+            lotes_con_rechazos = lotes_con_rechazos + excluded.lotes_con_rechazos,
+            mediciones = mediciones + excluded.mediciones,
+            rechazadas = rechazadas + excluded.rechazadas;
+    END;
+    CREATE TRIGGER IF NOT EXISTS resumen_lotes_producto_insertar AFTER INSERT ON ResumenLotes BEGIN
+        UPDATE ResumenProductos SET
+            lotes_con_rechazos = lotes_con_rechazos + (new.rechazadas > 0),
+            mediciones = mediciones + new.mediciones,
+            rechazadas = rechazadas + new.rechazadas
+        WHERE sku = (SELECT producto_sku FROM Lotes WHERE id = new.lote_id);
+    END;
+    CREATE TRIGGER IF NOT EXISTS resumen_lotes_producto_actualizar AFTER UPDATE OF mediciones, rechazadas ON ResumenLotes BEGIN
+        UPDATE ResumenProductos SET
+            lotes_con_rechazos = lotes_con_rechazos + (new.rechazadas > 0) - (old.rechazadas > 0),
+            mediciones = mediciones + new.mediciones - old.mediciones,
+            rechazadas = rechazadas + new.rechazadas - old.rechazadas
+        WHERE sku = (SELECT producto_sku FROM Lotes WHERE id = new.lote_id);
+    END;
+    CREATE TRIGGER IF NOT EXISTS resumen_lotes_producto_borrar AFTER DELETE ON ResumenLotes BEGIN
+        UPDATE ResumenProductos SET
+            lotes_con_rechazos = lotes_con_rechazos - (old.rechazadas > 0),
+            mediciones = mediciones - old.mediciones,
+            rechazadas = rechazadas - old.rechazadas
+        WHERE sku = (SELECT producto_sku FROM Lotes WHERE id = old.lote_id);
+    END;
+    """)
+    # Los lotes existentes se resumen en una pasada por idx_lotes_producto_sku (una fila por
+    # lote, no por medición); la migración corre antes de que la app escriba en la DB
+    conexion.execute("DELETE FROM ResumenProductos;")
+    conexion.execute("""
+        INSERT INTO ResumenProductos (sku, lotes, lotes_con_rechazos, mediciones, rechazadas)
+        SELECT L.producto_sku, COUNT(*), IFNULL(SUM(R.rechazadas > 0), 0),
+               IFNULL(SUM(R.mediciones), 0), IFNULL(SUM(R.rechazadas), 0)
+        FROM Lotes L
+        LEFT JOIN ResumenLotes R ON R.lote_id = L.id
+        GROUP BY L.producto_sku;
+    """)
+    total = conexion.execute("SELECT COUNT(*) FROM ResumenProductos;").fetchone()[0]
+    progreso("Resumiendo 'Lotes' por producto", total, total)
+
+
+@migracion(repositorio.DB_PRODUCCION, 8, "borrado lógico de productos (deleted_at e índice parcial)")
+def _papelera_produccion(conexion, progreso):
+    # Un producto borrado sigue existiendo para sus lotes (la FK por SKU no queda colgada);
+    # solo desaparece del catálogo. El UNIQUE de sku no se toca: la FK lo necesita.
+    agregar_papelera(conexion, "Productos", {"idx_productos_nombre": "nombre"})
+
+
+def main(argumentos):
+    # Los módulos registran su esquema base (versión 0) al importarse
+    import servicios.compras, servicios.empleados, servicios.produccion  # noqa: F401
+
+    solo_estado = "--estado" in argumentos
+    for db_path, lista in MIGRACIONES.items():
+        if solo_estado:
+            conexion = sqlite3.connect(db_path)
+        else:
+            # Abrir la conexión del repositorio ya aplica las migraciones pendientes
+            conexion = repositorio.obtener_conexion(db_path)
+        ultima = lista[-1][0] if lista else 0
+        print(f"'{db_path}': versión {version_actual(conexion)} (última disponible: {ultima})")
+        if solo_estado:
+            conexion.close()
+    repositorio.cerrar_todas()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,78 @@
+import repositorio
+
+
+class GestorPantallas:
+    """
+    Construye cada pantalla de módulo una sola vez y después solo la oculta y la muestra.
+
+    Cada pantalla es un objeto con un `frame` empaquetado en la ventana y un método
+    `refrescar()`. Al ocultarla se guarda la versión de datos de su DB
+    (`repositorio.version_datos`); al volver, solo se recargan los datos si esa versión
+    cambió. Los cambios que hace la propia pantalla mientras está visible ya se reflejan
+    en sus tablas, por eso no cuentan.
+    """
+    def __init__(self, root):
+        self.root = root
+        self._fabricas = {}        # nombre -> (fabrica(), db_path)
+        self._pantallas = {}       # nombre -> pantalla ya construida
+        self._opciones_pack = {}   # nombre -> opciones de pack originales del frame
+        self._versiones = {}       # nombre -> versión de datos al ocultarse
+        self.actual = None
+
+    def registrar(self, nombre, fabrica, db_path=None):
+        """
+        Registra cómo construir una pantalla.
+        Args:
+            nombre (str): Clave de la pantalla.
+            fabrica (callable): Crea la pantalla (sin argumentos); se llama una sola vez.
+            db_path (str): DB cuyos cambios obligan a refrescar la pantalla, o None.
+        """
+        self._fabricas[nombre] = (fabrica, db_path)
+
+    def mostrar(self, nombre):
+        """Oculta la pantalla actual y muestra `nombre`, construyéndola si es la primera vez."""
+        self.ocultar_actual()
+
+        pantalla = self._pantallas.get(nombre)
+        if pantalla is None:
+            fabrica, _ = self._fabricas[nombre]
+            pantalla = fabrica()
+            self._pantallas[nombre] = pantalla
+            # El frame se empaquetó solo al construirse: se guardan sus opciones para re-empaquetarlo
+            opciones = pantalla.frame.pack_info()
+            opciones.pop("in", None)
+            self._opciones_pack[nombre] = opciones
+        else:
+            pantalla.frame.pack(**self._opciones_pack[nombre])
+            if self._datos_cambiaron(nombre):
+                pantalla.refrescar()
+
+        # El fondo pudo quedar por encima del frame al cambiar de pantalla
+        pantalla.frame.lift()
+        self.actual = nombre
+        return pantalla
+
+    def ocultar_actual(self):
+        """Oculta la pantalla visible (sin destruirla) y anota la versión de sus datos."""
+        if self.actual is None:
+            return
+        _, db_path = self._fabricas[self.actual]
+        if db_path is not None:
+            self._versiones[self.actual] = repositorio.version_datos(db_path)
+        self._pantallas[self.actual].frame.pack_forget()
+        self.actual = None
+
+    def es_de_pantalla(self, widget):
+        """Indica si `widget` es el frame de una pantalla guardada (no se debe destruir)."""
+        return any(pantalla.frame is widget for pantalla in self._pantallas.values())
+
+    def _datos_cambiaron(self, nombre):
+        _, db_path = self._fabricas[nombre]
+        if db_path is None:
+            return False
+        try:
+            return repositorio.version_datos(db_path) != self._versiones.get(nombre)
+        except Exception as e:
+            # Ante la duda, recargar
+            print(f"Error al consultar la versión de '{db_path}': {e}")
+            return True
@@ -0,0 +1,216 @@
+"""
+Borrado lógico (papelera) de compras, empleados y productos.
+
+Borrar una fila ya no es un DELETE: se marca con `deleted_at` (fecha y hora del borrado),
+un UPDATE en el lugar. Las consultas de la UI filtran `deleted_at IS NULL` y los índices
+de esas tablas son parciales sobre esa condición (migración 8 de adidas.db y de
+produccion.db), así que las filas borradas no pesan en los listados.
+
+Los últimos borrados de cada tabla quedan en una pila para deshacerlos. La compactación
+borra de verdad, por lotes y en el hilo de la DB, las filas que llevan más de
+`RETENCION_DIAS` en la papelera.
+
+Uso (desde la raíz del proyecto):
+    python papelera.py            # compacta ahora las filas borradas hace más de RETENCION_DIAS
+    python papelera.py --dias 0   # vacía la papelera por completo
+"""
+import argparse
+from collections import deque, namedtuple
+from datetime import datetime, timedelta
+
+import repositorio
+
+# Tablas con papelera -> archivo de base de datos
+DB_DE_TABLA = {
+    "compras": repositorio.DB_ADIDAS,
+    "empleados": repositorio.DB_ADIDAS,
+    "Productos": repositorio.DB_PRODUCCION,
+}
+# Condición extra para poder borrar de verdad una fila: un producto con lotes se queda
+# (los lotes lo referencian por SKU), aunque esté en la papelera
+CONDICION_COMPACTAR = {
+    "Productos": "NOT EXISTS (SELECT 1 FROM Lotes L WHERE L.producto_sku = Productos.sku)",
+}
+
+# Días que una fila borrada se puede recuperar antes de que la compactación la elimine
+RETENCION_DIAS = 30
+# Borrados que recuerda la pila de deshacer de cada tabla
+MAX_DESHACER = 20
+# Filas por transacción de la compactación, y pausa entre lotes para no acaparar el hilo de la DB
+TAMANO_LOTE_COMPACTACION = 500
+PAUSA_COMPACTACION_MS = 200
+
+# Sentencias por tabla, declaradas aquí para que `diagnostico.py` revise su plan en la DB de cada una.
+# Borrar y restaurar buscan por id; deshacer y compactar, por el índice parcial de las borradas
+# (idx_<tabla>_borrados)
+SQL_BORRAR = {tabla: f"UPDATE {tabla} SET deleted_at = ? WHERE id = ? AND deleted_at IS NULL;"
+              for tabla in DB_DE_TABLA}
+SQL_BORRADOS_CON_MARCA = {tabla: f"SELECT id FROM {tabla} WHERE deleted_at = ?;" for tabla in DB_DE_TABLA}
+SQL_RESTAURAR = {tabla: f"UPDATE {tabla} SET deleted_at = NULL WHERE id = ?;" for tabla in DB_DE_TABLA}
+
+
+def _sql_compactar(tabla):
+    condicion = CONDICION_COMPACTAR.get(tabla)
+    extra = f" AND {condicion}" if condicion else ""
+    return f"""
+    DELETE FROM {tabla} WHERE id IN (
+        SELECT id FROM {tabla} WHERE deleted_at IS NOT NULL AND deleted_at < ?{extra} LIMIT ?
+    );"""
+
+
+SQL_COMPACTAR = {tabla: _sql_compactar(tabla) for tabla in DB_DE_TABLA}
+
+# Un borrado: las filas `ids` de `tabla`, marcadas con deleted_at = `marca`
+Borrado = namedtuple("Borrado", "tabla ids marca")
+
+
+def _marca_actual():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+class PilaDeshacer:
+    """Los últimos borrados de cada tabla, del más nuevo al más viejo (se usa desde el hilo de Tk)."""
+    def __init__(self, maximo=MAX_DESHACER):
+        self._pilas = {}
+        self.maximo = maximo
+
+    def apilar(self, borrado):
+        self._pilas.setdefault(borrado.tabla, deque(maxlen=self.maximo)).append(borrado)
+
+    def ultimo(self, tabla):
+        """Devuelve el último borrado de `tabla` sin quitarlo de la pila, o None si no hay."""
+        pila = self._pilas.get(tabla)
+        return pila[-1] if pila else None
+
+    def quitar(self, borrado):
+        """Quita `borrado` de la pila de su tabla (si todavía está)."""
+        pila = self._pilas.get(borrado.tabla)
+        if pila and borrado in pila:
+            pila.remove(borrado)
+
+    def cantidad(self, tabla):
+        return len(self._pilas.get(tabla, ()))
+
+
+# Pila única de la aplicación
+pila = PilaDeshacer()
+
+
+def borrar(tabla, ids):
+    """
+    Manda a la papelera las filas `ids` de `tabla` y apila el borrado. Todas van en un
+    solo executemany (un UPDATE de deleted_at por id) dentro de una transacción.
+    Returns:
+        int: Filas borradas (las que ya estaban en la papelera no cuentan).
+    """
+    ids = [int(i) for i in ids]
+    marca = _marca_actual()
+    with repositorio.transaccion(DB_DE_TABLA[tabla]) as cursor:
+        cursor.executemany(SQL_BORRAR[tabla], ((marca, i) for i in ids))
+        borradas = cursor.rowcount
+    if borradas:
+        pila.apilar(Borrado(tabla, tuple(ids), marca))
+    return borradas
+
+
+def deshacer(tabla):
+    """
+    Restaura el último borrado de `tabla`.
+    Returns:
+        list: Ids restaurados (vacía si no había nada que deshacer o la compactación ya
+        eliminó esas filas).
+    """
+    # El borrado sale de la pila recién después del commit: si la transacción falla, se
+    # puede volver a intentar
+    borrado = pila.ultimo(tabla)
+    if borrado is None:
+        return []
+    with repositorio.transaccion(DB_DE_TABLA[tabla]) as cursor:
+        # Solo vuelven las filas de ese borrado: la marca distingue un borrado posterior de
+        # las mismas filas. La búsqueda por marca usa el índice de las borradas.
+        cursor.execute(SQL_BORRADOS_CON_MARCA[tabla], (borrado.marca,))
+        ids_borrado = set(borrado.ids)
+        ids = [fila[0] for fila in cursor.fetchall() if fila[0] in ids_borrado]
+        cursor.executemany(SQL_RESTAURAR[tabla], ((i,) for i in ids))
+    pila.quitar(borrado)
+    return ids
+
+
+def compactar_lote(conexion, tabla, antes_de, tamano_lote=TAMANO_LOTE_COMPACTACION):
+    """
+    Elimina de verdad hasta `tamano_lote` filas de `tabla` borradas antes de `antes_de`,
+    en una transacción. Busca por el índice parcial de las borradas (idx_<tabla>_borrados).
+    Returns:
+        int: Filas eliminadas (menos que `tamano_lote` significa que no quedan más).
+    """
+    with conexion:
+        cursor = conexion.execute(SQL_COMPACTAR[tabla], (antes_de, tamano_lote))
+    return cursor.rowcount
+
+
+def limite_retencion(dias=RETENCION_DIAS):
+    """Marca de tiempo antes de la cual una fila borrada ya se puede eliminar."""
+    return (datetime.now() - timedelta(days=dias)).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def programar_compactacion(root, dias=RETENCION_DIAS, al_terminar=None):
+    """
+    Compacta la papelera de todas las tablas en segundo plano: un lote por pedido al
+    EjecutorDB de cada archivo, con una pausa entre lotes para que las lecturas de las
+    pantallas no esperen detrás de una compactación larga.
+    Args:
+        al_terminar (callable): Recibe {tabla: filas eliminadas} cuando terminaron todas.
+    """
+    # Importación diferida: la línea de comandos de este módulo no necesita Tk
+    from ejecutor_db import obtener_ejecutor
+
+    antes_de = limite_retencion(dias)
+    eliminadas = dict.fromkeys(DB_DE_TABLA, 0)
+    pendientes = set(DB_DE_TABLA)
+
+    def enviar(tabla):
+        obtener_ejecutor(root, DB_DE_TABLA[tabla]).enviar(
+            compactar_lote, tabla, antes_de,
+            al_terminar=lambda cantidad: lote_hecho(tabla, cantidad),
+            al_fallar=lambda e: lote_hecho(tabla, 0, e),
+        )
+
+    def lote_hecho(tabla, cantidad, error=None):
+        eliminadas[tabla] += cantidad
+        if error is not None:
+            print(f"Error al compactar la papelera de '{tabla}': {error}")
+        elif cantidad == TAMANO_LOTE_COMPACTACION:
+            # Lote completo: puede haber más, se sigue después de la pausa
+            root.after(PAUSA_COMPACTACION_MS, lambda: enviar(tabla))
+            return
+        pendientes.discard(tabla)
+        if not pendientes and al_terminar:
+            al_terminar(eliminadas)
+
+    for tabla in DB_DE_TABLA:
+        enviar(tabla)
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Elimina las filas que llevan más de N días en la papelera.")
+    parser.add_argument("--dias", type=int, default=RETENCION_DIAS, help="Días de retención.")
+    args = parser.parse_args(argumentos)
+
+    # Los módulos registran su esquema base al importarse
+    import servicios.compras, servicios.empleados, servicios.produccion  # noqa: F401
+
+    antes_de = limite_retencion(args.dias)
+    for tabla, db_path in DB_DE_TABLA.items():
+        conexion = repositorio.obtener_conexion(db_path)
+        total = 0
+        while True:
+            cantidad = compactar_lote(conexion, tabla, antes_de)
+            total += cantidad
+            if cantidad < TAMANO_LOTE_COMPACTACION:
+                break
+        print(f"'{tabla}': {total} filas eliminadas de la papelera.")
+    repositorio.cerrar_todas()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Medición del arranque de la aplicación.
+
+Uso (desde la raíz del proyecto):
+    python main.py --profile-startup
+
+Abre la aplicación, dibuja el login y recorre cada módulo una vez, midiendo cuánto
+tarda en importarse, en configurar su base de datos y en dibujarse por primera vez.
+Sale con código 1 si el login tarda más que PRESUPUESTO_ARRANQUE_MS en aparecer.
+"""
+import time
+from contextlib import contextmanager
+
+# Tiempo máximo (ms) desde que arranca el proceso hasta que se ve el login
+PRESUPUESTO_ARRANQUE_MS = 1500
+
+
+class PerfilArranque:
+    """Acumula tiempos por módulo y etapa (importación, construcción, primer dibujo...)."""
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.tiempos = {}  # módulo -> {etapa: segundos}, en orden de llegada
+
+    @contextmanager
+    def medir(self, modulo, etapa):
+        """Mide el bloque `with` y lo suma a (modulo, etapa)."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(modulo, etapa, time.perf_counter() - inicio)
+
+    def registrar(self, modulo, etapa, segundos):
+        etapas = self.tiempos.setdefault(modulo, {})
+        etapas[etapa] = etapas.get(etapa, 0.0) + segundos
+
+    def desde_inicio(self):
+        """Segundos transcurridos desde que se importó este módulo (inicio del proceso)."""
+        return time.perf_counter() - self.inicio
+
+    def informe(self, tiempos_db=None):
+        """Devuelve el informe de tiempos como texto."""
+        lineas = ["Perfil de arranque (ms):"]
+        for modulo, etapas in self.tiempos.items():
+            detalle = ", ".join(f"{etapa} {segundos * 1000:.1f}" for etapa, segundos in etapas.items())
+            lineas.append(f"  {modulo:<12} {detalle}")
+        for db_path, segundos in (tiempos_db or {}).items():
+            lineas.append(f"  {db_path:<12} esquema y migraciones {segundos * 1000:.1f}")
+        return "\n".join(lineas)
+
+
+# Perfil único del proceso: se crea al importar main.py, antes que el resto de los módulos
+perfil = PerfilArranque()
@@ -1,8 +1,18 @@
 import tkinter as tk
 import sqlite3
-from tkinter import ttk, messagebox
-from datetime import datetime
+from functools import partial
+from tkinter import ttk, messagebox, filedialog
 import os # Necesario para eliminar la DB en el ejemplo de demostración (opcional)
+from tablas import TablaPaginada, OrdenTabla
+from ejecutor_db import obtener_ejecutor
+from escritor_db import obtener_escritor
+import repositorio
+import data_manager
+import spc
+# Esquema, consultas y validación viven en la capa de datos (sin Tkinter): esta pantalla
+# solo lee los campos, llama al servicio y muestra el resultado
+from servicios import Producto, Lote, ControlCalidad, DatosInvalidos
+from servicios import produccion as servicio
 
 # Importaciones de estilo (asumo que siguen existiendo, aunque no me pasaste el archivo 'estilos.py')
 # from estilos import BG_MODULO, FG_PRIMARY, COLOR_ACCENT, FONT_BASE, FONT_BUTTON, add_logo_header
@@ -22,67 +32,6 @@ def add_logo_header(frame, title):
 # -------------------------------------------------------------------
 
 
-# Nombre del archivo de la base de datos
-DB_NAME = 'produccion.db' 
-
-# === Manejo Global de la Conexión y Base de Datos ===
-
-conexion = None 
-
-try:
-    # Intenta establecer la conexión con la DB (Usando 'produccion.db')
-    conexion = sqlite3.connect(DB_NAME)
-    # Configurar para obtener filas como diccionarios/objetos
-    conexion.row_factory = sqlite3.Row 
-    print(f"Conexión a SQLite '{DB_NAME}' establecida con éxito.")
-except sqlite3.Error as e:
-    print(f"Error al conectar a SQLite: {e}")
-    # Si la conexión falla, la aplicación no debería continuar
-    
-
-def iniciar_db(conn):
-    """Crea las tablas Producto, Lote y Control de Calidad si no existen."""
-    cursor = conn.cursor()
-    
-    # 1. Tabla de Productos (Modelado: SKU es clave única)
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS Productos (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        nombre TEXT NOT NULL,
-        sku TEXT NOT NULL UNIQUE
-    );
-    """)
-
-    # 2. Tabla de Lotes (Modelado: FK a Productos)
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS Lotes (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        producto_sku TEXT NOT NULL,
-        cantidad INTEGER NOT NULL,
-        fecha_creacion TEXT NOT NULL,
-        FOREIGN KEY (producto_sku) REFERENCES Productos (sku)
-    );
-    """)
-    
-    # 3. Tabla de Controles de Calidad (Modelado: FK a Lotes)
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS ControlesCalidad (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        lote_id INTEGER NOT NULL,
-        parametro TEXT NOT NULL,
-        valor REAL NOT NULL,
-        aprobado INTEGER NOT NULL, -- 0=Falso, 1=Verdadero
-        timestamp TEXT NOT NULL,
-        FOREIGN KEY (lote_id) REFERENCES Lotes (id)
-    );
-    """)
-    conn.commit()
-    print("Tablas 'Productos', 'Lotes' y 'ControlesCalidad' verificadas/creadas.")
-
-# Aseguramos la inicialización de las tablas al iniciar la conexión
-if conexion:
-    iniciar_db(conexion)
-
 # ======================================================
 
 
@@ -101,9 +50,15 @@ class ProduccionUI:
         self.frame.pack(fill="both", expand=True) 
 
         self.volver_callback = volver_callback
+        # Las lecturas corren en un hilo aparte: la pantalla se dibuja sin esperar a la DB
+        self.ejecutor = obtener_ejecutor(root, servicio.DB_NAME)
+        # Las altas se confirman agrupadas en ese mismo hilo (group commit)
+        self.escritor = obtener_escritor(root, servicio.DB_NAME)
+        # Lotes con mediciones recién confirmadas, para refrescar una sola vez por grupo
+        self._lotes_medidos = set()
         self.crear_ui()
         
-        # Cargar datos iniciales
+        # Pedir datos iniciales (las tablas se rellenan cuando llegan)
         self.cargar_productos_en_tabla()
         self.cargar_lotes_en_tabla()
 
@@ -130,6 +85,13 @@ class ProduccionUI:
         self.notebook.add(self.frame_lotes, text=" Lotes y Calidad ")
         self.crear_ui_lotes(self.frame_lotes)
 
+        # ---------------------------
+        # PESTAÑA 3: CONTROL ESTADÍSTICO (SPC)
+        # ---------------------------
+        self.frame_spc = ttk.Frame(self.notebook, style="Modulo.TFrame")
+        self.notebook.add(self.frame_spc, text=" Control Estadístico ")
+        self.crear_ui_spc(self.frame_spc)
+
         # Botón para volver (IMPORTANTE: Usa self.volver_callback)
         ttk.Button(self.frame, text="< Volver al Menú Principal", command=self.volver_callback, style="Modulo.TButton").pack(pady=20, ipadx=10)
     
@@ -154,83 +116,126 @@ class ProduccionUI:
         button_container = ttk.Frame(parent_frame, style="Modulo.TFrame") 
         button_container.pack(pady=10)
         ttk.Button(button_container, text="Agregar Producto", command=self.agregar_producto, style="Modulo.TButton").pack(side=tk.LEFT, padx=10, ipadx=10)
-        ttk.Button(button_container, text="Borrar Seleccionado", command=self.borrar_producto, style="Modulo.TButton").pack(side=tk.LEFT, padx=10, ipadx=10)
+        ttk.Button(button_container, text="Borrar Seleccionados", command=self.borrar_producto, style="Modulo.TButton").pack(side=tk.LEFT, padx=10, ipadx=10)
+        ttk.Button(button_container, text="Deshacer Borrado", command=self.deshacer_borrado_producto, style="Modulo.TButton").pack(side=tk.LEFT, padx=10, ipadx=10)
 
         # Tabla de Productos
         columns = ("ID", "Nombre", "SKU")
         table_frame = ttk.Frame(parent_frame, style="Modulo.TFrame") 
         table_frame.pack(pady=10, fill="both", expand=True, padx=20)
         
-        self.tabla_productos = ttk.Treeview(table_frame, columns=columns, show="headings")
+        # Selección de varias filas (Ctrl/Shift + clic) para borrar en bloque
+        self.tabla_productos = ttk.Treeview(table_frame, columns=columns, show="headings", selectmode="extended")
         self.tabla_productos.column("ID", width=50, anchor=tk.CENTER)
         for col in columns:
             self.tabla_productos.heading(col, text=col)
-            
+
+        # La scrollbar también avisa cuándo pedir la página siguiente
+        vsb = ttk.Scrollbar(table_frame, orient="vertical", command=self.tabla_productos.yview)
+        vsb.pack(side='right', fill='y')
         self.tabla_productos.pack(side='left', fill="both", expand=True)
-        # Scrollbar opcional...
+
+        # Los encabezados ordenan en SQL; el orden elegido se conserva mientras viva la pantalla
+        self.orden_productos = OrdenTabla(self.tabla_productos, servicio.COLUMNAS_ORDEN_PRODUCTOS,
+                                          self.cargar_productos_en_tabla, "Nombre")
+        self.paginador_productos = TablaPaginada(self.tabla_productos, vsb, self._pagina_productos(), self.ejecutor,
+                                                 al_fallar=self._error_carga_productos)
 
     def agregar_producto(self):
         """Inserta un nuevo producto en la tabla Productos."""
-        nombre = self.prod_nombre_entry.get()
-        sku = self.prod_sku_entry.get().upper() # Usar mayúsculas para SKU
-
-        if not all([nombre, sku]):
-            messagebox.showerror("Error", "El Nombre y el SKU son obligatorios.")
+        try:
+            producto = Producto.desde_formulario(self.prod_nombre_entry.get(), self.prod_sku_entry.get())
+        except DatosInvalidos as e:
+            messagebox.showerror("Error", str(e))
             return
+        nombre, sku = producto.parametros()
 
-        cursor = conexion.cursor()
-        sql_insert = "INSERT INTO Productos (nombre, sku) VALUES (?, ?);"
-        
-        try:
-            cursor.execute(sql_insert, (nombre, sku))
-            conexion.commit()
-            self.cargar_productos_en_tabla()
-            self.prod_nombre_entry.delete(0, tk.END)
-            self.prod_sku_entry.delete(0, tk.END)
+        # El catálogo es un alta crítica (los lotes dependen del SKU): se confirma enseguida
+        # con barrera de durabilidad, sin esperar al resto del grupo
+        provisoria = self.paginador_productos.insertar_pendiente(("…", nombre, sku), self.orden_productos.encabezado,
+                                                                 self.orden_productos.descendente)
+        self.prod_nombre_entry.delete(0, tk.END)
+        self.prod_sku_entry.delete(0, tk.END)
+
+        def confirmado(nuevo_id):
+            self.paginador_productos.confirmar_pendiente(provisoria, nuevo_id, (nuevo_id, nombre, sku))
             messagebox.showinfo("Éxito", f"Producto '{nombre}' (SKU: {sku}) agregado correctamente.")
 
-        except sqlite3.IntegrityError:
-            messagebox.showerror("Error de DB", f"Ya existe un producto con el SKU '{sku}'.")
-        except sqlite3.Error as e:
-            messagebox.showerror("Error de DB", f"Ocurrió un error al insertar: {e}")
+        def rechazado(e):
+            # Si el SKU ocupado es el de un producto en la papelera, se restaura con el nombre nuevo
+            try:
+                restaurado = servicio.restaurar_producto(producto) if isinstance(e, sqlite3.IntegrityError) else None
+            except sqlite3.Error as error:
+                e, restaurado = error, None
+            if restaurado is not None:
+                self.paginador_productos.confirmar_pendiente(provisoria, producto.id, (producto.id, nombre, sku))
+                messagebox.showinfo("Éxito", f"Producto '{nombre}' (SKU: {sku}) restaurado de la papelera.")
+                return
+            self.paginador_productos.quitar_pendiente(provisoria)
+            if isinstance(e, sqlite3.IntegrityError):
+                messagebox.showerror("Error de DB", f"Ya existe un producto con el SKU '{sku}'.")
+            else:
+                messagebox.showerror("Error de DB", f"Ocurrió un error al insertar: {e}")
+
+        self.escritor.escribir(servicio.SQL_INSERTAR_PRODUCTO, (nombre, sku), al_confirmar=confirmado, al_fallar=rechazado,
+                               critica=True)
 
     def borrar_producto(self):
-        """Elimina el producto seleccionado de la DB."""
-        selected_item = self.tabla_productos.selection()
-        if not selected_item:
-            messagebox.showwarning("Advertencia", "Selecciona un producto para borrar.")
+        """Manda los productos seleccionados a la papelera, todos juntos (se puede deshacer; sus lotes se conservan)."""
+        seleccionados, pendientes = self.paginador_productos.seleccion()
+        if not seleccionados:
+            if pendientes:
+                messagebox.showwarning("Advertencia", "Los productos seleccionados todavía se están guardando; intenta de nuevo en un momento.")
+            else:
+                messagebox.showwarning("Advertencia", "Selecciona uno o más productos para borrar.")
             return
 
-        item_data = self.tabla_productos.item(selected_item, 'values')
-        producto_id = item_data[0] # El ID es el primer valor
-        producto_sku = item_data[2] # El SKU es el tercer valor
-
-        if messagebox.askyesno("Confirmar Borrado", f"¿Estás seguro de borrar el producto '{producto_sku}'? (Esto puede afectar lotes asociados)"):
-            cursor = conexion.cursor()
+        # Una sola confirmación para toda la selección
+        if len(seleccionados) == 1:
+            producto_sku = self.tabla_productos.set(seleccionados[0], "SKU")
+            pregunta = f"¿Estás seguro de borrar el producto '{producto_sku}'? (Sus lotes se conservan)"
+        else:
+            pregunta = f"¿Estás seguro de borrar {len(seleccionados)} productos? (Sus lotes se conservan)"
+        if messagebox.askyesno("Confirmar Borrado", pregunta):
             try:
-                sql_delete = "DELETE FROM Productos WHERE id = ?;"
-                cursor.execute(sql_delete, (producto_id,))
-                conexion.commit()
-                self.cargar_productos_en_tabla()
-                self.cargar_lotes_en_tabla() # Recargar lotes por si se borró un SKU asociado
-                messagebox.showinfo("Éxito", f"Producto ID {producto_id} borrado correctamente.")
+                # Borrado lógico en una transacción: los productos salen del catálogo pero siguen
+                # existiendo para sus lotes (la FK por SKU no queda colgada ni impide el borrado)
+                borrados = servicio.borrar_productos(seleccionados)
+                self.paginador_productos.quitar(seleccionados)
+                messagebox.showinfo("Éxito", f"{borrados} producto(s) borrado(s). Puedes recuperarlos con 'Deshacer Borrado'.")
             except sqlite3.Error as e:
-                # Nota: SQLite permite el borrado por defecto, a menos que se use ON DELETE RESTRICT/SET NULL
                 messagebox.showerror("Error de DB", f"Ocurrió un error al borrar: {e}")
 
-    def cargar_productos_en_tabla(self):
-        """Limpia y rellena la tabla de productos con datos de la DB."""
-        for item in self.tabla_productos.get_children():
-            self.tabla_productos.delete(item)
-            
-        cursor = conexion.cursor()
+    def deshacer_borrado_producto(self):
+        """Restaura el último borrado de productos y vuelve a mostrar sus filas."""
         try:
-            cursor.execute("SELECT id, nombre, sku FROM Productos ORDER BY nombre ASC")
-            productos = cursor.fetchall()
-            for prod in productos:
-                self.tabla_productos.insert('', 'end', values=tuple(prod))
+            restaurados = servicio.deshacer_borrado()
+            if not restaurados:
+                messagebox.showinfo("Deshacer", "No hay borrados recientes de productos para deshacer.")
+                return
+            self.paginador_productos.insertar_varios(
+                [(producto.id, (producto.id,) + producto.parametros()) for producto in restaurados],
+                self.orden_productos.encabezado, self.orden_productos.descendente)
         except sqlite3.Error as e:
-            messagebox.showerror("Error de DB", f"No se pudo cargar la tabla de productos: {e}")
+            messagebox.showerror("Error de DB", f"Ocurrió un error al deshacer el borrado: {e}")
+
+    def refrescar(self):
+        """Recarga productos, lotes y estadísticas al volver a la pantalla (si la DB cambió mientras estaba oculta)."""
+        self.cargar_productos_en_tabla()
+        self.cargar_lotes_en_tabla()
+        if self.spc_sku:
+            self.calcular_spc(self.spc_sku)
+
+    def cargar_productos_en_tabla(self):
+        """Limpia la tabla de productos y pide la primera página (en el orden actual) al hilo de la DB."""
+        self.paginador_productos.cambiar_consulta(self._pagina_productos())
+
+    def _pagina_productos(self):
+        return partial(servicio.obtener_pagina_productos, columna=self.orden_productos.columna,
+                       descendente=self.orden_productos.descendente)
+
+    def _error_carga_productos(self, e):
+        messagebox.showerror("Error de DB", f"No se pudo cargar la tabla de productos: {e}")
 
     # -------------------------------------------------------------
     # ⬇️ INTERFAZ Y LÓGICA DE LOTES Y CALIDAD ⬇️
@@ -278,168 +283,343 @@ class ProduccionUI:
                         style="Modulo.TCheckbutton").grid(row=0, column=7, padx=5, pady=5)
         
         ttk.Button(calidad_frame, text="Registrar Calidad", command=self.registrar_medicion_calidad, style="Modulo.TButton").grid(row=0, column=8, padx=10, pady=5, ipadx=10)
+        # Archivos de los bancos de prueba: miles de mediciones de una vez
+        ttk.Button(calidad_frame, text="Importar Mediciones...", command=self.importar_mediciones, style="Modulo.TButton").grid(row=1, column=8, padx=10, pady=5, ipadx=10)
 
         # Tabla de Lotes (para mostrar trazabilidad y estatus)
-        columns = ("ID Lote", "SKU", "Producto", "Cantidad", "Fecha Creación")
+        columns = ("ID Lote", "SKU", "Producto", "Cantidad", "Fecha Creación",
+                   "Estado QC", "Mediciones", "Rechazadas", "Último Control")
         table_frame = ttk.Frame(parent_frame, style="Modulo.TFrame") 
         table_frame.pack(pady=10, fill="both", expand=True, padx=20)
         
-        self.tabla_lotes = ttk.Treeview(table_frame, columns=columns, show="headings")
+        # Un lote por vez: la selección muestra el detalle de calidad de ese lote
+        self.tabla_lotes = ttk.Treeview(table_frame, columns=columns, show="headings", selectmode="browse")
         self.tabla_lotes.column("ID Lote", width=80, anchor=tk.CENTER)
         self.tabla_lotes.column("SKU", width=100, anchor=tk.CENTER)
+        for col in ("Mediciones", "Rechazadas"):
+            self.tabla_lotes.column(col, width=90, anchor=tk.CENTER)
         for col in columns:
             self.tabla_lotes.heading(col, text=col)
-            
+
+        vsb = ttk.Scrollbar(table_frame, orient="vertical", command=self.tabla_lotes.yview)
+        vsb.pack(side='right', fill='y')
         self.tabla_lotes.pack(side='left', fill="both", expand=True)
+
+        self.orden_lotes = OrdenTabla(self.tabla_lotes, servicio.COLUMNAS_ORDEN_LOTES, self.cargar_lotes_en_tabla,
+                                      "Fecha Creación", descendente=True)
+        self.paginador_lotes = TablaPaginada(self.tabla_lotes, vsb, self._pagina_lotes(), self.ejecutor,
+                                             al_fallar=self._error_carga_lotes)
         self.tabla_lotes.bind('<<TreeviewSelect>>', self.mostrar_controles_calidad)
 
-        # Área de Trazabilidad/Calidad Detallada
-        self.calidad_detalle_label = ttk.Label(parent_frame, text="Selecciona un Lote para ver los Controles de Calidad...", 
-                                               style="Modulo.TLabel", justify=tk.LEFT, wraplength=800)
-        self.calidad_detalle_label.pack(pady=10, padx=20, fill="x")
+        # Área de Trazabilidad/Calidad Detallada: tabla paginada (Tk solo dibuja las filas
+        # visibles y las páginas llegan al hacer scroll, tenga el lote las mediciones que tenga)
+        detalle_frame = ttk.Frame(parent_frame, style="Modulo.TFrame")
+        detalle_frame.pack(pady=(0, 10), padx=20, fill="both", expand=True)
+
+        self.calidad_detalle_label = ttk.Label(detalle_frame, text="Selecciona un Lote para ver los Controles de Calidad...",
+                                               style="Modulo.TLabel")
+        self.calidad_detalle_label.pack(pady=5, fill="x")
+
+        columnas_detalle = ("ID", "Fecha/Hora", "Parámetro", "Valor", "Resultado")
+        tabla_detalle_frame = ttk.Frame(detalle_frame, style="Modulo.TFrame")
+        tabla_detalle_frame.pack(fill="both", expand=True)
+        self.tabla_controles = ttk.Treeview(tabla_detalle_frame, columns=columnas_detalle,
+                                            displaycolumns=columnas_detalle[1:], show="headings", height=8)
+        for col in columnas_detalle:
+            self.tabla_controles.heading(col, text=col)
+            self.tabla_controles.column(col, width=150, anchor=tk.CENTER)
+
+        vsb_detalle = ttk.Scrollbar(tabla_detalle_frame, orient="vertical", command=self.tabla_controles.yview)
+        vsb_detalle.pack(side='right', fill='y')
+        self.tabla_controles.pack(side='left', fill="both", expand=True)
+        self.paginador_controles = TablaPaginada(self.tabla_controles, vsb_detalle, None, self.ejecutor,
+                                                 al_fallar=self._error_carga_controles)
+        self.paginador_controles.vaciar()
 
     def crear_lote(self):
         """Inserta un nuevo lote."""
-        sku = self.lote_sku_entry.get().upper()
-        cantidad_str = self.lote_cantidad_entry.get()
-
-        if not all([sku, cantidad_str]):
-            messagebox.showerror("Error", "SKU y Cantidad son obligatorios para crear un lote.")
-            return
-
+        # El SKU tiene que existir en el catálogo (validar_lote completa el nombre del producto)
         try:
-            cantidad = int(cantidad_str)
-            if cantidad <= 0: raise ValueError
-        except ValueError:
-            messagebox.showerror("Error", "La cantidad debe ser un número entero positivo.")
+            lote = Lote.desde_formulario(self.lote_sku_entry.get(), self.lote_cantidad_entry.get())
+            servicio.validar_lote(repositorio.obtener_conexion(servicio.DB_NAME), lote)
+        except DatosInvalidos as e:
+            messagebox.showerror("Error", str(e))
             return
 
-        cursor = conexion.cursor()
-        
-        # 1. Verificar si el SKU existe
-        cursor.execute("SELECT nombre FROM Productos WHERE sku = ?", (sku,))
-        producto = cursor.fetchone()
-        if not producto:
-            messagebox.showerror("Error", f"El SKU '{sku}' no existe en el catálogo de productos.")
-            return
+        # Un lote es un alta crítica (trazabilidad): se confirma enseguida con barrera de durabilidad
+        valores = (lote.producto_sku, lote.nombre, lote.cantidad, lote.fecha_creacion) + servicio.ESTADO_LOTE_NUEVO
+        provisoria = self.paginador_lotes.insertar_pendiente(("…",) + valores, self.orden_lotes.encabezado,
+                                                             self.orden_lotes.descendente)
+        self.lote_sku_entry.delete(0, tk.END)
+        self.lote_cantidad_entry.delete(0, tk.END)
 
-        # 2. Insertar Lote
-        fecha_creacion = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        sql_insert = "INSERT INTO Lotes (producto_sku, cantidad, fecha_creacion) VALUES (?, ?, ?);"
-        
-        try:
-            cursor.execute(sql_insert, (sku, cantidad, fecha_creacion))
-            conexion.commit()
-            self.cargar_lotes_en_tabla()
-            self.lote_sku_entry.delete(0, tk.END)
-            self.lote_cantidad_entry.delete(0, tk.END)
-            messagebox.showinfo("Éxito", f"Lote creado para {producto['nombre']} ({sku}) con {cantidad} unidades.")
-        except sqlite3.Error as e:
+        def confirmado(nuevo_id):
+            self.paginador_lotes.confirmar_pendiente(provisoria, nuevo_id, (nuevo_id,) + valores)
+            messagebox.showinfo("Éxito", f"Lote {nuevo_id} creado para {lote.nombre} ({lote.producto_sku}) "
+                                         f"con {lote.cantidad} unidades.")
+
+        def rechazado(e):
+            self.paginador_lotes.quitar_pendiente(provisoria)
             messagebox.showerror("Error de DB", f"Ocurrió un error al crear el lote: {e}")
 
+        self.escritor.escribir(servicio.SQL_INSERTAR_LOTE, lote.parametros(),
+                               al_confirmar=confirmado, al_fallar=rechazado, critica=True)
+
     def registrar_medicion_calidad(self):
         """Registra una medición de calidad para un lote específico."""
-        lote_id_str = self.calidad_lote_id_entry.get()
-        parametro = self.calidad_parametro_entry.get()
-        valor_str = self.calidad_valor_entry.get()
-        aprobado = self.calidad_aprobado_var.get()
-
-        if not all([lote_id_str, parametro, valor_str]):
-            messagebox.showerror("Error", "Debes completar Lote ID, Parámetro y Valor.")
-            return
-            
+        # El lote tiene que existir; la medición se registra con la fecha y hora actual
         try:
-            lote_id = int(lote_id_str)
-            valor = float(valor_str)
-        except ValueError:
-            messagebox.showerror("Error", "Lote ID debe ser un entero y Valor debe ser un número.")
+            control = ControlCalidad.desde_formulario(self.calidad_lote_id_entry.get(), self.calidad_parametro_entry.get(),
+                                                      self.calidad_valor_entry.get(), self.calidad_aprobado_var.get())
+            servicio.validar_control(repositorio.obtener_conexion(servicio.DB_NAME), control)
+        except DatosInvalidos as e:
+            messagebox.showerror("Error", str(e))
             return
 
-        cursor = conexion.cursor()
-        
-        # 1. Verificar si el Lote existe
-        cursor.execute("SELECT 1 FROM Lotes WHERE id = ?", (lote_id,))
-        if cursor.fetchone() is None:
-            messagebox.showerror("Error", f"El Lote ID {lote_id} no existe.")
+        self.escritor.escribir(
+            servicio.SQL_INSERTAR_CONTROL, control.parametros(),
+            al_confirmar=lambda _: self._medicion_confirmada(control.lote_id),
+            al_fallar=lambda e: messagebox.showerror(
+                "Error de DB", f"Ocurrió un error al registrar '{control.parametro}' para el Lote ID {control.lote_id}: {e}"),
+        )
+
+        # Limpiar campos de calidad (el Lote ID queda, para cargar varias mediciones seguidas)
+        self.calidad_parametro_entry.delete(0, tk.END)
+        self.calidad_valor_entry.delete(0, tk.END)
+        self.calidad_aprobado_var.set(False)
+
+    def _medicion_confirmada(self, lote_id):
+        """Anota el lote; el refresco corre una sola vez cuando se terminó de repartir el grupo."""
+        if not self._lotes_medidos:
+            self.frame.after_idle(self._actualizar_tras_mediciones)
+        self._lotes_medidos.add(lote_id)
+
+    def _actualizar_tras_mediciones(self):
+        lotes, self._lotes_medidos = self._lotes_medidos, set()
+        # Actualizar detalle si el lote sigue seleccionado (opcional)
+        self.mostrar_controles_calidad(None)
+        for lote_id in lotes:
+            self.actualizar_estado_lote(lote_id)
+        # Las estadísticas en pantalla suman las mediciones nuevas (solo se leen esas filas)
+        if self.spc_sku:
+            self.calcular_spc(self.spc_sku)
+
+    def importar_mediciones(self):
+        """Ingesta masiva de un archivo de mediciones (CSV o JSONL) en el hilo de la DB."""
+        archivo = filedialog.askopenfilename(title="Importar mediciones de calidad",
+                                             filetypes=[("Mediciones", "*.csv *.jsonl"), ("CSV", "*.csv"), ("JSONL", "*.jsonl")])
+        if not archivo:
             return
+        self.paginador_lotes.indicador.mostrar()
+        self.calidad_detalle_label.config(text=f"Importando mediciones de {archivo}...")
+        self.ejecutor.enviar(data_manager.importar_mediciones, archivo,
+                             al_terminar=self._mediciones_importadas, al_fallar=self._error_importar_mediciones)
+
+    def _mediciones_importadas(self, resultado):
+        self.paginador_lotes.indicador.ocultar()
+        self.calidad_detalle_label.config(text="Selecciona un Lote para ver los Controles de Calidad...")
+        resumen = (f"Se importaron {resultado['filas']} de {resultado['leidas']} mediciones "
+                   f"en {resultado['segundos']:.1f} s ({resultado['filas_por_segundo']:,.0f} mediciones/seg).")
+        if resultado["omitidas"]:
+            resumen += f"\nReanudado: se omitieron {resultado['omitidas']} mediciones ya importadas."
+        if resultado["rechazos"]["cantidad"]:
+            messagebox.showwarning("Importación con rechazos",
+                                   resumen + "\n\n" + data_manager.describir_rechazos(resultado["rechazos"]))
+        else:
+            messagebox.showinfo("Éxito", resumen)
+        self.mostrar_controles_calidad(None)
+        # El estado de muchos lotes pudo cambiar: se recarga la lista (una sola consulta)
+        self.cargar_lotes_en_tabla()
+        if self.spc_sku:
+            self.calcular_spc(self.spc_sku)
 
-        # 2. Insertar Control de Calidad
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        aprobado_int = 1 if aprobado else 0
-        sql_insert = "INSERT INTO ControlesCalidad (lote_id, parametro, valor, aprobado, timestamp) VALUES (?, ?, ?, ?, ?);"
-        
-        try:
-            cursor.execute(sql_insert, (lote_id, parametro, valor, aprobado_int, timestamp))
-            conexion.commit()
-            
-            # Limpiar campos de calidad
-            self.calidad_lote_id_entry.delete(0, tk.END)
-            self.calidad_parametro_entry.delete(0, tk.END)
-            self.calidad_valor_entry.delete(0, tk.END)
-            self.calidad_aprobado_var.set(False)
-
-            messagebox.showinfo("Éxito", f"Medición '{parametro}' registrada para Lote ID {lote_id}.")
-            
-            # Actualizar detalle si el lote sigue seleccionado (opcional)
-            self.mostrar_controles_calidad(None) 
-            
-        except sqlite3.Error as e:
-            messagebox.showerror("Error de DB", f"Ocurrió un error al registrar la calidad: {e}")
+    def _error_importar_mediciones(self, e):
+        self.paginador_lotes.indicador.ocultar()
+        self.calidad_detalle_label.config(text="Selecciona un Lote para ver los Controles de Calidad...")
+        messagebox.showerror("Error", f"No se pudieron importar las mediciones: {e}")
+
+    def actualizar_estado_lote(self, lote_id):
+        """Relee de ResumenLotes el estado de un lote y lo actualiza en la tabla, si está cargado."""
+        def mostrar(estado):
+            iid = str(lote_id)
+            if estado and self.tabla_lotes.exists(iid):
+                valores = self.tabla_lotes.item(iid, 'values')
+                self.tabla_lotes.item(iid, values=tuple(valores[:5]) + tuple(estado))
+
+        self.ejecutor.enviar(servicio.estado_de_lote, lote_id, al_terminar=mostrar,
+                             al_fallar=lambda e: print(f"Error al actualizar el estado del lote {lote_id}: {e}"))
 
     def cargar_lotes_en_tabla(self):
-        """Limpia y rellena la tabla de lotes con datos de la DB, incluyendo el nombre del producto."""
-        for item in self.tabla_lotes.get_children():
-            self.tabla_lotes.delete(item)
-            
-        cursor = conexion.cursor()
-        try:
-            # Consulta JOIN para obtener el nombre del producto junto con los datos del lote
-            sql_select = """
-            SELECT 
-                L.id, L.producto_sku, P.nombre, L.cantidad, L.fecha_creacion
-            FROM Lotes L
-            JOIN Productos P ON L.producto_sku = P.sku
-            ORDER BY L.fecha_creacion DESC;
-            """
-            cursor.execute(sql_select)
-            lotes = cursor.fetchall()
-            for lote in lotes:
-                self.tabla_lotes.insert('', 'end', values=tuple(lote))
-        except sqlite3.Error as e:
-            messagebox.showerror("Error de DB", f"No se pudo cargar la tabla de lotes: {e}")
+        """Limpia la tabla de lotes y pide la primera página (con el nombre del producto) al hilo de la DB."""
+        self.paginador_lotes.cambiar_consulta(self._pagina_lotes())
+
+    def _pagina_lotes(self):
+        return partial(servicio.obtener_pagina_lotes, columna=self.orden_lotes.columna,
+                       descendente=self.orden_lotes.descendente)
+
+    def _error_carga_lotes(self, e):
+        messagebox.showerror("Error de DB", f"No se pudo cargar la tabla de lotes: {e}")
 
     def mostrar_controles_calidad(self, event):
         """Muestra los controles de calidad para el lote seleccionado (Trazabilidad)."""
         selected_item = self.tabla_lotes.selection()
         if not selected_item:
             self.calidad_detalle_label.config(text="Selecciona un Lote para ver los Controles de Calidad...")
+            self.paginador_controles.vaciar()
+            return
+        if self.paginador_lotes.es_pendiente(selected_item[0]):
+            self.calidad_detalle_label.config(text="El lote todavía se está guardando...")
+            self.paginador_controles.vaciar()
             return
 
         item_data = self.tabla_lotes.item(selected_item, 'values')
-        lote_id = item_data[0]
+        lote_id = int(item_data[0])
         producto_nombre = item_data[2]
-        
-        cursor = conexion.cursor()
-        sql_select = "SELECT timestamp, parametro, valor, aprobado FROM ControlesCalidad WHERE lote_id = ? ORDER BY timestamp DESC"
-        
+        mediciones, rechazadas = item_data[6], item_data[7]
+
+        self.calidad_detalle_label.config(
+            text=f"Controles de Calidad para Lote ID: {lote_id} ({producto_nombre}): "
+                 f"{mediciones} mediciones, {rechazadas} rechazadas")
+        self.paginador_controles.cambiar_consulta(partial(servicio.obtener_pagina_controles, lote_id=lote_id))
+
+    def _error_carga_controles(self, e):
+        self.calidad_detalle_label.config(text=f"Error al cargar controles de calidad: {e}")
+
+    # -------------------------------------------------------------
+    # ⬇️ INTERFAZ DE CONTROL ESTADÍSTICO (SPC) ⬇️
+    # -------------------------------------------------------------
+
+    def crear_ui_spc(self, parent_frame):
+        """Crea los controles y la tabla de estadísticas SPC por parámetro de un producto."""
+        # SKU cuyas estadísticas se muestran (None = ninguno todavía)
+        self.spc_sku = None
+
+        consulta_frame = ttk.Frame(parent_frame, style="Modulo.TFrame", padding="15")
+        consulta_frame.pack(pady=10, fill="x")
+
+        ttk.Label(consulta_frame, text="SKU del Producto:", style="Modulo.TLabel").grid(row=0, column=0, padx=10, pady=5, sticky="e")
+        self.spc_sku_entry = ttk.Entry(consulta_frame, width=20, style="TEntry")
+        self.spc_sku_entry.grid(row=0, column=1, padx=10, pady=5)
+
+        ttk.Label(consulta_frame, text="Ventana (últimos lotes):", style="Modulo.TLabel").grid(row=0, column=2, padx=10, pady=5, sticky="e")
+        self.spc_ventana_entry = ttk.Entry(consulta_frame, width=8, style="TEntry")
+        self.spc_ventana_entry.insert(0, str(spc.VENTANA_LOTES))
+        self.spc_ventana_entry.grid(row=0, column=3, padx=10, pady=5)
+
+        ttk.Button(consulta_frame, text="Calcular", command=self.calcular_spc, style="Modulo.TButton").grid(row=0, column=4, padx=10, pady=5, ipadx=10)
+
+        columns = ("Parámetro", "Lotes", "N", "Media", "Desvío", "LCI", "LCS", "Cpk", "% Rechazo",
+                   "Media (ventana)", "Desvío (ventana)", "Cpk (ventana)", "% Rechazo (ventana)")
+        table_frame = ttk.Frame(parent_frame, style="Modulo.TFrame")
+        table_frame.pack(pady=10, fill="both", expand=True, padx=20)
+
+        self.tabla_spc = ttk.Treeview(table_frame, columns=columns, show="headings")
+        for col in columns:
+            self.tabla_spc.heading(col, text=col)
+            self.tabla_spc.column(col, width=90, anchor=tk.CENTER)
+        self.tabla_spc.column("Parámetro", width=120, anchor=tk.W)
+
+        vsb = ttk.Scrollbar(table_frame, orient="vertical", command=self.tabla_spc.yview)
+        self.tabla_spc.configure(yscrollcommand=vsb.set)
+        vsb.pack(side='right', fill='y')
+        self.tabla_spc.pack(side='left', fill="both", expand=True)
+        self.tabla_spc.bind('<<TreeviewSelect>>', self._parametro_spc_seleccionado)
+
+        # Límites de especificación del parámetro seleccionado (para el Cpk)
+        limites_frame = ttk.Frame(parent_frame, style="Modulo.TFrame", padding="10")
+        limites_frame.pack(fill="x", padx=20)
+
+        self.spc_parametro_label = ttk.Label(limites_frame, text="Selecciona un parámetro para editar sus límites.", style="Modulo.TLabel")
+        self.spc_parametro_label.grid(row=0, column=0, padx=10, pady=5, sticky="w")
+        ttk.Label(limites_frame, text="LIE:", style="Modulo.TLabel").grid(row=0, column=1, padx=5, pady=5, sticky="e")
+        self.spc_lie_entry = ttk.Entry(limites_frame, width=10, style="TEntry")
+        self.spc_lie_entry.grid(row=0, column=2, padx=5, pady=5)
+        ttk.Label(limites_frame, text="LSE:", style="Modulo.TLabel").grid(row=0, column=3, padx=5, pady=5, sticky="e")
+        self.spc_lse_entry = ttk.Entry(limites_frame, width=10, style="TEntry")
+        self.spc_lse_entry.grid(row=0, column=4, padx=5, pady=5)
+        ttk.Button(limites_frame, text="Guardar Límites", command=self.guardar_limites_spc, style="Modulo.TButton").grid(row=0, column=5, padx=10, pady=5, ipadx=10)
+
+        self.spc_estado_label = ttk.Label(parent_frame, text="", style="Modulo.TLabel")
+        self.spc_estado_label.pack(pady=5, padx=20, fill="x")
+        if not spc.DISPONIBLE:
+            self.spc_estado_label.config(text="⚠️ Las estadísticas requieren NumPy (pip install numpy).")
+
+    def calcular_spc(self, sku=None):
+        """Pide al hilo de la DB las estadísticas del SKU (solo lee las mediciones que no estén en caché)."""
+        if not spc.DISPONIBLE:
+            messagebox.showerror("Error", "Las estadísticas de calidad requieren NumPy (pip install numpy).")
+            return
+        sku = sku or self.spc_sku_entry.get().strip().upper()
+        if not sku:
+            messagebox.showerror("Error", "Ingresa el SKU del producto.")
+            return
         try:
-            cursor.execute(sql_select, (lote_id,))
-            controles = cursor.fetchall()
-            
-            detalle_text = [f"Controles de Calidad para Lote ID: {lote_id} ({producto_nombre}):\n"]
-            
-            if not controles:
-                detalle_text.append("   - No hay mediciones de calidad registradas para este lote.")
-            else:
-                for control in controles:
-                    aprobado = "✅ APROBADO" if control['aprobado'] == 1 else "❌ RECHAZADO"
-                    line = f"   - [{control['timestamp']}] {control['parametro']}: {control['valor']} ({aprobado})"
-                    detalle_text.append(line)
-                    
-            self.calidad_detalle_label.config(text="\n".join(detalle_text))
+            ventana = int(self.spc_ventana_entry.get())
+            if ventana <= 0: raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "La ventana debe ser un número entero positivo de lotes.")
+            return
 
-        except sqlite3.Error as e:
-            self.calidad_detalle_label.config(text=f"Error al cargar controles de calidad: {e}")
+        self.spc_sku = sku
+        self.spc_estado_label.config(text=f"Calculando estadísticas de {sku}...")
+        self.ejecutor.enviar(
+            spc.estadisticas_de_sku, sku, ventana,
+            al_terminar=lambda resultados: self._mostrar_spc(sku, ventana, resultados),
+            al_fallar=lambda e: self.spc_estado_label.config(text=f"Error al calcular las estadísticas: {e}"),
+        )
+
+    def _mostrar_spc(self, sku, ventana, resultados):
+        """Vuelca las estadísticas recibidas en la tabla (corre en el hilo de Tk)."""
+        if sku != self.spc_sku:
+            return
+
+        def numero(valor):
+            return "—" if valor is None else f"{valor:.3f}"
+
+        def porcentaje(valor):
+            return f"{valor * 100:.1f}%"
+
+        self.tabla_spc.delete(*self.tabla_spc.get_children())
+        for r in resultados:
+            total, movil = r["total"], r["ventana"]
+            self.tabla_spc.insert('', tk.END, iid=r["parametro"], values=(
+                r["parametro"], r["lotes"], total["n"], numero(total["media"]), numero(total["desvio"]),
+                numero(total["lci"]), numero(total["lcs"]), numero(total["cpk"]), porcentaje(total["rechazo"]),
+                numero(movil["media"]), numero(movil["desvio"]), numero(movil["cpk"]), porcentaje(movil["rechazo"]),
+            ))
+        mediciones = sum(r["total"]["n"] for r in resultados)
+        if resultados:
+            self.spc_estado_label.config(text=f"{sku}: {mediciones} mediciones de {len(resultados)} parámetro(s); ventana de {ventana} lotes.")
+        else:
+            self.spc_estado_label.config(text=f"{sku}: no hay mediciones de calidad registradas.")
+
+    def _parametro_spc_seleccionado(self, event):
+        seleccion = self.tabla_spc.selection()
+        if seleccion:
+            self.spc_parametro_label.config(text=f"Límites de '{seleccion[0]}':")
+
+    def guardar_limites_spc(self):
+        """Guarda LIE/LSE del parámetro seleccionado y recalcula (el Cpk los usa)."""
+        seleccion = self.tabla_spc.selection()
+        if not self.spc_sku or not seleccion:
+            messagebox.showerror("Error", "Selecciona un parámetro de la tabla.")
+            return
+        try:
+            inferior = float(self.spc_lie_entry.get()) if self.spc_lie_entry.get().strip() else None
+            superior = float(self.spc_lse_entry.get()) if self.spc_lse_entry.get().strip() else None
+        except ValueError:
+            messagebox.showerror("Error", "Los límites deben ser números (o quedar vacíos).")
+            return
+        if inferior is not None and superior is not None and inferior >= superior:
+            messagebox.showerror("Error", "El LIE debe ser menor que el LSE.")
+            return
+
+        sku = self.spc_sku
+        self.ejecutor.enviar(
+            spc.guardar_limites, sku, seleccion[0], inferior, superior,
+            al_terminar=lambda _: self.calcular_spc(sku),
+            al_fallar=lambda e: messagebox.showerror("Error de DB", f"No se pudieron guardar los límites: {e}"),
+        )
 
 # -------------------------------------------------------------
 # ⬇️ EJEMPLO DE USO (Sustitución del bloque principal) ⬇️
@@ -451,14 +631,14 @@ if __name__ == '__main__':
     # if os.path.exists(DB_NAME):
     #     os.remove(DB_NAME)
 
-    if conexion:
-        root = tk.Tk()
-        root.title("Módulo de Producción")
-        root.config(bg=BG_MODULO)
-        
-        # Función dummy para volver (simula el menú principal)
-        def volver_al_menu():
-            root.quit()
+    root = tk.Tk()
+    root.title("Módulo de Producción")
+    root.config(bg=BG_MODULO)
+    
+    # Función dummy para volver (simula el menú principal)
+    def volver_al_menu():
+        root.quit()
 
-        ProduccionUI(root, volver_al_menu)
-        root.mainloop()
\ No newline at end of file
+    ProduccionUI(root, volver_al_menu)
+    root.mainloop()
+    repositorio.cerrar_todas()
\ No newline at end of file
@@ -0,0 +1,197 @@
+"""
+Reportes que cruzan compras (adidas.db) con lotes y controles de calidad (produccion.db).
+
+Usan la conexión unificada de `repositorio` (DB_UNIFICADA): adidas.db como base principal
+y produccion.db adjunta como esquema `produccion`, así cada reporte es una sola sentencia
+SQL y el cruce lo hace SQLite con los índices de ambos archivos, no Python.
+
+Las vistas son TEMP (SQLite no deja que una vista guardada en un archivo lea tablas de
+otro) y se crean en cada conexión unificada nueva. Se apoyan en:
+  - idx_compras_identificador_producto y el UNIQUE de Productos.sku (compra -> producto),
+  - ResumenProductos, que los triggers mantienen con lotes, mediciones y rechazos por SKU
+    (a partir de ResumenLotes): la calidad de un producto es una búsqueda por clave primaria.
+
+Uso (desde la raíz del proyecto):
+    python reportes.py productos
+    python reportes.py compras --desde 2024-01-01 --hasta 2024-06-30 --csv compras_calidad.csv
+    python reportes.py proveedores
+"""
+import argparse
+import csv
+import os
+
+import repositorio
+
+DB_NAME = repositorio.DB_UNIFICADA
+
+# Rango por defecto de los reportes con fechas (las fechas de compras están en ISO-8601)
+FECHA_MINIMA = "0000-01-01"
+FECHA_MAXIMA = "9999-12-31"
+# Filas que se traen por cada fetchmany al exportar
+TAMANO_BLOQUE = 10_000
+
+VISTAS = (
+    # Cada compra (fuera de la papelera) con el producto al que apunta su identificador
+    # (NULL si no es un SKU conocido)
+    """
+    CREATE TEMP VIEW IF NOT EXISTS v_compras_producto AS
+    SELECT C.id, C.fecha, C.proveedor, C.cliente, C.monto,
+           C.identificador_producto AS sku, P.nombre AS producto
+    FROM main.compras C
+    LEFT JOIN produccion.Productos P ON P.sku = C.identificador_producto
+    WHERE C.deleted_at IS NULL
+    """,
+    # Calidad por producto: lotes, lotes con algún rechazo y tasa de aprobación de todas sus mediciones
+    # (una fila de ResumenProductos, sin agregar los lotes en cada consulta)
+    """
+    CREATE TEMP VIEW IF NOT EXISTS v_calidad_producto AS
+    SELECT sku, lotes, lotes_con_rechazos, mediciones, rechazadas,
+           CASE WHEN mediciones > 0 THEN 1.0 - CAST(rechazadas AS REAL) / mediciones END AS tasa_aprobacion
+    FROM produccion.ResumenProductos
+    """,
+    # Compras -> producto -> lotes -> tasa de aprobación, una fila por SKU comprado
+    """
+    CREATE TEMP VIEW IF NOT EXISTS v_compras_calidad AS
+    SELECT C.sku, P.nombre AS producto, C.compras, C.monto,
+           IFNULL(Q.lotes, 0) AS lotes, IFNULL(Q.lotes_con_rechazos, 0) AS lotes_con_rechazos,
+           IFNULL(Q.mediciones, 0) AS mediciones, IFNULL(Q.rechazadas, 0) AS rechazadas, Q.tasa_aprobacion
+    FROM (SELECT identificador_producto AS sku, COUNT(*) AS compras, TOTAL(monto) AS monto
+          FROM main.compras
+          WHERE identificador_producto IS NOT NULL AND deleted_at IS NULL
+          GROUP BY identificador_producto) C
+    LEFT JOIN produccion.Productos P ON P.sku = C.sku
+    LEFT JOIN v_calidad_producto Q ON Q.sku = C.sku
+    """,
+)
+
+# Productos comprados con su calidad de producción, de mayor a menor monto
+SQL_CALIDAD_POR_PRODUCTO = "SELECT * FROM v_compras_calidad ORDER BY monto DESC"
+# Compras de un rango de fechas con la tasa de aprobación de los lotes de su producto
+SQL_COMPRAS_CON_CALIDAD = """
+    SELECT C.id, C.fecha, C.proveedor, C.cliente, C.monto, C.sku, C.producto,
+           Q.lotes, Q.tasa_aprobacion
+    FROM v_compras_producto C
+    LEFT JOIN v_calidad_producto Q ON Q.sku = C.sku
+    WHERE C.fecha >= ? AND C.fecha <= ?
+    ORDER BY C.fecha, C.id
+"""
+# Proveedores de un rango de fechas según la calidad de los productos que les compraron, peor primero.
+# `+C.proveedor` deja sin usar idx_compras_proveedor para agrupar: así se busca por el rango
+# de fechas y se agrupan solo esas compras, en vez de recorrer todas en orden de proveedor
+SQL_CALIDAD_POR_PROVEEDOR = """
+    SELECT C.proveedor, COUNT(*) AS compras, TOTAL(C.monto) AS monto,
+           SUM(Q.rechazadas > 0) AS compras_con_rechazos, AVG(Q.tasa_aprobacion) AS tasa_aprobacion
+    FROM v_compras_producto C
+    LEFT JOIN v_calidad_producto Q ON Q.sku = C.sku
+    WHERE C.fecha >= ? AND C.fecha <= ?
+    GROUP BY +C.proveedor
+    ORDER BY tasa_aprobacion, monto DESC
+"""
+
+# Los dos rankings agrupan y ordenan por un valor calculado: el orden en memoria es sobre
+# una fila por SKU o por proveedor, nunca sobre las compras o las mediciones
+ORDEN_EN_MEMORIA_ACEPTADO = {
+    "SQL_CALIDAD_POR_PRODUCTO": "ranking sobre una fila por SKU comprado",
+    "SQL_CALIDAD_POR_PROVEEDOR": "ranking sobre una fila por proveedor",
+}
+
+# Nombre en la línea de comandos -> (sql, lleva rango de fechas)
+REPORTES = {
+    "productos": (SQL_CALIDAD_POR_PRODUCTO, False),
+    "compras": (SQL_COMPRAS_CON_CALIDAD, True),
+    "proveedores": (SQL_CALIDAD_POR_PROVEEDOR, True),
+}
+
+
+def crear_vistas(conexion):
+    """Crea las vistas TEMP entre adidas.db y produccion.db en una conexión unificada nueva."""
+    for ddl in VISTAS:
+        conexion.execute(ddl)
+
+# Las vistas se crean en cada conexión unificada que abre el pool
+repositorio.registrar_vistas(DB_NAME, crear_vistas)
+
+
+def abrir_reporte(conexion, nombre, desde=None, hasta=None):
+    """
+    Ejecuta el reporte `nombre` y devuelve su cursor, para leerlo de a bloques.
+    Args:
+        conexion (sqlite3.Connection): Conexión unificada (repositorio.DB_UNIFICADA).
+        nombre (str): Una de las claves de REPORTES.
+        desde, hasta (str): Rango de fechas ISO (solo para los reportes que lo usan).
+    """
+    sql, con_fechas = REPORTES[nombre]
+    params = (desde or FECHA_MINIMA, hasta or FECHA_MAXIMA) if con_fechas else ()
+    return conexion.execute(sql, params)
+
+
+def generar_reporte(conexion, nombre, desde=None, hasta=None):
+    """
+    Ejecuta el reporte `nombre` completo.
+    Returns:
+        tuple: (columnas, filas) con los nombres de columna y las filas (sqlite3.Row).
+    """
+    cursor = abrir_reporte(conexion, nombre, desde, hasta)
+    try:
+        return [columna[0] for columna in cursor.description], cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def exportar_reporte(conexion, nombre, filename, desde=None, hasta=None, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Escribe el reporte `nombre` en un CSV de a bloques (como data_manager.exportar_csv).
+    Returns:
+        int: Filas exportadas.
+    """
+    temporal = filename + ".parcial"
+    exportadas = 0
+    cursor = abrir_reporte(conexion, nombre, desde, hasta)
+    try:
+        with open(temporal, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow([columna[0] for columna in cursor.description])
+            while True:
+                bloque = cursor.fetchmany(tamano_bloque)
+                if not bloque:
+                    break
+                writer.writerows(bloque)
+                exportadas += len(bloque)
+    finally:
+        cursor.close()
+    os.replace(temporal, filename)
+    return exportadas
+
+
+def _formatear(valor):
+    if valor is None:
+        return "-"
+    if isinstance(valor, float):
+        return f"{valor:,.4f}" if valor <= 1 else f"{valor:,.2f}"
+    return str(valor)
+
+
+def main(argumentos=None):
+    """Punto de entrada de línea de comandos (ver el docstring del módulo)."""
+    parser = argparse.ArgumentParser(description="Reportes de compras cruzadas con la calidad de producción.")
+    parser.add_argument("reporte", choices=sorted(REPORTES))
+    parser.add_argument("--desde", help="Fecha inicial (YYYY-MM-DD) para 'compras' y 'proveedores'.")
+    parser.add_argument("--hasta", help="Fecha final (YYYY-MM-DD) para 'compras' y 'proveedores'.")
+    parser.add_argument("--csv", help="Escribe el reporte en este archivo en lugar de mostrarlo.")
+    args = parser.parse_args(argumentos)
+
+    conexion = repositorio.obtener_conexion(DB_NAME)
+    if args.csv:
+        filas = exportar_reporte(conexion, args.reporte, args.csv, args.desde, args.hasta)
+        print(f"Reporte '{args.reporte}': {filas} filas en {args.csv}.")
+    else:
+        columnas, filas = generar_reporte(conexion, args.reporte, args.desde, args.hasta)
+        print(" | ".join(columnas))
+        for fila in filas:
+            print(" | ".join(_formatear(valor) for valor in fila))
+        print(f"({len(filas)} filas)")
+    repositorio.cerrar_todas()
+
+
+if __name__ == "__main__":
+    main()
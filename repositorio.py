@@ -0,0 +1,355 @@
+import importlib
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+# Archivos de base de datos de la aplicación
+DB_ADIDAS = 'adidas.db'
+DB_PRODUCCION = 'produccion.db'
+# Modo unificado: adidas.db con produccion.db adjunta (ATTACH) en la misma conexión, para
+# cruzar compras con lotes y controles en una sola sentencia SQL. No es un archivo propio.
+DB_UNIFICADA = 'adidas.db+produccion.db'
+
+# Base principal y bases adjuntas ({esquema: archivo}) de cada conexión unificada
+BASES_ADJUNTAS = {
+    DB_UNIFICADA: (DB_ADIDAS, {"produccion": DB_PRODUCCION}),
+}
+
+# --- Configuración aplicada una sola vez a cada conexión nueva ---
+TIMEOUT_SEGUNDOS = 5            # Espera ante un bloqueo antes de fallar con "database is locked"
+CACHE_SENTENCIAS = 256          # Sentencias preparadas que sqlite3 mantiene por conexión
+MMAP_BYTES = 64 * 1024 * 1024   # Lecturas vía memoria mapeada (64 MB)
+
+# Pool de conexiones: una conexión por hilo y por archivo (sqlite3 no comparte conexiones entre hilos)
+_pool = threading.local()
+_todas = []
+
+# Módulos que registran el esquema base de cada DB. Se importan antes de abrirla por
+# primera vez: main.py importa las pantallas recién al navegar, y todas las tablas de un
+# archivo tienen que existir antes de correr sus migraciones. Son los de la capa de datos
+# (sin Tkinter): un script que solo abre la DB no carga ninguna pantalla.
+MODULOS_DE_DB = {
+    DB_ADIDAS: ("servicios.compras", "servicios.empleados"),
+    DB_PRODUCCION: ("servicios.produccion",),
+    DB_UNIFICADA: ("reportes",),
+}
+
+# Funciones que crean/verifican el esquema de cada DB, registradas por los módulos al importarse
+_esquemas = {}
+# Funciones que crean objetos TEMP (p. ej. vistas entre bases adjuntas): se ejecutan en cada conexión nueva
+_vistas = {}
+_inicializadas = set()
+_lock = threading.Lock()
+
+# Commits hechos con `transaccion` por cada DB (PRAGMA data_version no ve los de la propia conexión)
+_cambios_locales = {}
+
+# Segundos que llevó crear el esquema y migrar cada DB al abrirla (para --profile-startup)
+tiempos_configuracion = {}
+
+
+def registrar_esquema(db_path, funcion):
+    """
+    Registra una función `funcion(conexion)` que crea las tablas base de un módulo.
+    No toca el disco: se ejecuta recién la primera vez que se abre `db_path`,
+    seguida de las migraciones pendientes de `migraciones.py`.
+    """
+    _esquemas.setdefault(db_path, []).append(funcion)
+
+
+def registrar_vistas(db_path, funcion):
+    """
+    Registra una función `funcion(conexion)` que crea vistas TEMP en cada conexión nueva a `db_path`.
+    SQLite solo permite que una vista lea tablas de otra base adjunta si es TEMP, y los
+    objetos TEMP viven lo que dura la conexión: por eso no basta con crearlas una vez.
+    """
+    _vistas.setdefault(db_path, []).append(funcion)
+
+
+def obtener_conexion(db_path=DB_ADIDAS):
+    """
+    Devuelve la conexión del hilo actual a `db_path`, abriéndola y configurándola
+    la primera vez que se usa (apertura perezosa).
+    """
+    conexiones = getattr(_pool, 'conexiones', None)
+    if conexiones is None:
+        conexiones = _pool.conexiones = {}
+
+    conexion = conexiones.get(db_path)
+    if conexion is None:
+        conexion = _abrir(db_path)
+        conexiones[db_path] = conexion
+    return conexion
+
+
+def _abrir(db_path):
+    """Abre una conexión nueva con los PRAGMA de rendimiento y asegura el esquema."""
+    if db_path in BASES_ADJUNTAS:
+        return _abrir_unificada(db_path)
+    conexion = sqlite3.connect(db_path, timeout=TIMEOUT_SEGUNDOS, cached_statements=CACHE_SENTENCIAS,
+                               check_same_thread=False)
+    conexion.row_factory = sqlite3.Row
+
+    # WAL: los lectores no bloquean al escritor ni viceversa (reemplaza al rollback journal)
+    conexion.execute("PRAGMA journal_mode = WAL;")
+    # Con WAL, NORMAL es seguro ante cortes de la aplicación y evita un fsync por commit
+    conexion.execute("PRAGMA synchronous = NORMAL;")
+    conexion.execute("PRAGMA foreign_keys = ON;")
+    conexion.execute(f"PRAGMA mmap_size = {MMAP_BYTES};")
+
+    with _lock:
+        _todas.append(conexion)
+        if db_path not in _inicializadas:
+            inicio = time.perf_counter()
+            for nombre_modulo in MODULOS_DE_DB.get(db_path, ()):
+                importlib.import_module(nombre_modulo)
+            for funcion in _esquemas.get(db_path, []):
+                funcion(conexion)
+            # Importación diferida: migraciones usa las constantes de este módulo
+            import migraciones
+            migraciones.migrar(conexion, db_path)
+            _inicializadas.add(db_path)
+            tiempos_configuracion[db_path] = time.perf_counter() - inicio
+
+    print(f"Conexión a SQLite ({db_path}) establecida con éxito.")
+    return conexion
+
+
+def _abrir_unificada(db_path):
+    """
+    Abre la base principal de `db_path` y le adjunta las demás (ATTACH ... AS esquema).
+
+    Cada archivo se abre antes por su cuenta en este hilo, así su esquema y sus migraciones
+    ya están al día: la conexión unificada no migra nada, solo crea sus vistas TEMP.
+    """
+    principal, adjuntas = BASES_ADJUNTAS[db_path]
+    for archivo in (principal, *adjuntas.values()):
+        obtener_conexion(archivo)
+
+    conexion = sqlite3.connect(principal, timeout=TIMEOUT_SEGUNDOS, cached_statements=CACHE_SENTENCIAS,
+                               check_same_thread=False)
+    conexion.row_factory = sqlite3.Row
+    # journal_mode = WAL queda guardado en cada archivo; synchronous y mmap_size son por esquema
+    conexion.execute("PRAGMA foreign_keys = ON;")
+    for esquema, archivo in adjuntas.items():
+        # El nombre del esquema es siempre una constante propia; el archivo va como parámetro
+        conexion.execute(f"ATTACH DATABASE ? AS {esquema};", (archivo,))
+    for esquema in ("main", *adjuntas):
+        conexion.execute(f"PRAGMA {esquema}.synchronous = NORMAL;")
+        conexion.execute(f"PRAGMA {esquema}.mmap_size = {MMAP_BYTES};")
+
+    with _lock:
+        _todas.append(conexion)
+        if db_path not in _inicializadas:
+            for nombre_modulo in MODULOS_DE_DB.get(db_path, ()):
+                importlib.import_module(nombre_modulo)
+            _inicializadas.add(db_path)
+    for funcion in _vistas.get(db_path, []):
+        funcion(conexion)
+
+    print(f"Conexión a SQLite ({db_path}) establecida con éxito.")
+    return conexion
+
+
+def cerrar_todas():
+    """Cierra todas las conexiones abiertas del pool (al salir de la aplicación)."""
+    with _lock:
+        for conexion in _todas:
+            conexion.close()
+        _todas.clear()
+        _inicializadas.clear()
+    _pool.__dict__.clear()
+
+
+# --- Acceso a datos ---
+
+def version_datos(db_path):
+    """
+    Devuelve un valor que cambia cada vez que alguien confirma cambios en `db_path`.
+
+    Combina `PRAGMA data_version` de la conexión del hilo actual (cambia con los commits
+    de otras conexiones: el hilo de la DB, otro proceso) con el contador de commits
+    hechos por `transaccion`. Sirve para comparar, no tiene significado propio.
+    """
+    cursor = obtener_conexion(db_path).execute("PRAGMA data_version;")
+    try:
+        return (cursor.fetchone()[0], _cambios_locales.get(db_path, 0))
+    finally:
+        cursor.close()
+
+
+def consultar(db_path, sql, params=()):
+    """Ejecuta un SELECT y devuelve todas las filas (sqlite3.Row)."""
+    cursor = obtener_conexion(db_path).execute(sql, params)
+    try:
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def consultar_uno(db_path, sql, params=()):
+    """Ejecuta un SELECT y devuelve la primera fila, o None si no hay resultados."""
+    cursor = obtener_conexion(db_path).execute(sql, params)
+    try:
+        return cursor.fetchone()
+    finally:
+        cursor.close()
+
+
+def ejecutar(db_path, sql, params=()):
+    """
+    Ejecuta una sentencia de escritura en su propia transacción.
+    Returns:
+        int: El `lastrowid` (id de la fila insertada, si corresponde).
+    """
+    with transaccion(db_path) as cursor:
+        cursor.execute(sql, params)
+        return cursor.lastrowid
+
+
+@contextmanager
+def transaccion(db_path):
+    """Entrega un cursor; hace commit al salir o rollback si ocurre un error."""
+    conexion = obtener_conexion(db_path)
+    cursor = conexion.cursor()
+    try:
+        yield cursor
+        conexion.commit()
+        _cambios_locales[db_path] = _cambios_locales.get(db_path, 0) + 1
+    except BaseException:
+        conexion.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+# --- Paginación por clave con orden elegido por el usuario ---
+
+# Ids por cada `IN (...)` de `por_ids`: una selección grande no pasa el límite de parámetros de SQLite
+IDS_POR_CONSULTA = 500
+
+
+class ConsultaOrdenada:
+    """
+    Consulta paginada por clave (columna de orden, id) para tablas que se pueden ordenar
+    por distintas columnas desde la UI.
+
+    Cada página continúa desde la última fila de la anterior con `(columna, id) > (?, ?)`
+    (o `<` si el orden es descendente), así que con un índice sobre la columna el costo
+    de una página no depende de cuántas se cargaron antes. En SQLite los índices terminan
+    en el rowid, por eso alcanza con un índice de una sola columna.
+
+    Args:
+        select (str): `SELECT ... FROM ...` sin WHERE ni ORDER BY.
+        columnas (dict): Encabezado de la tabla -> columna SQL ordenable (con índice).
+        id_columna (str): Columna id que desempata (la INTEGER PRIMARY KEY, p. ej. "id" o "L.id").
+        filtro_fijo (str): Condición que llevan todas las páginas (p. ej. "lote_id = ?"); sus
+            parámetros van al comienzo de `params` en `pagina`.
+        filtros (dict): Filtros que se pasan a `pagina` ({nombre: condición}, p. ej. una
+            búsqueda), para que `diagnostico.py` revise también esas sentencias.
+    """
+    def __init__(self, select, columnas, id_columna="id", filtro_fijo=None, filtros=None):
+        self.select = select
+        self.columnas = dict(columnas)
+        self.id_columna = id_columna
+        self.filtro_fijo = filtro_fijo
+        self.filtros = dict(filtros or {})
+
+    def sql(self, columna, descendente, condicion=None, filtro=None):
+        """Arma el SELECT de una página: filtro y condición de clave, orden y LIMIT."""
+        sentido = "DESC" if descendente else "ASC"
+        if columna == self.id_columna:
+            orden = f"{self.id_columna} {sentido}"
+        else:
+            orden = f"{columna} {sentido}, {self.id_columna} {sentido}"
+        condiciones = [c for c in (self.filtro_fijo, filtro, condicion) if c]
+        donde = f" WHERE {' AND '.join(f'({c})' for c in condiciones)}" if condiciones else ""
+        return f"{self.select}{donde} ORDER BY {orden} LIMIT ?"
+
+    def sentencias(self):
+        """
+        Devuelve (descripción, filtro, sql) de la primera y la siguiente página de cada orden,
+        sin filtro (None) y con cada uno de `filtros`, para `diagnostico.py`.
+        """
+        for nombre, filtro in [(None, None), *self.filtros.items()]:
+            sufijo = f" {nombre}" if nombre else ""
+            for columna in self.columnas.values():
+                for descendente in (False, True):
+                    sentido = "DESC" if descendente else "ASC"
+                    yield f"{columna} {sentido}{sufijo}", nombre, self.sql(columna, descendente, filtro=filtro)
+                    yield f"{columna} {sentido} siguiente{sufijo}", nombre, self.sql(
+                        columna, descendente, self._condicion(columna, descendente, ultimo_nulo=False), filtro)
+
+    def pagina(self, conexion, ultima_fila, limite, columna, descendente=False, filtro=None, params=()):
+        """
+        Devuelve la página que sigue a `ultima_fila` (o la primera si es None).
+
+        SQLite ordena los NULL primero en ASC y últimos en DESC, y `(NULL, id) > (?, ?)`
+        nunca es verdadero: las filas con NULL en la columna se piden aparte.
+
+        Args:
+            conexion (sqlite3.Connection): Conexión con row_factory = sqlite3.Row.
+            ultima_fila (sqlite3.Row | None): Última fila ya cargada.
+            limite (int): Cantidad máxima de filas.
+            columna (str): Una de las columnas de `self.columnas`.
+            descendente (bool): Sentido del orden.
+            filtro (str): Condición extra (p. ej. una búsqueda), con sus `params`.
+        """
+        if ultima_fila is None:
+            return self._ejecutar(conexion, self.sql(columna, descendente, filtro=filtro), (*params, limite))
+
+        ultimo_id = ultima_fila[self._clave(self.id_columna)]
+        if columna == self.id_columna:
+            condicion = self._condicion(columna, descendente, ultimo_nulo=False)
+            return self._ejecutar(conexion, self.sql(columna, descendente, condicion, filtro),
+                                  (*params, ultimo_id, limite))
+
+        ultimo_valor = ultima_fila[self._clave(columna)]
+        condicion = self._condicion(columna, descendente, ultimo_nulo=ultimo_valor is None)
+        valores = (ultimo_id,) if ultimo_valor is None else (ultimo_valor, ultimo_id)
+        filas = self._ejecutar(conexion, self.sql(columna, descendente, condicion, filtro),
+                               (*params, *valores, limite))
+
+        # Se terminó un tramo: en ASC después de los NULL vienen los demás, en DESC al revés
+        faltan = limite - len(filas)
+        if faltan > 0 and (ultimo_valor is None) != descendente:
+            resto = f"{columna} IS NOT NULL" if ultimo_valor is None else f"{columna} IS NULL"
+            filas += self._ejecutar(conexion, self.sql(columna, descendente, resto, filtro), (*params, faltan))
+        return filas
+
+    def por_ids(self, conexion, ids, params=()):
+        """
+        Filas con esos ids que cumplen el filtro fijo, sin paginar (p. ej. para volver a
+        mostrar filas restauradas). `params` son los del filtro fijo, si los lleva.
+        """
+        ids = list(ids)
+        filas = []
+        for inicio in range(0, len(ids), IDS_POR_CONSULTA):
+            bloque = ids[inicio:inicio + IDS_POR_CONSULTA]
+            marcadores = ", ".join("?" for _ in bloque)
+            condiciones = [c for c in (self.filtro_fijo, f"{self.id_columna} IN ({marcadores})") if c]
+            donde = " AND ".join(f"({c})" for c in condiciones)
+            filas += self._ejecutar(conexion, f"{self.select} WHERE {donde}", (*params, *bloque))
+        return filas
+
+    def _condicion(self, columna, descendente, ultimo_nulo):
+        comparador = "<" if descendente else ">"
+        if columna == self.id_columna:
+            return f"{self.id_columna} {comparador} ?"
+        if ultimo_nulo:
+            return f"{columna} IS NULL AND {self.id_columna} {comparador} ?"
+        return f"({columna}, {self.id_columna}) {comparador} (?, ?)"
+
+    @staticmethod
+    def _clave(columna):
+        """Nombre de la columna en la fila devuelta ("L.id" -> "id")."""
+        return columna.rsplit(".", 1)[-1]
+
+    @staticmethod
+    def _ejecutar(conexion, sql, params):
+        cursor = conexion.execute(sql, params)
+        try:
+            return cursor.fetchall()
+        finally:
+            cursor.close()
@@ -0,0 +1,15 @@
+"""
+Capa de datos de la aplicación, sin Tkinter: registros validados y funciones de consulta,
+alta y baja de compras, empleados y producción.
+
+Las pantallas (`compras.py`, `empleados.py`, `produccion.py`) solo leen sus campos, llaman
+a estos módulos y muestran el resultado; los benchmarks, los scripts por lotes y cualquier
+prueba los usan igual, sin display.
+
+    from servicios import Compra, DatosInvalidos
+    from servicios import compras
+
+    compra = Compra.desde_formulario("01/02/2024", "Proveedor", "100", "SKU-1", "Cliente")
+    compras.insertar_compras([compra])
+"""
+from servicios.registros import Compra, Empleado, Producto, Lote, ControlCalidad, DatosInvalidos
@@ -0,0 +1,174 @@
+"""
+Datos de compras (adidas.db): esquema, consultas y altas/bajas, sin Tkinter.
+
+Lo usan la pantalla de Compras, los benchmarks y cualquier proceso por lotes. Las lecturas
+reciben la conexión a usar (la del hilo de trabajo de la pantalla, o la de `repositorio`
+en un script); las escrituras abren su transacción con `repositorio.transaccion`.
+"""
+import re
+
+import fechas
+import papelera
+import repositorio
+from servicios.registros import Compra
+
+# Nombre del archivo de la base de datos
+DB_NAME = repositorio.DB_ADIDAS
+
+# Tope de resultados de una búsqueda
+LIMITE_BUSQUEDA = 500
+
+# === Manejo de la Base de Datos ===
+# La conexión la abre y configura el repositorio la primera vez que se usa.
+
+
+def iniciar_db(conn):
+    """Asegura que la tabla 'compras' exista en la base de datos, usando 'proveedor'."""
+    cursor = conn.cursor()
+    # Campo modificado en la creación de la tabla
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS compras (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        fecha TEXT NOT NULL,
+        proveedor TEXT,
+        monto REAL NOT NULL,
+        identificador_producto TEXT,
+        cliente TEXT
+    );
+    """)
+    conn.commit()
+    cursor.close()
+    print("Tabla 'compras' verificada/creada.")
+
+# La tabla se verifica/crea al abrir la primera conexión, no al importar el módulo
+repositorio.registrar_esquema(DB_NAME, iniciar_db)
+
+# === Consultas SQL del módulo ===
+# Se declaran aquí para que `diagnostico.py` pueda revisar su plan de ejecución.
+
+# Encabezado de la tabla -> columna por la que ordena (todas con índice: migración 5 de adidas.db)
+COLUMNAS_ORDEN = {
+    "ID": "id", "Fecha": "fecha", "Proveedor": "proveedor", "Monto": "monto",
+    "Identificador Producto": "identificador_producto", "Cliente": "cliente",
+}
+# Búsqueda por cliente, proveedor o producto sobre el índice FTS5 (migración 4 de adidas.db):
+# el índice entrega las LIMITE_BUSQUEDA compras más nuevas que coinciden y solo esas se ordenan.
+# La papelera y el rango de fechas se filtran dentro del tope ({condiciones}): afuera, las más
+# nuevas que coinciden podrían quedar todas descartadas y la búsqueda no mostraría nada.
+FILTRO_BUSQUEDA = """compras.id IN (
+    SELECT compras_fts.rowid FROM compras_fts JOIN compras AS c ON c.id = compras_fts.rowid
+    WHERE {condiciones}
+    ORDER BY compras_fts.rowid DESC LIMIT ?)"""
+
+# Páginas por clave (columna, id): el costo no depende de cuántas páginas se saltan.
+# Las compras en la papelera no se listan; los índices de orden son parciales sobre esa misma condición.
+# `filtros` son los que arma obtener_pagina_compras (con los dos extremos del rango).
+CONSULTA_COMPRAS = repositorio.ConsultaOrdenada(
+    "SELECT id, fecha, proveedor, monto, identificador_producto, cliente FROM compras", COLUMNAS_ORDEN,
+    filtro_fijo="deleted_at IS NULL",
+    filtros={
+        "rango": "fecha >= ? AND fecha <= ?",
+        "búsqueda": FILTRO_BUSQUEDA.format(condiciones="compras_fts MATCH ? AND c.deleted_at IS NULL"),
+        "búsqueda y rango": FILTRO_BUSQUEDA.format(
+            condiciones="compras_fts MATCH ? AND c.deleted_at IS NULL AND c.fecha >= ? AND c.fecha <= ?"),
+    })
+# Una búsqueda ordena en memoria a lo sumo LIMITE_BUSQUEDA filas; un rango, las compras de esas
+# fechas que trae el índice de fecha (salvo si se ordena por fecha, que sale del mismo índice)
+ORDEN_EN_MEMORIA_ACEPTADO = {
+    "CONSULTA_COMPRAS [búsqueda]": f"ordena a lo sumo {LIMITE_BUSQUEDA} resultados de la búsqueda",
+    "CONSULTA_COMPRAS [búsqueda y rango]": f"ordena a lo sumo {LIMITE_BUSQUEDA} resultados de la búsqueda",
+    "CONSULTA_COMPRAS [rango]": "ordena las compras del rango de fechas elegido, leídas por el índice de fecha",
+}
+
+SQL_INSERTAR = """
+INSERT INTO compras (fecha, proveedor, monto, identificador_producto, cliente)
+VALUES (?, ?, ?, ?, ?);
+"""
+# Cantidad y total de un rango de fechas (fecha en ISO: el índice resuelve el rango)
+SQL_RESUMEN_RANGO = """
+SELECT COUNT(*) AS cantidad, TOTAL(monto) AS total FROM compras
+WHERE fecha >= ? AND fecha <= ? AND deleted_at IS NULL
+"""
+# Extremos para un rango abierto por un lado
+FECHA_MINIMA = "0000-01-01"
+FECHA_MAXIMA = "9999-12-31"
+
+
+def obtener_pagina_compras(conn, ultima_fila, limite, columna="id", descendente=True, busqueda=None,
+                           desde=None, hasta=None):
+    """
+    Devuelve una página de compras ordenada por `columna` (paginación por clave).
+    Args:
+        conn (sqlite3.Connection): La conexión a usar (la del hilo de trabajo).
+        ultima_fila (sqlite3.Row | None): La última fila ya cargada, o None para la primera página.
+        limite (int): Cantidad máxima de filas a devolver.
+        columna (str): Columna de COLUMNAS_ORDEN por la que se ordena.
+        descendente (bool): Sentido del orden.
+        busqueda (str | None): Expresión FTS (ver expresion_busqueda) para filtrar, o None.
+        desde, hasta (str | None): Rango de fechas ISO (incluidos), o None para no limitar.
+    Returns:
+        list of sqlite3.Row: Las filas de la página (`Compra.desde_fila` las convierte en registros).
+    """
+    if busqueda:
+        condiciones, params = fechas.condiciones_rango("c.fecha", desde, hasta)
+        filtro = FILTRO_BUSQUEDA.format(condiciones=" AND ".join(["compras_fts MATCH ?", "c.deleted_at IS NULL"] + condiciones))
+        params = [busqueda] + params + [LIMITE_BUSQUEDA]
+    else:
+        condiciones, params = fechas.condiciones_rango("fecha", desde, hasta)
+        filtro = " AND ".join(condiciones) or None
+    return CONSULTA_COMPRAS.pagina(conn, ultima_fila, limite, columna, descendente, filtro, params)
+
+
+def expresion_busqueda(texto):
+    """
+    Convierte lo que escribió el usuario en una consulta FTS5 con todas las palabras
+    obligatorias. Solo la última se busca como prefijo, porque es la que se está
+    escribiendo ("juan gom" -> "juan" "gom"*).
+    Returns:
+        str | None: La expresión MATCH, o None si el texto no tiene palabras.
+    """
+    # Solo letras y números: los operadores de FTS5 (comillas, *, NEAR...) no llegan a la consulta
+    palabras = re.findall(r"\w+", texto)
+    if not palabras:
+        return None
+    completas = [f'"{palabra}"' for palabra in palabras[:-1]]
+    return " ".join(completas + [f'"{palabras[-1]}"*'])
+
+
+def obtener_compras(conn, ids):
+    """Las compras `ids` que no están en la papelera, como registros Compra."""
+    return [Compra.desde_fila(fila) for fila in CONSULTA_COMPRAS.por_ids(conn, ids)]
+
+
+def resumen_rango(conn, desde=None, hasta=None):
+    """
+    Cantidad y total de las compras entre `desde` y `hasta` (ISO, incluidos; None = sin límite).
+    Returns:
+        tuple: (cantidad, total)
+    """
+    fila = conn.execute(SQL_RESUMEN_RANGO, (desde or FECHA_MINIMA, hasta or FECHA_MAXIMA)).fetchone()
+    return fila["cantidad"], fila["total"]
+
+
+def insertar_compras(compras):
+    """
+    Guarda `compras` en una sola transacción y les asigna su id.
+    Returns:
+        int: Compras insertadas.
+    """
+    with repositorio.transaccion(DB_NAME) as cursor:
+        for compra in compras:
+            cursor.execute(SQL_INSERTAR, compra.parametros())
+            compra.id = cursor.lastrowid
+    return len(compras)
+
+
+def borrar_compras(ids):
+    """Manda las compras `ids` a la papelera (se puede deshacer). Returns: int: Compras borradas."""
+    return papelera.borrar("compras", ids)
+
+
+def deshacer_borrado():
+    """Restaura el último borrado de compras. Returns: list: Las compras restauradas (Compra)."""
+    ids = papelera.deshacer("compras")
+    return obtener_compras(repositorio.obtener_conexion(DB_NAME), ids) if ids else []
@@ -0,0 +1,128 @@
+"""
+Datos de empleados (adidas.db): esquema, consultas, altas, bajas y borrados, sin Tkinter.
+
+Las lecturas reciben la conexión a usar; las escrituras abren su transacción con
+`repositorio.transaccion`.
+"""
+from datetime import date
+
+import fechas
+import papelera
+import repositorio
+from servicios.registros import Empleado, DatosInvalidos
+
+# Nombre del archivo de la base de datos
+DB_NAME = repositorio.DB_ADIDAS
+
+# === Manejo de la Base de Datos ===
+# La conexión la abre y configura el repositorio la primera vez que se usa.
+
+def iniciar_db(conn):
+    """Asegura que la tabla 'empleados' exista en la base de datos."""
+    cursor = conn.cursor()
+    # Usamos REAL para el sueldo y TEXT para todo lo demás, ID es Primary Key autoincremental
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS empleados (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nombre TEXT NOT NULL,
+        puesto TEXT,
+        fecha_ingreso TEXT,
+        sueldo REAL,
+        sucursal TEXT,
+        contacto_mail TEXT,
+        celular INTEGER,
+        fecha_de_baja TEXT
+    );
+    """)
+    conn.commit()
+    print("Tabla 'empleados' verificada/creada.")
+
+# La tabla se verifica/crea al abrir la primera conexión, no al importar el módulo
+repositorio.registrar_esquema(DB_NAME, iniciar_db)
+
+# === Consultas SQL del módulo ===
+# Se declaran aquí para que `diagnostico.py` pueda revisar su plan de ejecución.
+
+# Encabezado de la tabla -> columna por la que ordena (todas con índice: migración 5 de adidas.db)
+COLUMNAS_ORDEN = {
+    "ID": "id", "Nombre": "nombre", "Puesto": "puesto", "Fecha Ingreso": "fecha_ingreso",
+    "Sueldo": "sueldo", "Sucursal": "sucursal",
+}
+# Páginas por clave (columna, id) en lugar de traer toda la tabla.
+# Los empleados en la papelera no se listan; los índices de orden son parciales sobre esa misma condición.
+CONSULTA_EMPLEADOS = repositorio.ConsultaOrdenada(
+    "SELECT id, nombre, puesto, fecha_ingreso, sueldo, sucursal, contacto_mail, celular, fecha_de_baja FROM empleados",
+    COLUMNAS_ORDEN, filtro_fijo="deleted_at IS NULL")
+# Consulta de inserción con marcadores de posición (?)
+SQL_INSERTAR = """
+INSERT INTO empleados (nombre, puesto, fecha_ingreso, sueldo, sucursal, contacto_mail, celular, fecha_de_baja)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?);
+"""
+# Baja de un empleado (se ejecuta con executemany para toda la selección)
+SQL_DAR_DE_BAJA = "UPDATE empleados SET fecha_de_baja = ? WHERE id = ? AND deleted_at IS NULL;"
+
+
+def obtener_pagina_empleados(conn, ultima_fila, limite, columna="id", descendente=False, desde=None, hasta=None):
+    """
+    Devuelve una página de empleados ordenada por `columna` (paginación por clave).
+    Args:
+        conn (sqlite3.Connection): La conexión a usar (la del hilo de trabajo).
+        ultima_fila (sqlite3.Row | None): La última fila ya cargada, o None para la primera página.
+        limite (int): Cantidad máxima de filas a devolver.
+        columna (str): Columna de COLUMNAS_ORDEN por la que se ordena.
+        descendente (bool): Sentido del orden.
+        desde, hasta (str | None): Rango de fecha de ingreso ISO (incluidos), o None para no limitar.
+    """
+    condiciones, params = fechas.condiciones_rango("fecha_ingreso", desde, hasta)
+    filtro = " AND ".join(condiciones) or None
+    return CONSULTA_EMPLEADOS.pagina(conn, ultima_fila, limite, columna, descendente, filtro, params)
+
+
+def obtener_empleados(conn, ids):
+    """Los empleados `ids` que no están en la papelera, como registros Empleado."""
+    return [Empleado.desde_fila(fila) for fila in CONSULTA_EMPLEADOS.por_ids(conn, ids)]
+
+
+def insertar_empleados(empleados):
+    """
+    Guarda `empleados` en una sola transacción y les asigna su id.
+    Returns:
+        int: Empleados insertados.
+    """
+    with repositorio.transaccion(DB_NAME) as cursor:
+        for empleado in empleados:
+            cursor.execute(SQL_INSERTAR, empleado.parametros())
+            empleado.id = cursor.lastrowid
+    return len(empleados)
+
+
+def fecha_de_baja_o_hoy(texto):
+    """Fecha de baja ISO a partir de lo ingresado (DD/MM/YYYY o ISO), o la de hoy si está vacío."""
+    if not texto.strip():
+        return date.today().isoformat()
+    try:
+        return fechas.a_iso(texto)
+    except ValueError as e:
+        raise DatosInvalidos(str(e)) from e
+
+
+def dar_de_baja(ids, fecha_de_baja):
+    """
+    Pone `fecha_de_baja` (ISO) a los empleados `ids`, en una transacción con un executemany.
+    Returns:
+        int: Empleados modificados.
+    """
+    with repositorio.transaccion(DB_NAME) as cursor:
+        cursor.executemany(SQL_DAR_DE_BAJA, ((fecha_de_baja, int(i)) for i in ids))
+        return cursor.rowcount
+
+
+def borrar_empleados(ids):
+    """Manda los empleados `ids` a la papelera (se puede deshacer). Returns: int: Empleados borrados."""
+    return papelera.borrar("empleados", ids)
+
+
+def deshacer_borrado():
+    """Restaura el último borrado de empleados. Returns: list: Los empleados restaurados (Empleado)."""
+    ids = papelera.deshacer("empleados")
+    return obtener_empleados(repositorio.obtener_conexion(DB_NAME), ids) if ids else []
@@ -0,0 +1,226 @@
+"""
+Datos de producción (produccion.db): catálogo de productos, lotes y controles de calidad,
+sin Tkinter.
+
+Las lecturas y validaciones reciben la conexión a usar; las escrituras abren su
+transacción con `repositorio.transaccion`.
+"""
+import papelera
+import repositorio
+from servicios.registros import Producto, DatosInvalidos
+
+# Nombre del archivo de la base de datos
+DB_NAME = repositorio.DB_PRODUCCION
+
+# === Manejo de la Base de Datos ===
+# La conexión la abre y configura el repositorio la primera vez que se usa
+# (con row_factory = sqlite3.Row para obtener filas como diccionarios/objetos).
+
+def iniciar_db(conn):
+    """Crea las tablas Producto, Lote y Control de Calidad si no existen."""
+    cursor = conn.cursor()
+
+    # 1. Tabla de Productos (Modelado: SKU es clave única)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Productos (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nombre TEXT NOT NULL,
+        sku TEXT NOT NULL UNIQUE
+    );
+    """)
+
+    # 2. Tabla de Lotes (Modelado: FK a Productos)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Lotes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        producto_sku TEXT NOT NULL,
+        cantidad INTEGER NOT NULL,
+        fecha_creacion TEXT NOT NULL,
+        FOREIGN KEY (producto_sku) REFERENCES Productos (sku)
+    );
+    """)
+
+    # 3. Tabla de Controles de Calidad (Modelado: FK a Lotes)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS ControlesCalidad (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        lote_id INTEGER NOT NULL,
+        parametro TEXT NOT NULL,
+        valor REAL NOT NULL,
+        aprobado INTEGER NOT NULL, -- 0=Falso, 1=Verdadero
+        timestamp TEXT NOT NULL,
+        FOREIGN KEY (lote_id) REFERENCES Lotes (id)
+    );
+    """)
+
+    conn.commit()
+    print("Tablas 'Productos', 'Lotes' y 'ControlesCalidad' verificadas/creadas.")
+
+# Las tablas se verifican/crean al abrir la primera conexión, no al importar el módulo
+repositorio.registrar_esquema(DB_NAME, iniciar_db)
+
+# === Consultas SQL del módulo ===
+# Se declaran aquí para que `diagnostico.py` pueda revisar su plan de ejecución.
+
+# Encabezado de la tabla -> columna por la que ordena (cada una con su índice)
+COLUMNAS_ORDEN_PRODUCTOS = {"ID": "id", "Nombre": "nombre", "SKU": "sku"}
+# El catálogo no lista los productos en la papelera (siguen existiendo para sus lotes)
+CONSULTA_PRODUCTOS = repositorio.ConsultaOrdenada("SELECT id, nombre, sku FROM Productos", COLUMNAS_ORDEN_PRODUCTOS,
+                                                  filtro_fijo="deleted_at IS NULL")
+SQL_INSERTAR_PRODUCTO = "INSERT INTO Productos (nombre, sku) VALUES (?, ?);"
+# El UNIQUE de sku incluye los productos en la papelera (la FK de Lotes lo necesita): dar de
+# alta un SKU borrado restaura esa fila con el nombre nuevo, en lugar de fallar
+SQL_RESTAURAR_PRODUCTO = "UPDATE Productos SET nombre = ?, deleted_at = NULL WHERE sku = ? AND deleted_at IS NOT NULL RETURNING id;"
+SQL_PRODUCTO_POR_SKU = "SELECT nombre FROM Productos WHERE sku = ? AND deleted_at IS NULL"
+
+# Consulta JOIN para obtener el nombre del producto junto con los datos del lote.
+# "Producto" no se ordena: ordenar por una columna de la otra tabla no puede usar un índice de Lotes.
+# El estado de calidad sale de ResumenLotes (mantenida por triggers sobre ControlesCalidad):
+# una búsqueda por clave primaria por lote, sin contar mediciones. Tampoco se ordena por él.
+COLUMNAS_ORDEN_LOTES = {"ID Lote": "L.id", "SKU": "L.producto_sku", "Cantidad": "L.cantidad",
+                        "Fecha Creación": "L.fecha_creacion"}
+COLUMNAS_ESTADO_LOTE = """
+    CASE WHEN R.lote_id IS NULL THEN 'Sin controles'
+         WHEN R.rechazadas > 0 THEN '❌ Con rechazos'
+         ELSE '✅ Aprobado' END AS estado,
+    COALESCE(R.mediciones, 0) AS mediciones, COALESCE(R.rechazadas, 0) AS rechazadas,
+    COALESCE(R.ultimo_control, '') AS ultimo_control
+"""
+# Estado de un lote recién creado (sin filas en ResumenLotes), en el orden de COLUMNAS_ESTADO_LOTE
+ESTADO_LOTE_NUEVO = ("Sin controles", 0, 0, "")
+CONSULTA_LOTES = repositorio.ConsultaOrdenada(f"""
+SELECT
+    L.id, L.producto_sku, P.nombre, L.cantidad, L.fecha_creacion,{COLUMNAS_ESTADO_LOTE}
+FROM Lotes L
+JOIN Productos P ON L.producto_sku = P.sku
+LEFT JOIN ResumenLotes R ON R.lote_id = L.id
+""", COLUMNAS_ORDEN_LOTES, id_columna="L.id")
+SQL_ESTADO_DE_LOTE = f"SELECT{COLUMNAS_ESTADO_LOTE}FROM Lotes L LEFT JOIN ResumenLotes R ON R.lote_id = L.id WHERE L.id = ?"
+SQL_INSERTAR_LOTE = "INSERT INTO Lotes (producto_sku, cantidad, fecha_creacion) VALUES (?, ?, ?);"
+SQL_EXISTE_LOTE = "SELECT 1 FROM Lotes WHERE id = ?"
+
+SQL_INSERTAR_CONTROL = "INSERT INTO ControlesCalidad (lote_id, parametro, valor, aprobado, timestamp) VALUES (?, ?, ?, ?, ?);"
+# Detalle de calidad de un lote, paginado por (timestamp, id) sobre el índice
+# (lote_id, timestamp, id, ...): cada página lee solo sus filas, tenga el lote las mediciones que tenga
+COLUMNAS_ORDEN_CONTROLES = {"Fecha/Hora": "timestamp"}
+CONSULTA_CONTROLES = repositorio.ConsultaOrdenada("""
+SELECT id, timestamp, parametro, valor,
+    CASE WHEN aprobado = 1 THEN '✅ APROBADO' ELSE '❌ RECHAZADO' END AS resultado
+FROM ControlesCalidad
+""", COLUMNAS_ORDEN_CONTROLES, filtro_fijo="lote_id = ?")
+
+
+
+def obtener_pagina_productos(conn, ultima_fila, limite, columna="nombre", descendente=False):
+    """Devuelve una página de productos ordenada por `columna` (paginación por clave)."""
+    return CONSULTA_PRODUCTOS.pagina(conn, ultima_fila, limite, columna, descendente)
+
+
+def obtener_pagina_lotes(conn, ultima_fila, limite, columna="L.fecha_creacion", descendente=True):
+    """Devuelve una página de lotes (con el nombre del producto) ordenada por `columna`."""
+    return CONSULTA_LOTES.pagina(conn, ultima_fila, limite, columna, descendente)
+
+
+def obtener_pagina_controles(conn, ultima_fila, limite, lote_id, descendente=True):
+    """Devuelve una página de los controles de calidad de un lote, del más reciente al más viejo."""
+    return CONSULTA_CONTROLES.pagina(conn, ultima_fila, limite, "timestamp", descendente, params=(lote_id,))
+
+
+def obtener_productos(conn, ids):
+    """Los productos `ids` que no están en la papelera, como registros Producto."""
+    return [Producto.desde_fila(fila) for fila in CONSULTA_PRODUCTOS.por_ids(conn, ids)]
+
+
+def estado_de_lote(conn, lote_id):
+    """Estado de calidad de un lote (estado, mediciones, rechazadas, ultimo_control), o None si no existe."""
+    return conn.execute(SQL_ESTADO_DE_LOTE, (lote_id,)).fetchone()
+
+
+def validar_lote(conn, lote):
+    """
+    Verifica que el SKU del lote esté en el catálogo y completa `lote.nombre`.
+    Raises:
+        DatosInvalidos: Si el SKU no existe (o su producto está en la papelera).
+    """
+    producto = conn.execute(SQL_PRODUCTO_POR_SKU, (lote.producto_sku,)).fetchone()
+    if not producto:
+        raise DatosInvalidos(f"El SKU '{lote.producto_sku}' no existe en el catálogo de productos.")
+    lote.nombre = producto["nombre"]
+    return lote
+
+
+def validar_control(conn, control):
+    """
+    Verifica que el lote del control exista.
+    Raises:
+        DatosInvalidos: Si el lote no existe.
+    """
+    if conn.execute(SQL_EXISTE_LOTE, (control.lote_id,)).fetchone() is None:
+        raise DatosInvalidos(f"El Lote ID {control.lote_id} no existe.")
+    return control
+
+
+def _insertar(sql, registros):
+    """Guarda `registros` en una sola transacción y les asigna su id. Returns: int: Registros insertados."""
+    with repositorio.transaccion(DB_NAME) as cursor:
+        for registro in registros:
+            cursor.execute(sql, registro.parametros())
+            registro.id = cursor.lastrowid
+    return len(registros)
+
+
+def insertar_productos(productos):
+    """
+    Guarda `productos` en una sola transacción y les asigna su id. Un SKU que está en la
+    papelera se restaura con el nombre nuevo (conserva su id); uno que está en el catálogo
+    hace fallar la transacción con IntegrityError.
+    Returns:
+        int: Productos guardados.
+    """
+    with repositorio.transaccion(DB_NAME) as cursor:
+        for producto in productos:
+            if _restaurar(cursor, producto) is None:
+                cursor.execute(SQL_INSERTAR_PRODUCTO, producto.parametros())
+                producto.id = cursor.lastrowid
+    return len(productos)
+
+
+def restaurar_producto(producto):
+    """
+    Restaura de la papelera el producto con el SKU de `producto`, con su nombre, y le asigna el id.
+    Returns:
+        Producto | None: `producto`, o None si su SKU no está en la papelera.
+    """
+    with repositorio.transaccion(DB_NAME) as cursor:
+        return _restaurar(cursor, producto)
+
+
+def _restaurar(cursor, producto):
+    filas = cursor.execute(SQL_RESTAURAR_PRODUCTO, producto.parametros()).fetchall()
+    if not filas:
+        return None
+    producto.id = filas[0][0]
+    return producto
+
+
+def insertar_lotes(lotes):
+    """Guarda `lotes` (validarlos antes con `validar_lote`)."""
+    return _insertar(SQL_INSERTAR_LOTE, lotes)
+
+
+def insertar_controles(controles):
+    """Guarda `controles` (validarlos antes con `validar_control`). Para archivos grandes usar
+    `data_manager.importar_mediciones`, que inserta por bloques con executemany."""
+    return _insertar(SQL_INSERTAR_CONTROL, controles)
+
+
+def borrar_productos(ids):
+    """Manda los productos `ids` a la papelera (se puede deshacer; sus lotes se conservan).
+    Returns: int: Productos borrados."""
+    return papelera.borrar("Productos", ids)
+
+
+def deshacer_borrado():
+    """Restaura el último borrado de productos. Returns: list: Los productos restaurados (Producto)."""
+    ids = papelera.deshacer("Productos")
+    return obtener_productos(repositorio.obtener_conexion(DB_NAME), ids) if ids else []
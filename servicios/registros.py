@@ -0,0 +1,168 @@
+"""
+Registros de la capa de datos: una compra, un empleado, un producto, un lote o un control
+de calidad, con los valores ya convertidos y validados.
+
+Son dataclasses con `__slots__` (sin `__dict__` por instancia): en una importación o un
+proceso por lotes se crean cientos de miles. `desde_formulario` valida el texto tal como
+llega de los campos de la pantalla (o de cualquier otro origen) y lanza `DatosInvalidos`
+con el mensaje para el usuario; `parametros` da los valores en el orden de la sentencia
+INSERT de su servicio y `desde_fila` arma el registro a partir de una fila de SQLite.
+"""
+from dataclasses import dataclass, fields
+from datetime import datetime
+
+import fechas
+
+
+class DatosInvalidos(ValueError):
+    """Los datos de un registro no son válidos; el mensaje se puede mostrar tal cual."""
+
+
+def ahora():
+    """Fecha y hora actual en el formato de Lotes.fecha_creacion y ControlesCalidad.timestamp."""
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _fecha_iso(texto):
+    """fechas.a_iso, pero con DatosInvalidos."""
+    try:
+        return fechas.a_iso(texto)
+    except ValueError as e:
+        raise DatosInvalidos(str(e)) from e
+
+
+class _Registro:
+    """Conversión común desde filas de SQLite (las columnas que no son campos se ignoran)."""
+    __slots__ = ()
+
+    @classmethod
+    def desde_fila(cls, fila):
+        nombres = {campo.name for campo in fields(cls)}
+        return cls(**{clave: fila[clave] for clave in fila.keys() if clave in nombres})
+
+
+@dataclass(slots=True)
+class Compra(_Registro):
+    fecha: str
+    proveedor: str
+    monto: float
+    identificador_producto: str
+    cliente: str
+    id: int | None = None
+
+    @classmethod
+    def desde_formulario(cls, fecha, proveedor, monto, identificador_producto, cliente):
+        """Todos los campos son obligatorios; la fecha (DD/MM/YYYY o ISO) se guarda en ISO."""
+        if not all([fecha, proveedor, monto, identificador_producto, cliente]):
+            raise DatosInvalidos("Por favor, completa todos los campos obligatorios.")
+        try:
+            monto = float(monto)
+        except ValueError:
+            raise DatosInvalidos("El monto debe ser un número válido.") from None
+        return cls(_fecha_iso(fecha), proveedor, monto, identificador_producto, cliente)
+
+    def parametros(self):
+        return (self.fecha, self.proveedor, self.monto, self.identificador_producto, self.cliente)
+
+
+@dataclass(slots=True)
+class Empleado(_Registro):
+    nombre: str
+    puesto: str
+    fecha_ingreso: str
+    sueldo: float
+    sucursal: str
+    contacto_mail: str
+    celular: str
+    fecha_de_baja: str | None = None
+    id: int | None = None
+
+    @classmethod
+    def desde_formulario(cls, nombre, puesto, fecha_ingreso, sueldo, sucursal, contacto_mail, celular,
+                         fecha_de_baja=""):
+        """Todo es obligatorio salvo la fecha de baja (vacía -> NULL); las fechas se guardan en ISO."""
+        if not all([nombre, puesto, fecha_ingreso, sueldo, sucursal, contacto_mail, celular]):
+            raise DatosInvalidos("Por favor, completa todos los campos obligatorios.")
+        try:
+            sueldo = float(sueldo)
+        except ValueError:
+            raise DatosInvalidos("El sueldo debe ser un número válido.") from None
+        fecha_ingreso = _fecha_iso(fecha_ingreso)
+        fecha_de_baja = _fecha_iso(fecha_de_baja) if fecha_de_baja and fecha_de_baja.strip() else None
+        return cls(nombre, puesto, fecha_ingreso, sueldo, sucursal, contacto_mail, celular, fecha_de_baja)
+
+    def parametros(self):
+        return (self.nombre, self.puesto, self.fecha_ingreso, self.sueldo, self.sucursal,
+                self.contacto_mail, self.celular, self.fecha_de_baja)
+
+
+@dataclass(slots=True)
+class Producto(_Registro):
+    nombre: str
+    sku: str
+    id: int | None = None
+
+    @classmethod
+    def desde_formulario(cls, nombre, sku):
+        """Nombre y SKU obligatorios; el SKU se guarda en mayúsculas."""
+        sku = sku.upper()
+        if not all([nombre, sku]):
+            raise DatosInvalidos("El Nombre y el SKU son obligatorios.")
+        return cls(nombre, sku)
+
+    def parametros(self):
+        return (self.nombre, self.sku)
+
+
+@dataclass(slots=True)
+class Lote(_Registro):
+    producto_sku: str
+    cantidad: int
+    fecha_creacion: str
+    id: int | None = None
+    # Nombre del producto (viene del catálogo, no se guarda en Lotes)
+    nombre: str | None = None
+
+    @classmethod
+    def desde_formulario(cls, sku, cantidad):
+        """SKU (en mayúsculas) y cantidad entera positiva; se crea con la fecha y hora actual.
+        Que el SKU exista en el catálogo lo verifica `servicios.produccion.validar_lote`."""
+        sku = sku.upper()
+        if not all([sku, cantidad]):
+            raise DatosInvalidos("SKU y Cantidad son obligatorios para crear un lote.")
+        try:
+            cantidad = int(cantidad)
+            if cantidad <= 0: raise ValueError
+        except ValueError:
+            raise DatosInvalidos("La cantidad debe ser un número entero positivo.") from None
+        return cls(sku, cantidad, ahora())
+
+    def parametros(self):
+        return (self.producto_sku, self.cantidad, self.fecha_creacion)
+
+
+@dataclass(slots=True)
+class ControlCalidad(_Registro):
+    lote_id: int
+    parametro: str
+    valor: float
+    aprobado: bool
+    timestamp: str
+    id: int | None = None
+
+    @classmethod
+    def desde_formulario(cls, lote_id, parametro, valor, aprobado):
+        """Lote ID entero y valor numérico; se registra con la fecha y hora actual.
+        Que el lote exista lo verifica `servicios.produccion.validar_control`."""
+        if not all([lote_id, parametro, valor]):
+            raise DatosInvalidos("Debes completar Lote ID, Parámetro y Valor.")
+        try:
+            lote_id = int(lote_id)
+            valor = float(valor)
+        except ValueError:
+            raise DatosInvalidos("Lote ID debe ser un entero y Valor debe ser un número.") from None
+        return cls(lote_id, parametro, valor, bool(aprobado), ahora())
+
+    def parametros(self):
+        # aprobado se guarda como 0/1
+        return (self.lote_id, self.parametro, self.valor, 1 if self.aprobado else 0, self.timestamp)
@@ -0,0 +1,252 @@
+"""
+Control estadístico de procesos (SPC) sobre las mediciones de ControlesCalidad.
+
+Por cada parámetro de un producto calcula media, desvío, límites de control (±3σ),
+Cpk (si el parámetro tiene límites de especificación) y tasa de rechazo, sobre todo el
+historial y sobre los últimos N lotes.
+
+Las mediciones de un SKU se leen una sola vez, por bloques, en columnas (arrays de
+NumPy) y quedan en memoria; cuando llegan mediciones nuevas solo se leen esas y se
+agregan a las columnas. Los cálculos son operaciones vectorizadas sobre las columnas,
+nunca un bucle por medición.
+
+NumPy es opcional para el resto de la aplicación: si no está instalado, `DISPONIBLE`
+es False y la pestaña de estadísticas lo avisa. Se importa recién con el primer cálculo
+(en el hilo de la DB), así abrir la pantalla de producción no paga su importación.
+"""
+import importlib
+import importlib.util
+from array import array
+
+import repositorio
+
+DISPONIBLE = importlib.util.find_spec("numpy") is not None
+np = None
+
+DB_NAME = repositorio.DB_PRODUCCION
+
+# Filas que se traen de SQLite por cada fetchmany
+TAMANO_BLOQUE = 50_000
+# Lotes de la ventana móvil por defecto
+VENTANA_LOTES = 20
+# Ancho de los límites de control, en desvíos
+SIGMAS_CONTROL = 3
+
+# Todas las mediciones de un SKU: Lotes por su índice de SKU y, por cada lote, sus
+# controles desde el índice (lote_id, ...) que ya cubre parámetro, valor y aprobado
+SQL_MEDICIONES_DE_SKU = """
+    SELECT C.lote_id, C.parametro, C.valor, C.aprobado
+    FROM Lotes L JOIN ControlesCalidad C ON C.lote_id = L.id
+    WHERE L.producto_sku = ?
+"""
+# Solo las mediciones posteriores a `id`: CROSS JOIN fija a ControlesCalidad como tabla
+# externa, así se recorre el rango de rowid nuevo y no todos los lotes del SKU
+SQL_MEDICIONES_NUEVAS = """
+    SELECT C.lote_id, C.parametro, C.valor, C.aprobado
+    FROM ControlesCalidad C CROSS JOIN Lotes L ON L.id = C.lote_id
+    WHERE C.id > ? AND L.producto_sku = ?
+"""
+SQL_ULTIMA_MEDICION = "SELECT MAX(id) FROM ControlesCalidad"
+SQL_LIMITES_DE_SKU = "SELECT parametro, limite_inferior, limite_superior FROM EspecificacionesCalidad WHERE producto_sku = ?"
+SQL_GUARDAR_LIMITES = """
+    INSERT INTO EspecificacionesCalidad (producto_sku, parametro, limite_inferior, limite_superior)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT (producto_sku, parametro) DO UPDATE
+        SET limite_inferior = excluded.limite_inferior, limite_superior = excluded.limite_superior
+"""
+
+
+def _importar_numpy():
+    global np
+    if np is None:
+        np = importlib.import_module("numpy")
+
+
+class MedicionesSKU:
+    """
+    Columnas con todas las mediciones de un SKU (una posición por medición).
+
+    Los parámetros se guardan como códigos enteros (`parametros[codigo]` es el nombre)
+    para no tener millones de strings en memoria.
+    """
+    def __init__(self):
+        _importar_numpy()
+        self.parametros = []
+        self._codigos = {}
+        self.lotes = np.empty(0, dtype=np.int64)
+        self.codigos = np.empty(0, dtype=np.int32)
+        self.valores = np.empty(0, dtype=np.float64)
+        self.aprobados = np.empty(0, dtype=np.bool_)
+        # MAX(id) de ControlesCalidad cuando se leyó por última vez: lo nuevo es id > visto_hasta
+        self.visto_hasta = 0
+
+    def __len__(self):
+        return len(self.valores)
+
+    def agregar(self, cursor):
+        """Lee el cursor por bloques y agrega sus filas (lote_id, parametro, valor, aprobado)."""
+        lotes, codigos, valores, aprobados = array("q"), array("i"), array("d"), array("b")
+        while True:
+            filas = cursor.fetchmany(TAMANO_BLOQUE)
+            if not filas:
+                break
+            # zip(*), set, map y los arrays trabajan en C: no hay código Python por fila
+            lote_ids, nombres, vals, aprobs = zip(*filas)
+            for nombre in set(nombres).difference(self._codigos):
+                self._codigos[nombre] = len(self.parametros)
+                self.parametros.append(nombre)
+            lotes.extend(lote_ids)
+            codigos.extend(map(self._codigos.__getitem__, nombres))
+            valores.extend(vals)
+            aprobados.extend(aprobs)
+        if not valores:
+            return 0
+
+        self.lotes = np.concatenate([self.lotes, np.frombuffer(lotes, dtype=np.int64)])
+        self.codigos = np.concatenate([self.codigos, np.frombuffer(codigos, dtype=np.int32)])
+        self.valores = np.concatenate([self.valores, np.frombuffer(valores, dtype=np.float64)])
+        self.aprobados = np.concatenate([self.aprobados, np.frombuffer(aprobados, dtype=np.int8).astype(np.bool_)])
+        return len(valores)
+
+
+def _capacidad(media, desvio, inferior, superior):
+    """Cpk con los límites de especificación que existan (None si no hay ninguno o σ = 0)."""
+    if desvio == 0 or (inferior is None and superior is None):
+        return None
+    lados = []
+    if superior is not None:
+        lados.append((superior - media) / (3 * desvio))
+    if inferior is not None:
+        lados.append((media - inferior) / (3 * desvio))
+    return min(lados)
+
+
+def _resumen(valores, aprobados, inferior, superior):
+    """Estadísticas de un grupo de mediciones (arrays de NumPy del mismo largo)."""
+    n = len(valores)
+    media = float(valores.mean())
+    desvio = float(valores.std(ddof=1)) if n > 1 else 0.0
+    return {
+        "n": n,
+        "media": media,
+        "desvio": desvio,
+        "lci": media - SIGMAS_CONTROL * desvio,
+        "lcs": media + SIGMAS_CONTROL * desvio,
+        "cpk": _capacidad(media, desvio, inferior, superior),
+        "rechazo": float(1.0 - aprobados.mean()),
+    }
+
+
+def calcular(mediciones, limites, ventana=VENTANA_LOTES):
+    """
+    Estadísticas SPC por parámetro.
+    Args:
+        mediciones (MedicionesSKU): Columnas del SKU.
+        limites (dict): parametro -> (limite_inferior, limite_superior), cualquiera puede ser None.
+        ventana (int): Cantidad de lotes (los de id más alto) de la ventana móvil.
+    Returns:
+        list of dict: Uno por parámetro, con 'parametro', 'lotes', 'total' (todo el historial)
+        y 'ventana' (últimos `ventana` lotes que midieron ese parámetro).
+    """
+    if not len(mediciones):
+        return []
+    _importar_numpy()
+
+    # Un solo ordenamiento agrupa por parámetro y, dentro de cada uno, por lote
+    orden = np.lexsort((mediciones.lotes, mediciones.codigos))
+    codigos = mediciones.codigos[orden]
+    lotes = mediciones.lotes[orden]
+    valores = mediciones.valores[orden]
+    aprobados = mediciones.aprobados[orden]
+    inicios = np.searchsorted(codigos, np.arange(len(mediciones.parametros) + 1))
+
+    resultados = []
+    for codigo, nombre in enumerate(mediciones.parametros):
+        desde, hasta = inicios[codigo], inicios[codigo + 1]
+        if desde == hasta:
+            continue
+        lotes_grupo = lotes[desde:hasta]
+        inferior, superior = limites.get(nombre, (None, None))
+
+        # Los lotes ya están ordenados: el corte de la ventana es el N-ésimo lote distinto desde el final
+        distintos = np.unique(lotes_grupo)
+        corte = np.searchsorted(lotes_grupo, distintos[-ventana]) if len(distintos) > ventana else 0
+
+        resultados.append({
+            "parametro": nombre,
+            "lotes": len(distintos),
+            "total": _resumen(valores[desde:hasta], aprobados[desde:hasta], inferior, superior),
+            "ventana": _resumen(valores[desde + corte:hasta], aprobados[desde + corte:hasta], inferior, superior),
+        })
+    return resultados
+
+
+class CacheSPC:
+    """
+    Mediciones en columnas y resultados por SKU, válidos mientras no lleguen mediciones nuevas.
+
+    ControlesCalidad solo recibe altas: `MAX(id)` (una búsqueda en el rowid) alcanza para
+    saber si hay algo nuevo, y en ese caso se leen solo las filas con id mayor.
+    Se usa siempre desde el mismo hilo (el del EjecutorDB de produccion.db).
+    """
+    def __init__(self):
+        self._mediciones = {}   # sku -> MedicionesSKU
+        self._resultados = {}   # (sku, ventana) -> (visto_hasta, limites, resultados)
+
+    def estadisticas(self, conexion, sku, ventana=VENTANA_LOTES):
+        """Devuelve `calcular(...)` para `sku`, leyendo de la DB solo lo que falte."""
+        mediciones = self._mediciones.get(sku)
+        # Tuplas simples en lugar de sqlite3.Row: se transponen a columnas mucho más rápido
+        cursor = conexion.cursor()
+        cursor.row_factory = None
+        # MAX(id) y las filas en una sola transacción de lectura (misma instantánea): una alta
+        # confirmada entre las dos lecturas se leería ahora y otra vez con `id > visto_hasta`
+        cursor.execute("BEGIN")
+        try:
+            ultima = cursor.execute(SQL_ULTIMA_MEDICION).fetchone()[0] or 0
+            if mediciones is None:
+                mediciones = MedicionesSKU()
+                mediciones.agregar(cursor.execute(SQL_MEDICIONES_DE_SKU, (sku,)))
+                self._mediciones[sku] = mediciones
+            elif ultima > mediciones.visto_hasta:
+                mediciones.agregar(cursor.execute(SQL_MEDICIONES_NUEVAS, (mediciones.visto_hasta, sku)))
+        finally:
+            cursor.execute("COMMIT")
+            cursor.close()
+        mediciones.visto_hasta = ultima
+
+        # Los límites son pocas filas: se leen siempre, así un cambio de especificación se ve enseguida
+        limites = {fila["parametro"]: (fila["limite_inferior"], fila["limite_superior"])
+                   for fila in conexion.execute(SQL_LIMITES_DE_SKU, (sku,))}
+
+        guardado = self._resultados.get((sku, ventana))
+        if guardado is not None and guardado[0] == ultima and guardado[1] == limites:
+            return guardado[2]
+        resultados = calcular(mediciones, limites, ventana)
+        self._resultados[(sku, ventana)] = (ultima, limites, resultados)
+        return resultados
+
+    def invalidar(self, sku=None):
+        """Olvida lo leído de `sku` (o de todos), p. ej. si se borraron mediciones."""
+        if sku is None:
+            self._mediciones.clear()
+            self._resultados.clear()
+            return
+        self._mediciones.pop(sku, None)
+        for clave in [clave for clave in self._resultados if clave[0] == sku]:
+            del self._resultados[clave]
+
+
+# Caché única de la aplicación (la usa el hilo de la DB de producción)
+cache = CacheSPC()
+
+
+def estadisticas_de_sku(conexion, sku, ventana=VENTANA_LOTES):
+    """Punto de entrada para `EjecutorDB.enviar`: estadísticas SPC de `sku` desde la caché."""
+    return cache.estadisticas(conexion, sku, ventana)
+
+
+def guardar_limites(conexion, sku, parametro, inferior, superior):
+    """Guarda los límites de especificación de un parámetro (para `EjecutorDB.enviar`)."""
+    with conexion:
+        conexion.execute(SQL_GUARDAR_LIMITES, (sku, parametro, inferior, superior))
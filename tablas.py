@@ -0,0 +1,365 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+import fechas
+
+# Cantidad de filas que se piden a la DB en cada página.
+# Una pantalla completa muestra ~30 filas, así que una página cubre varias pantallas.
+TAMANO_PAGINA = 100
+
+# Fracción del scroll a partir de la cual se pide la siguiente página.
+UMBRAL_SCROLL = 0.9
+
+# Filas agregadas que todavía no se confirmaron en la DB (ver escritor_db): se ven en gris
+ETIQUETA_PENDIENTE = "pendiente"
+COLOR_PENDIENTE = "#888888"
+
+
+class IndicadorCarga:
+    """Etiqueta "Cargando..." que se superpone a una tabla mientras llegan los datos."""
+    def __init__(self, tabla, texto="Cargando datos..."):
+        self.label = ttk.Label(tabla.master, text=texto, style="Modulo.TLabel", padding=(10, 5))
+
+    def mostrar(self):
+        self.label.place(relx=0.5, rely=0.5, anchor=tk.CENTER)
+        self.label.lift()
+
+    def ocultar(self):
+        self.label.place_forget()
+
+
+class TablaPaginada:
+    """
+    Carga una Treeview por páginas usando paginación por clave (keyset) en lugar de
+    traer la tabla completa con fetchall(). Las páginas se piden al EjecutorDB,
+    así que la pantalla se dibuja enseguida y se rellena cuando llegan los datos.
+
+    Args:
+        tabla (ttk.Treeview): La tabla a rellenar.
+        scrollbar (ttk.Scrollbar): La barra de desplazamiento vertical existente.
+        obtener_pagina (callable): Función (conexion, ultima_fila, limite) -> lista de filas.
+            Recibe la última fila ya cargada (None en la primera página) para continuar
+            desde su clave. La primera columna de cada fila se usa como iid del item.
+        ejecutor (EjecutorDB): Ejecutor que corre `obtener_pagina` fuera del hilo de Tk.
+        tamano_pagina (int): Filas por página.
+        limite_total (int): Máximo de filas a cargar en total (None = sin tope).
+    """
+    def __init__(self, tabla, scrollbar, obtener_pagina, ejecutor, tamano_pagina=TAMANO_PAGINA, al_fallar=None,
+                 limite_total=None):
+        self.tabla = tabla
+        self.scrollbar = scrollbar
+        self.obtener_pagina = obtener_pagina
+        self.ejecutor = ejecutor
+        self.tamano_pagina = tamano_pagina
+        self.al_fallar = al_fallar
+        self.limite_total = limite_total
+        self.indicador = IndicadorCarga(tabla)
+
+        self.ultima_fila = None
+        self.cargadas = 0
+        self.agotada = False
+        self.cargando = False
+        # Se incrementa en cada recarga para descartar páginas pedidas antes de ella
+        self._generacion = 0
+        # Numera los iid provisorios de las filas pendientes ("pendiente-1", ...)
+        self._provisorias = 0
+        self.tabla.tag_configure(ETIQUETA_PENDIENTE, foreground=COLOR_PENDIENTE)
+
+        # Interceptamos el scroll para saber cuándo el usuario llega al final
+        self.tabla.configure(yscrollcommand=self._on_scroll)
+
+    def cambiar_consulta(self, obtener_pagina, limite_total=None):
+        """Reemplaza la consulta (p. ej. al buscar o filtrar) y recarga desde la primera página."""
+        self.obtener_pagina = obtener_pagina
+        self.limite_total = limite_total
+        self.recargar()
+
+    def recargar(self):
+        """Vacía la tabla y vuelve a pedir solo la primera página."""
+        self._generacion += 1
+        self.tabla.delete(*self.tabla.get_children())
+        self.ultima_fila = None
+        self.cargadas = 0
+        self.agotada = False
+        self.cargando = False
+        self.cargar_siguiente_pagina()
+
+    def vaciar(self):
+        """Vacía la tabla sin pedir datos (p. ej. cuando no hay nada seleccionado)."""
+        self._generacion += 1
+        self.tabla.delete(*self.tabla.get_children())
+        self.ultima_fila = None
+        self.cargadas = 0
+        self.agotada = True
+        self.cargando = False
+        self.indicador.ocultar()
+
+    def cargar_siguiente_pagina(self):
+        """Pide al hilo de la DB la página siguiente a la última fila cargada."""
+        if self.agotada or self.cargando:
+            return
+        limite = self.tamano_pagina
+        if self.limite_total is not None:
+            limite = min(limite, self.limite_total - self.cargadas)
+        self.cargando = True
+        self.indicador.mostrar()
+        generacion = self._generacion
+        self.ejecutor.enviar(
+            self.obtener_pagina, self.ultima_fila, limite,
+            al_terminar=lambda filas: self._agregar_pagina(filas, generacion, limite),
+            al_fallar=lambda error: self._fallo(error, generacion),
+        )
+
+    def _agregar_pagina(self, filas, generacion, limite):
+        """Agrega al final de la tabla la página recibida (en el hilo de Tk)."""
+        if generacion != self._generacion:
+            return
+        self.cargando = False
+        self.indicador.ocultar()
+
+        for fila in filas:
+            iid = str(fila[0])
+            # La fila pudo haberse agregado ya de forma incremental mientras la página viajaba
+            if not self.tabla.exists(iid):
+                self.tabla.insert('', 'end', iid=iid, values=tuple(fila))
+
+        if filas:
+            self.ultima_fila = filas[-1]
+        self.cargadas += len(filas)
+        if len(filas) < limite or (self.limite_total is not None and self.cargadas >= self.limite_total):
+            self.agotada = True
+
+    def insertar(self, iid, valores, columna, descendente=False, tags=()):
+        """
+        Agrega una fila nueva en su posición según el orden actual (ver insertar_ordenado).
+        Si le tocaría ir después de la última fila cargada y todavía faltan páginas, no se
+        agrega: llegará con su página, en el lugar correcto.
+        Returns:
+            bool: True si la fila se agregó.
+        """
+        return self._insertar_en(list(self.tabla.get_children()), iid, valores, columna, descendente, tags)
+
+    def insertar_varios(self, filas, columna, descendente=False):
+        """
+        Agrega varias filas (iid, valores) en su posición, como `insertar`. Los items de la
+        tabla se leen una sola vez para todo el grupo (p. ej. al deshacer un borrado en bloque).
+        Returns:
+            int: Filas agregadas.
+        """
+        hijos = list(self.tabla.get_children())
+        return sum(self._insertar_en(hijos, iid, valores, columna, descendente) for iid, valores in filas)
+
+    def _insertar_en(self, hijos, iid, valores, columna, descendente, tags=()):
+        """Inserta en la tabla y en `hijos` (los items actuales, en orden), que se mantiene al día."""
+        posicion = posicion_ordenada(self.tabla, valores, columna, descendente, hijos)
+        if posicion == len(hijos) and not self.agotada:
+            return False
+        self.tabla.insert('', posicion, iid=str(iid), values=tuple(valores), tags=tags)
+        hijos.insert(posicion, str(iid))
+        return True
+
+    def insertar_pendiente(self, valores, columna, descendente=False):
+        """
+        Muestra enseguida (en gris) una fila que el escritor todavía no confirmó.
+        Returns:
+            str | None: El iid provisorio, para `confirmar_pendiente`/`quitar_pendiente`,
+            o None si la fila no se agregó (ver `insertar`).
+        """
+        self._provisorias += 1
+        iid = f"{ETIQUETA_PENDIENTE}-{self._provisorias}"
+        if self.insertar(iid, valores, columna, descendente, tags=(ETIQUETA_PENDIENTE,)):
+            return iid
+        return None
+
+    def confirmar_pendiente(self, iid_provisorio, iid, valores):
+        """Reemplaza la fila pendiente por la definitiva (con su id real), en el mismo lugar."""
+        if iid_provisorio is None or not self.tabla.exists(iid_provisorio):
+            return
+        posicion = self.tabla.index(iid_provisorio)
+        self.tabla.delete(iid_provisorio)
+        # La fila pudo haber llegado ya con una página pedida después del commit
+        if not self.tabla.exists(str(iid)):
+            self.tabla.insert('', posicion, iid=str(iid), values=tuple(valores))
+
+    def quitar_pendiente(self, iid_provisorio):
+        """Quita una fila pendiente que la DB rechazó."""
+        if iid_provisorio is not None and self.tabla.exists(iid_provisorio):
+            self.tabla.delete(iid_provisorio)
+
+    def es_pendiente(self, iid):
+        """Indica si la fila `iid` todavía no se confirmó en la DB."""
+        return ETIQUETA_PENDIENTE in self.tabla.item(iid, 'tags')
+
+    def seleccion(self):
+        """
+        Las filas seleccionadas, separando las que el escritor todavía no confirmó
+        (no tienen id real, así que no se pueden borrar ni modificar aún).
+        Returns:
+            tuple: (iids confirmados, cantidad de seleccionadas pendientes).
+        """
+        seleccionadas = self.tabla.selection()
+        confirmadas = [iid for iid in seleccionadas if not self.es_pendiente(iid)]
+        return confirmadas, len(seleccionadas) - len(confirmadas)
+
+    def quitar(self, iids):
+        """Quita de una vez las filas `iids` (ya borradas en la DB), sin recargar la tabla."""
+        if iids:
+            self.tabla.delete(*iids)
+
+    def _fallo(self, error, generacion):
+        if generacion != self._generacion:
+            return
+        self.cargando = False
+        self.indicador.ocultar()
+        if self.al_fallar:
+            self.al_fallar(error)
+
+    def _on_scroll(self, primero, ultimo):
+        """Actualiza la scrollbar y, si se está cerca del final, pide la siguiente página."""
+        self.scrollbar.set(primero, ultimo)
+        if float(ultimo) >= UMBRAL_SCROLL:
+            self.cargar_siguiente_pagina()
+
+
+class OrdenTabla:
+    """
+    Encabezados clicables que reordenan una Treeview en SQL (no en Python).
+
+    Guarda el orden elegido en la pantalla (columna y sentido), marca el encabezado con
+    ▲/▼ y avisa con `al_cambiar()` para que la pantalla vuelva a pedir la primera página
+    con el nuevo ORDER BY. Un segundo clic en el mismo encabezado invierte el sentido.
+
+    Args:
+        tabla (ttk.Treeview): La tabla cuyos encabezados se vuelven clicables.
+        columnas (dict): Encabezado -> columna SQL; solo estos encabezados ordenan.
+        al_cambiar (callable): Se llama sin argumentos cada vez que cambia el orden.
+        encabezado (str): Encabezado del orden inicial.
+        descendente (bool): Sentido del orden inicial.
+    """
+    def __init__(self, tabla, columnas, al_cambiar, encabezado, descendente=False):
+        self.tabla = tabla
+        self.columnas = columnas
+        self.al_cambiar = al_cambiar
+        self.encabezado = encabezado
+        self.descendente = descendente
+
+        for col in columnas:
+            self.tabla.heading(col, command=lambda col=col: self.ordenar_por(col))
+        self._marcar_encabezados()
+
+    @property
+    def columna(self):
+        """Columna SQL del orden actual."""
+        return self.columnas[self.encabezado]
+
+    def ordenar_por(self, encabezado):
+        if encabezado == self.encabezado:
+            self.descendente = not self.descendente
+        else:
+            self.encabezado = encabezado
+            self.descendente = False
+        self._marcar_encabezados()
+        self.al_cambiar()
+
+    def _marcar_encabezados(self):
+        for col in self.columnas:
+            flecha = (" ▼" if self.descendente else " ▲") if col == self.encabezado else ""
+            self.tabla.heading(col, text=col + flecha)
+
+
+class FiltroFechas:
+    """
+    Campos "desde"/"hasta" (DD/MM/YYYY) con botones Filtrar y Limpiar.
+
+    Guarda el rango elegido en ISO (`desde`, `hasta`; None = sin límite) y avisa con
+    `al_cambiar()`; la pantalla arma la condición con `fechas.condiciones_rango`, que
+    con el índice de la columna resuelve el rango sin recorrer la tabla.
+    El contenedor (`frame`) lo ubica la pantalla.
+    """
+    def __init__(self, parent, al_cambiar, etiqueta="Fecha"):
+        self.al_cambiar = al_cambiar
+        self.desde = None
+        self.hasta = None
+
+        self.frame = ttk.Frame(parent, style="Modulo.TFrame")
+        ttk.Label(self.frame, text=f"{etiqueta} desde:", style="Modulo.TLabel").pack(side=tk.LEFT, padx=5)
+        self.desde_entry = ttk.Entry(self.frame, width=12, style="TEntry")
+        self.desde_entry.pack(side=tk.LEFT, padx=5)
+        ttk.Label(self.frame, text="hasta:", style="Modulo.TLabel").pack(side=tk.LEFT, padx=5)
+        self.hasta_entry = ttk.Entry(self.frame, width=12, style="TEntry")
+        self.hasta_entry.pack(side=tk.LEFT, padx=5)
+        ttk.Button(self.frame, text="Filtrar", command=self.aplicar, style="Modulo.TButton").pack(side=tk.LEFT, padx=5)
+        ttk.Button(self.frame, text="Limpiar", command=self.limpiar, style="Modulo.TButton").pack(side=tk.LEFT, padx=5)
+
+    @property
+    def activo(self):
+        return self.desde is not None or self.hasta is not None
+
+    def aplicar(self):
+        """Valida los campos y, si el rango cambió, avisa a la pantalla."""
+        try:
+            desde = fechas.a_iso(self.desde_entry.get()) if self.desde_entry.get().strip() else None
+            hasta = fechas.a_iso(self.hasta_entry.get()) if self.hasta_entry.get().strip() else None
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        if desde and hasta and desde > hasta:
+            messagebox.showerror("Error", "La fecha 'desde' es posterior a la fecha 'hasta'.")
+            return
+        if (desde, hasta) != (self.desde, self.hasta):
+            self.desde, self.hasta = desde, hasta
+            self.al_cambiar()
+
+    def limpiar(self):
+        self.desde_entry.delete(0, tk.END)
+        self.hasta_entry.delete(0, tk.END)
+        if self.activo:
+            self.desde = self.hasta = None
+            self.al_cambiar()
+
+
+def insertar_ordenado(tabla, iid, valores, columna, descendente=False):
+    """
+    Inserta una sola fila en la posición que le corresponde según `columna`,
+    sin recargar el resto de la tabla.
+
+    Args:
+        tabla (ttk.Treeview): La tabla ya ordenada por `columna`.
+        iid (str): Identificador del nuevo item (el id de la fila en la DB).
+        valores (tuple): Valores de la fila, en el orden de las columnas.
+        columna (str): Nombre de la columna por la que está ordenada la tabla.
+        descendente (bool): True si la tabla está ordenada de mayor a menor.
+    """
+    tabla.insert('', posicion_ordenada(tabla, valores, columna, descendente), iid=str(iid), values=tuple(valores))
+
+
+def posicion_ordenada(tabla, valores, columna, descendente=False, hijos=None):
+    """
+    Índice donde va una fila con `valores` en una tabla ya ordenada por `columna`.
+    `hijos` son los items de la tabla en orden; al insertar varias filas seguidas conviene
+    leerlos una vez (get_children arma la lista entera) y pasarlos en cada llamada.
+    """
+    if hijos is None:
+        hijos = tabla.get_children()
+    indice_columna = tabla['columns'].index(columna)
+    nuevo = valores[indice_columna]
+
+    # Búsqueda binaria: solo se leen O(log n) items de la Treeview
+    bajo, alto = 0, len(hijos)
+    while bajo < alto:
+        medio = (bajo + alto) // 2
+        actual, referencia = _comparables(tabla.set(hijos[medio], columna), nuevo)
+        va_despues = actual >= referencia if descendente else actual <= referencia
+        if va_despues:
+            bajo = medio + 1
+        else:
+            alto = medio
+    return bajo
+
+
+def _comparables(texto, nuevo):
+    """La Treeview devuelve todo como texto; lo convertimos al tipo del valor nuevo para comparar."""
+    try:
+        return type(nuevo)(texto), nuevo
+    except (TypeError, ValueError):
+        return texto, str(nuevo)
@@ -0,0 +1,28 @@
+"""
+Fixtures comunes: cada test trabaja con adidas.db y produccion.db nuevas en un directorio
+temporal (las rutas del repositorio son relativas al directorio actual), así que las bases
+del proyecto no se tocan.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import papelera  # noqa: E402
+import repositorio  # noqa: E402
+# Los servicios registran su esquema al importarse
+import servicios.compras  # noqa: E402,F401
+import servicios.empleados  # noqa: E402,F401
+import servicios.produccion  # noqa: E402,F401
+
+
+@pytest.fixture(autouse=True)
+def db_temporal(tmp_path, monkeypatch):
+    """Bases nuevas (con esquema y migraciones) en `tmp_path` y una pila de deshacer vacía."""
+    repositorio.cerrar_todas()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(papelera, "pila", papelera.PilaDeshacer())
+    yield tmp_path
+    repositorio.cerrar_todas()
@@ -0,0 +1,76 @@
+import pytest
+
+from servicios import Compra, ControlCalidad, DatosInvalidos, Empleado, Lote, Producto
+
+
+def test_compra_desde_formulario():
+    compra = Compra.desde_formulario("31/12/2024", "Proveedor", "10.5", "SKU-1", "Cliente")
+    assert compra == Compra("2024-12-31", "Proveedor", 10.5, "SKU-1", "Cliente")
+    assert compra.parametros() == ("2024-12-31", "Proveedor", 10.5, "SKU-1", "Cliente")
+
+
+@pytest.mark.parametrize("campos", [
+    ("", "Proveedor", "10", "SKU-1", "Cliente"),
+    ("31/12/2024", "Proveedor", "10", "SKU-1", ""),
+    ("31/12/2024", "Proveedor", "diez", "SKU-1", "Cliente"),
+    ("32/13/2024", "Proveedor", "10", "SKU-1", "Cliente"),
+])
+def test_compra_desde_formulario_invalida(campos):
+    with pytest.raises(DatosInvalidos):
+        Compra.desde_formulario(*campos)
+
+
+def test_empleado_desde_formulario():
+    empleado = Empleado.desde_formulario("Ana", "Cajera", "01/02/2023", "1500", "Centro", "ana@mail.com", "1155")
+    assert empleado == Empleado("Ana", "Cajera", "2023-02-01", 1500.0, "Centro", "ana@mail.com", "1155", None)
+
+    con_baja = Empleado.desde_formulario("Ana", "Cajera", "2023-02-01", "1500", "Centro", "ana@mail.com", "1155",
+                                         "15/03/2024")
+    assert con_baja.fecha_de_baja == "2024-03-15"
+
+
+@pytest.mark.parametrize("campos", [
+    ("", "Cajera", "01/02/2023", "1500", "Centro", "ana@mail.com", "1155"),
+    ("Ana", "Cajera", "01/02/2023", "mil", "Centro", "ana@mail.com", "1155"),
+    ("Ana", "Cajera", "no es fecha", "1500", "Centro", "ana@mail.com", "1155"),
+    ("Ana", "Cajera", "01/02/2023", "1500", "Centro", "ana@mail.com", "1155", "30/02/2024"),
+])
+def test_empleado_desde_formulario_invalido(campos):
+    with pytest.raises(DatosInvalidos):
+        Empleado.desde_formulario(*campos)
+
+
+def test_producto_desde_formulario():
+    assert Producto.desde_formulario("Zapatilla", "sku-1") == Producto("Zapatilla", "SKU-1")
+
+
+@pytest.mark.parametrize("campos", [("", "SKU-1"), ("Zapatilla", "")])
+def test_producto_desde_formulario_invalido(campos):
+    with pytest.raises(DatosInvalidos):
+        Producto.desde_formulario(*campos)
+
+
+def test_lote_desde_formulario():
+    lote = Lote.desde_formulario("sku-1", "25")
+    assert (lote.producto_sku, lote.cantidad) == ("SKU-1", 25)
+    assert lote.parametros() == ("SKU-1", 25, lote.fecha_creacion)
+    assert lote.fecha_creacion
+
+
+@pytest.mark.parametrize("campos", [("", "25"), ("SKU-1", ""), ("SKU-1", "0"), ("SKU-1", "-3"), ("SKU-1", "2.5")])
+def test_lote_desde_formulario_invalido(campos):
+    with pytest.raises(DatosInvalidos):
+        Lote.desde_formulario(*campos)
+
+
+def test_control_desde_formulario():
+    control = ControlCalidad.desde_formulario("7", "peso", "10.25", False)
+    assert (control.lote_id, control.parametro, control.valor, control.aprobado) == (7, "peso", 10.25, False)
+    assert control.parametros() == (7, "peso", 10.25, 0, control.timestamp)
+
+
+@pytest.mark.parametrize("campos", [("", "peso", "1", True), ("7", "", "1", True), ("siete", "peso", "1", True),
+                                    ("7", "peso", "uno", True)])
+def test_control_desde_formulario_invalido(campos):
+    with pytest.raises(DatosInvalidos):
+        ControlCalidad.desde_formulario(*campos)
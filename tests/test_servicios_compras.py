@@ -0,0 +1,101 @@
+import repositorio
+from servicios import compras, Compra
+
+
+def _conexion():
+    return repositorio.obtener_conexion(compras.DB_NAME)
+
+
+def _insertar(*proveedores):
+    registros = [Compra(f"2024-01-{dia:02d}", proveedor, 10.0 * dia, "SKU-1", "Cliente")
+                 for dia, proveedor in enumerate(proveedores, 1)]
+    compras.insertar_compras(registros)
+    return registros
+
+
+def _ids_paginando(limite, **orden):
+    """Ids de todas las páginas seguidas, como al bajar con la scrollbar."""
+    ids, ultima = [], None
+    while True:
+        pagina = compras.obtener_pagina_compras(_conexion(), ultima, limite, **orden)
+        if not pagina:
+            return ids
+        ids += [fila["id"] for fila in pagina]
+        ultima = pagina[-1]
+
+
+def test_paginacion_por_clave_con_nulos():
+    registros = _insertar("B", None, "A", None, "B", "C", None, "A")
+    # SQLite ordena los NULL primero en ASC; el id desempata
+    esperado = [r.id for r in sorted(registros, key=lambda r: (r.proveedor is not None, r.proveedor or "", r.id))]
+
+    for limite in (1, 2, 3, 100):
+        assert _ids_paginando(limite, columna="proveedor", descendente=False) == esperado
+        assert _ids_paginando(limite, columna="proveedor", descendente=True) == esperado[::-1]
+
+
+def test_paginacion_por_id_y_rango():
+    registros = _insertar("A", "B", "C", "D")
+    assert _ids_paginando(3) == [r.id for r in reversed(registros)]
+    assert _ids_paginando(1, columna="id", descendente=False, desde="2024-01-02", hasta="2024-01-03") == \
+        [registros[1].id, registros[2].id]
+
+
+def test_borrar_y_deshacer():
+    registros = _insertar("A", "B", "C")
+    borradas = [registros[0].id, registros[2].id]
+
+    assert compras.borrar_compras(borradas) == 2
+    assert _ids_paginando(10) == [registros[1].id]
+    assert compras.obtener_compras(_conexion(), borradas) == []
+    assert compras.resumen_rango(_conexion()) == (1, 20.0)
+
+    assert sorted(c.id for c in compras.deshacer_borrado()) == borradas
+    assert _ids_paginando(10) == [r.id for r in reversed(registros)]
+    assert compras.resumen_rango(_conexion()) == (3, 60.0)
+    assert compras.deshacer_borrado() == []
+
+
+def test_deshacer_solo_el_ultimo_borrado():
+    registros = _insertar("A", "B")
+    compras.borrar_compras([registros[0].id])
+    compras.borrar_compras([registros[1].id])
+
+    assert [c.id for c in compras.deshacer_borrado()] == [registros[1].id]
+    assert _ids_paginando(10) == [registros[1].id]
+    assert [c.id for c in compras.deshacer_borrado()] == [registros[0].id]
+
+
+def _insertar_clientes(cantidad, cliente, fecha):
+    registros = [Compra(fecha, "Proveedor", 1.0, "SKU-1", cliente) for _ in range(cantidad)]
+    compras.insertar_compras(registros)
+    return [r.id for r in registros]
+
+
+def test_busqueda():
+    nike = _insertar_clientes(3, "Nike Store", "2024-01-01")
+    _insertar_clientes(2, "Puma", "2024-01-01")
+    juan = _insertar_clientes(1, "Juan Gomez", "2024-01-01")
+
+    assert compras.expresion_busqueda("nik") == '"nik"*'
+    assert _ids_paginando(2, busqueda=compras.expresion_busqueda("nik")) == nike[::-1]
+    assert _ids_paginando(10, busqueda=compras.expresion_busqueda("juan gom")) == juan
+    assert compras.expresion_busqueda('"*') is None
+
+
+def test_busqueda_con_rango_fuera_del_tope():
+    anteriores = _insertar_clientes(50, "Nike", "2023-06-01")
+    _insertar_clientes(compras.LIMITE_BUSQUEDA + 100, "Nike", "2024-06-01")
+
+    ids = _ids_paginando(100, busqueda='"Nike"', desde="2023-01-01", hasta="2023-12-31")
+    assert ids == anteriores[::-1]
+
+
+def test_busqueda_ignora_la_papelera_dentro_del_tope():
+    vigentes = _insertar_clientes(100, "Nike", "2024-01-01")
+    borradas = _insertar_clientes(compras.LIMITE_BUSQUEDA, "Nike", "2024-01-01")
+    compras.borrar_compras(borradas)
+
+    assert _ids_paginando(100, busqueda='"Nike"') == vigentes[::-1]
+    compras.deshacer_borrado()
+    assert len(_ids_paginando(100, busqueda='"Nike"')) == compras.LIMITE_BUSQUEDA
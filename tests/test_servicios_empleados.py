@@ -0,0 +1,68 @@
+from datetime import date
+
+import pytest
+
+import repositorio
+from servicios import empleados, DatosInvalidos, Empleado
+
+
+def _conexion():
+    return repositorio.obtener_conexion(empleados.DB_NAME)
+
+
+def _insertar(*puestos):
+    registros = [Empleado(f"Empleado {i}", puesto, f"2023-01-{i:02d}", 1000.0, "Centro", "mail", "1")
+                 for i, puesto in enumerate(puestos, 1)]
+    empleados.insertar_empleados(registros)
+    return registros
+
+
+def _ids_paginando(limite, **orden):
+    ids, ultima = [], None
+    while True:
+        pagina = empleados.obtener_pagina_empleados(_conexion(), ultima, limite, **orden)
+        if not pagina:
+            return ids
+        ids += [fila["id"] for fila in pagina]
+        ultima = pagina[-1]
+
+
+def _fechas_de_baja():
+    return {fila["id"]: fila["fecha_de_baja"] for fila in _conexion().execute("SELECT id, fecha_de_baja FROM empleados")}
+
+
+def test_paginacion_por_clave_con_nulos():
+    registros = _insertar(None, "Cajero", None, "Gerente", "Cajero")
+    esperado = [r.id for r in sorted(registros, key=lambda r: (r.puesto is not None, r.puesto or "", r.id))]
+
+    for limite in (1, 2, 100):
+        assert _ids_paginando(limite, columna="puesto") == esperado
+        assert _ids_paginando(limite, columna="puesto", descendente=True) == esperado[::-1]
+
+
+def test_dar_de_baja():
+    registros = _insertar("Cajero", "Gerente", "Vendedor")
+    empleados.borrar_empleados([registros[2].id])
+
+    # El que está en la papelera no se modifica
+    assert empleados.dar_de_baja([r.id for r in registros], "2024-05-31") == 2
+    assert _fechas_de_baja() == {registros[0].id: "2024-05-31", registros[1].id: "2024-05-31", registros[2].id: None}
+
+
+def test_fecha_de_baja_o_hoy():
+    assert empleados.fecha_de_baja_o_hoy("31/05/2024") == "2024-05-31"
+    assert empleados.fecha_de_baja_o_hoy("  ") == date.today().isoformat()
+    with pytest.raises(DatosInvalidos):
+        empleados.fecha_de_baja_o_hoy("31/02/2024")
+
+
+def test_borrar_y_deshacer():
+    registros = _insertar("Cajero", "Gerente")
+
+    assert empleados.borrar_empleados([registros[0].id]) == 1
+    assert empleados.borrar_empleados([registros[0].id]) == 0
+    assert _ids_paginando(10) == [registros[1].id]
+
+    assert [e.id for e in empleados.deshacer_borrado()] == [registros[0].id]
+    assert _ids_paginando(10) == [r.id for r in registros]
+    assert empleados.deshacer_borrado() == []
@@ -0,0 +1,109 @@
+import sqlite3
+
+import pytest
+
+import repositorio
+from servicios import produccion, ControlCalidad, DatosInvalidos, Lote, Producto
+
+
+def _conexion():
+    return repositorio.obtener_conexion(produccion.DB_NAME)
+
+
+def test_alta_de_sku_en_papelera_restaura_el_producto():
+    original = Producto("Zapatilla", "SKU-1")
+    produccion.insertar_productos([original])
+    produccion.borrar_productos([original.id])
+
+    nuevo = Producto.desde_formulario("Zapatilla Pro", "sku-1")
+    assert produccion.insertar_productos([nuevo]) == 1
+
+    assert nuevo.id == original.id
+    assert produccion.obtener_productos(_conexion(), [nuevo.id]) == [Producto("Zapatilla Pro", "SKU-1", nuevo.id)]
+
+
+def test_alta_de_sku_en_catalogo_falla():
+    produccion.insertar_productos([Producto("Zapatilla", "SKU-1")])
+    with pytest.raises(sqlite3.IntegrityError):
+        produccion.insertar_productos([Producto("Otra", "SKU-1")])
+    assert [fila["nombre"] for fila in _conexion().execute("SELECT nombre FROM Productos")] == ["Zapatilla"]
+
+
+def test_restaurar_producto_solo_si_esta_en_la_papelera():
+    producto = Producto("Zapatilla", "SKU-1")
+    produccion.insertar_productos([producto])
+    assert produccion.restaurar_producto(Producto("Otra", "SKU-1")) is None
+    assert produccion.restaurar_producto(Producto("Otra", "SKU-2")) is None
+
+    produccion.borrar_productos([producto.id])
+    restaurado = produccion.restaurar_producto(Producto("Otra", "SKU-1"))
+    assert restaurado.id == producto.id
+    assert produccion.obtener_productos(_conexion(), [producto.id])[0].nombre == "Otra"
+
+
+def test_validar_lote():
+    produccion.insertar_productos([Producto("Zapatilla", "SKU-1")])
+    lote = produccion.validar_lote(_conexion(), Lote.desde_formulario("sku-1", "10"))
+    assert lote.nombre == "Zapatilla"
+
+    with pytest.raises(DatosInvalidos):
+        produccion.validar_lote(_conexion(), Lote.desde_formulario("SKU-2", "10"))
+
+
+def test_validar_lote_rechaza_sku_en_papelera():
+    producto = Producto("Zapatilla", "SKU-1")
+    produccion.insertar_productos([producto])
+    produccion.borrar_productos([producto.id])
+
+    with pytest.raises(DatosInvalidos):
+        produccion.validar_lote(_conexion(), Lote.desde_formulario("SKU-1", "10"))
+
+
+def test_validar_control():
+    produccion.insertar_productos([Producto("Zapatilla", "SKU-1")])
+    lote = Lote.desde_formulario("SKU-1", "10")
+    produccion.insertar_lotes([lote])
+
+    control = ControlCalidad.desde_formulario(str(lote.id), "peso", "1.5", True)
+    assert produccion.validar_control(_conexion(), control) is control
+    with pytest.raises(DatosInvalidos):
+        produccion.validar_control(_conexion(), ControlCalidad.desde_formulario(str(lote.id + 1), "peso", "1", True))
+
+
+def test_borrar_y_deshacer_conserva_los_lotes():
+    productos = [Producto("Zapatilla", "SKU-1"), Producto("Remera", "SKU-2")]
+    produccion.insertar_productos(productos)
+    lote = Lote("SKU-1", 10, "2024-01-01 10:00:00")
+    produccion.insertar_lotes([lote])
+
+    assert produccion.borrar_productos([productos[0].id]) == 1
+    assert [fila["id"] for fila in produccion.obtener_pagina_productos(_conexion(), None, 10)] == [productos[1].id]
+    assert produccion.obtener_productos(_conexion(), [productos[0].id]) == []
+    # El lote sigue listándose con el nombre de su producto
+    assert [fila["nombre"] for fila in produccion.obtener_pagina_lotes(_conexion(), None, 10)] == ["Zapatilla"]
+
+    assert produccion.deshacer_borrado() == [productos[0]]
+    assert produccion.deshacer_borrado() == []
+
+
+def test_paginacion_de_lotes_y_controles():
+    produccion.insertar_productos([Producto("Zapatilla", "SKU-1")])
+    # Fechas repetidas: el id desempata entre páginas
+    lotes = [Lote("SKU-1", cantidad, f"2024-01-0{cantidad % 3 + 1} 10:00:00") for cantidad in range(1, 8)]
+    produccion.insertar_lotes(lotes)
+    esperado = [l.id for l in sorted(lotes, key=lambda l: (l.fecha_creacion, l.id), reverse=True)]
+
+    ids, ultima = [], None
+    while pagina := produccion.obtener_pagina_lotes(_conexion(), ultima, 2):
+        ids += [fila["id"] for fila in pagina]
+        ultima = pagina[-1]
+    assert ids == esperado
+
+    controles = [ControlCalidad(lotes[0].id, "peso", 1.0, i % 2 == 0, "2024-01-01 10:00:00") for i in range(5)]
+    produccion.insertar_controles(controles)
+    ids, ultima = [], None
+    while pagina := produccion.obtener_pagina_controles(_conexion(), ultima, 2, lotes[0].id):
+        ids += [fila["id"] for fila in pagina]
+        ultima = pagina[-1]
+    assert ids == [c.id for c in reversed(controles)]
+    assert tuple(produccion.estado_de_lote(_conexion(), lotes[0].id)) == ("❌ Con rechazos", 5, 2, "2024-01-01 10:00:00")
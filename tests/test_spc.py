@@ -0,0 +1,72 @@
+import sqlite3
+
+import pytest
+
+import repositorio
+import spc
+from servicios import produccion, ControlCalidad, Lote, Producto
+
+pytest.importorskip("numpy")
+
+
+def _conexion():
+    return repositorio.obtener_conexion(produccion.DB_NAME)
+
+
+def _lote_con_controles(sku, valores):
+    lote = Lote(sku, 10, "2024-01-01 10:00:00")
+    produccion.insertar_lotes([lote])
+    produccion.insertar_controles([ControlCalidad(lote.id, "peso", valor, valor < 3, "2024-01-01 10:00:00")
+                                   for valor in valores])
+    return lote
+
+
+def _por_parametro(resultados):
+    return {r["parametro"]: r for r in resultados}
+
+
+def test_estadisticas_y_altas_nuevas():
+    produccion.insertar_productos([Producto("Zapatilla", "SKU-1"), Producto("Remera", "SKU-2")])
+    _lote_con_controles("SKU-1", [1.0, 2.0, 3.0])
+    _lote_con_controles("SKU-2", [10.0])
+    cache = spc.CacheSPC()
+
+    peso = _por_parametro(cache.estadisticas(_conexion(), "SKU-1"))["peso"]
+    assert (peso["lotes"], peso["total"]["n"], peso["total"]["media"]) == (1, 3, 2.0)
+    assert peso["total"]["rechazo"] == pytest.approx(1 / 3)
+    assert peso["total"]["cpk"] is None
+
+    # Solo se leen las altas nuevas; el resultado coincide con leer todo de cero
+    _lote_con_controles("SKU-1", [5.0])
+    spc.guardar_limites(_conexion(), "SKU-1", "peso", 0.0, 6.0)
+    peso = _por_parametro(cache.estadisticas(_conexion(), "SKU-1"))["peso"]
+    assert (peso["lotes"], peso["total"]["n"], peso["total"]["media"]) == (2, 4, 2.75)
+    assert peso == _por_parametro(spc.CacheSPC().estadisticas(_conexion(), "SKU-1"))["peso"]
+    assert peso["total"]["cpk"] is not None
+
+
+def test_alta_confirmada_durante_la_lectura_no_se_cuenta_dos_veces():
+    produccion.insertar_productos([Producto("Zapatilla", "SKU-1")])
+    lote = _lote_con_controles("SKU-1", [1.0])
+    cache = spc.CacheSPC()
+    cache.estadisticas(_conexion(), "SKU-1")
+    _lote_con_controles("SKU-1", [2.0])
+
+    # Otro proceso confirma una medición justo después de que se leyó MAX(id)
+    otra = sqlite3.connect(produccion.DB_NAME)
+
+    def alta_concurrente(sql):
+        if "CROSS JOIN Lotes" in sql:
+            _conexion().set_trace_callback(None)
+            otra.execute(produccion.SQL_INSERTAR_CONTROL, (lote.id, "peso", 3.0, 1, "2024-01-01 10:00:00"))
+            otra.commit()
+
+    _conexion().set_trace_callback(alta_concurrente)
+    try:
+        cache.estadisticas(_conexion(), "SKU-1")
+        peso = _por_parametro(cache.estadisticas(_conexion(), "SKU-1"))["peso"]
+    finally:
+        otra.close()
+
+    assert peso["total"]["n"] == 3
+    assert peso == _por_parametro(spc.CacheSPC().estadisticas(_conexion(), "SKU-1"))["peso"]